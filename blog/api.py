@@ -0,0 +1,306 @@
+# blog/api.py
+"""
+Read-only JSON API for posts.
+
+    GET /api/posts/                      all posts, newest first
+    GET /api/posts/<pk>/                 one post
+    GET /api/users/<username>/posts/     one author's posts, newest first
+
+Rows are read with values() projections, so no Post instances are built,
+and `?fields=title,author` limits the columns that are selected. Lists use
+keyset cursors (the same tokens as the HTML views, see blog/pagination.py):
+each page ends with a `next` URL, and `?limit=` goes up to
+BLOG_API_MAX_PAGE_SIZE. Pages are streamed from a chunked iterator(), so a
+client can walk the whole corpus without a worker holding a page in memory.
+"""
+
+# Import built-in libraries
+import json
+from typing import Any
+
+# Import django libraries
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_safe
+
+# Import local modules
+from mysite.routers import read_from_replica
+
+from .models import Post
+from .pagination import InvalidCursor, decode_cursor, encode_cursor
+
+# Fields a client can select, and the column each is read from
+API_FIELDS: dict[str, str] = {
+    "id": "id",
+    "title": "title",
+    "content": "content",
+    "content_html": "content_html",
+    "excerpt_html": "excerpt_html",
+    "author": "author__username",
+    "date_posted": "date_posted",
+    "updated_at": "updated_at",
+}
+
+# Fields returned without ?fields= (lists leave out the full bodies)
+LIST_FIELDS = ["id", "title", "excerpt_html", "author", "date_posted", "updated_at"]
+DETAIL_FIELDS = list(API_FIELDS)
+
+# Rows fetched per database round trip while streaming
+CHUNK_SIZE = 500
+
+# Bytes of JSON gathered before a chunk is sent to the client
+FLUSH_BYTES = 64 * 1024
+
+encoder = DjangoJSONEncoder(separators=(",", ":"))
+
+
+class InvalidParameter(Exception):
+    """Raised when a query parameter cannot be used."""
+
+
+def error_response(message: str, status: int = 400) -> JsonResponse:
+    """Return a JSON error body."""
+    return JsonResponse({"error": message}, status=status)
+
+
+def parse_fields(request, default: list[str]) -> list[str]:
+    """Return the fields selected with ?fields=, or `default`."""
+    value = request.GET.get("fields", "")
+    if not value:
+        return default
+    fields = list(dict.fromkeys(name.strip() for name in value.split(",")))
+    unknown = [name for name in fields if name not in API_FIELDS]
+    if unknown:
+        raise InvalidParameter(
+            f"Unknown field(s): {', '.join(unknown)}. "
+            f"Choose from {', '.join(API_FIELDS)}."
+        )
+    return fields
+
+
+def parse_limit(request) -> int:
+    """Return the page size from ?limit=, capped at BLOG_API_MAX_PAGE_SIZE."""
+    value = request.GET.get("limit")
+    if not value:
+        return settings.BLOG_API_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise InvalidParameter("limit must be an integer.") from None
+    if limit < 1:
+        raise InvalidParameter("limit must be at least 1.")
+    return min(limit, settings.BLOG_API_MAX_PAGE_SIZE)
+
+
+def page_rows(request, queryset: QuerySet, fields: list[str]) -> tuple[QuerySet, int]:
+    """Return the rows of the requested page (plus one) and the page size.
+
+    The rows always carry `id` and `date_posted` for the next cursor, and
+    are read from the database chosen now, since streaming runs after the
+    view (and its replica routing) has returned.
+    """
+    limit = parse_limit(request)
+    cursor = request.GET.get("cursor")
+    if cursor:
+        try:
+            direction, date_posted, pk = decode_cursor(cursor)
+        except InvalidCursor:
+            raise InvalidParameter("Invalid cursor.") from None
+        if direction != "n":
+            raise InvalidParameter("Invalid cursor.")
+        queryset = queryset.filter(
+            Q(date_posted__lt=date_posted) | Q(date_posted=date_posted, id__lt=pk)
+        )
+    columns = dict.fromkeys(
+        [*(API_FIELDS[name] for name in fields), "id", "date_posted"]
+    )
+    rows = queryset.order_by("-date_posted", "-id").values(*columns)
+    return rows.using(rows.db)[: limit + 1], limit
+
+
+def project(row: dict[str, Any], fields: list[str]) -> dict[str, Any]:
+    """Return the selected fields of a values() row under their API names."""
+    return {name: row[API_FIELDS[name]] for name in fields}
+
+
+def next_url(request, row: dict[str, Any]) -> str:
+    """Return the URL of the page after `row`."""
+    query = request.GET.copy()
+    query["cursor"] = encode_cursor(row["date_posted"], row["id"], "n")
+    return request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+
+
+class PageEncoder:
+    """Encode a page of rows as `{"results": [...], "next": ...}` in chunks.
+
+    Attributes:
+        limit (int): Rows on the page; one more row means there is a next page.
+    """
+
+    def __init__(self, request, fields: list[str], limit: int) -> None:
+        self.request = request
+        self.fields = fields
+        self.limit = limit
+        self.count = 0
+        self.last_row: dict[str, Any] | None = None
+        self.buffer: list[str] = ['{"results":[']
+        self.size = 0
+
+    # Add a row, returning a chunk when the buffer is full
+    def add(self, row: dict[str, Any]) -> str | None:
+        """Buffer a row and return the buffered JSON once it is large enough."""
+        if self.count == self.limit:
+            # The extra row only tells that another page exists
+            self.count += 1
+            return None
+        text = encoder.encode(project(row, self.fields))
+        self.buffer.append(f",{text}" if self.count else text)
+        self.size += len(text)
+        self.count += 1
+        self.last_row = row
+        if self.size < FLUSH_BYTES:
+            return None
+        return self.flush()
+
+    def flush(self) -> str:
+        chunk = "".join(self.buffer)
+        self.buffer, self.size = [], 0
+        return chunk
+
+    # Close the results list
+    def finish(self) -> str:
+        """Return the rest of the page, including the next page URL."""
+        more = self.count > self.limit and self.last_row is not None
+        next_page = next_url(self.request, self.last_row) if more else None
+        self.buffer.append(f'],"next":{json.dumps(next_page)}}}')
+        return self.flush()
+
+
+def stream_page(request, rows: QuerySet, fields: list[str], limit: int):
+    """Yield the JSON of a page, reading rows in chunks."""
+    page = PageEncoder(request, fields, limit)
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        chunk = page.add(row)
+        if chunk:
+            yield chunk
+    yield page.finish()
+
+
+async def astream_page(request, rows: QuerySet, fields: list[str], limit: int):
+    """Async version of stream_page()."""
+    page = PageEncoder(request, fields, limit)
+    async for row in rows.aiterator(chunk_size=CHUNK_SIZE):
+        chunk = page.add(row)
+        if chunk:
+            yield chunk
+    yield page.finish()
+
+
+def json_stream(chunks) -> StreamingHttpResponse:
+    """Wrap streamed JSON chunks in a response."""
+    return StreamingHttpResponse(chunks, content_type="application/json")
+
+
+# List all posts
+@require_safe
+@read_from_replica
+def post_list(request) -> StreamingHttpResponse | JsonResponse:
+    """Stream a page of posts, newest first."""
+    try:
+        fields = parse_fields(request, LIST_FIELDS)
+        rows, limit = page_rows(request, Post.objects.all(), fields)
+    except InvalidParameter as error:
+        return error_response(str(error))
+    return json_stream(stream_page(request, rows, fields, limit))
+
+
+# List a user's posts
+@require_safe
+@read_from_replica
+def user_posts(request, username: str) -> StreamingHttpResponse | JsonResponse:
+    """Stream a page of one author's posts, newest first."""
+    author_id = (
+        User.objects.filter(username=username).values_list("pk", flat=True).first()
+    )
+    if author_id is None:
+        return error_response("User not found.", status=404)
+    try:
+        fields = parse_fields(request, LIST_FIELDS)
+        rows, limit = page_rows(
+            request, Post.objects.filter(author_id=author_id), fields
+        )
+    except InvalidParameter as error:
+        return error_response(str(error))
+    return json_stream(stream_page(request, rows, fields, limit))
+
+
+# Post detail
+@require_safe
+@read_from_replica
+def post_detail(request, pk: int) -> JsonResponse:
+    """Return one post."""
+    try:
+        fields = parse_fields(request, DETAIL_FIELDS)
+    except InvalidParameter as error:
+        return error_response(str(error))
+    row = (
+        Post.objects.filter(pk=pk)
+        .values(*dict.fromkeys(API_FIELDS[name] for name in fields))
+        .first()
+    )
+    if row is None:
+        return error_response("Post not found.", status=404)
+    return JsonResponse(project(row, fields), encoder=DjangoJSONEncoder)
+
+
+# Async versions for ASGI deployments (ASYNC_VIEWS)
+@require_safe
+@read_from_replica
+async def apost_list(request) -> StreamingHttpResponse | JsonResponse:
+    """Async post_list()."""
+    try:
+        fields = parse_fields(request, LIST_FIELDS)
+        rows, limit = page_rows(request, Post.objects.all(), fields)
+    except InvalidParameter as error:
+        return error_response(str(error))
+    return json_stream(astream_page(request, rows, fields, limit))
+
+
+@require_safe
+@read_from_replica
+async def auser_posts(request, username: str) -> StreamingHttpResponse | JsonResponse:
+    """Async user_posts()."""
+    author_id = await (
+        User.objects.filter(username=username).values_list("pk", flat=True).afirst()
+    )
+    if author_id is None:
+        return error_response("User not found.", status=404)
+    try:
+        fields = parse_fields(request, LIST_FIELDS)
+        rows, limit = page_rows(
+            request, Post.objects.filter(author_id=author_id), fields
+        )
+    except InvalidParameter as error:
+        return error_response(str(error))
+    return json_stream(astream_page(request, rows, fields, limit))
+
+
+@require_safe
+@read_from_replica
+async def apost_detail(request, pk: int) -> JsonResponse:
+    """Async post_detail()."""
+    try:
+        fields = parse_fields(request, DETAIL_FIELDS)
+    except InvalidParameter as error:
+        return error_response(str(error))
+    row = await (
+        Post.objects.filter(pk=pk)
+        .values(*dict.fromkeys(API_FIELDS[name] for name in fields))
+        .afirst()
+    )
+    if row is None:
+        return error_response("Post not found.", status=404)
+    return JsonResponse(project(row, fields), encoder=DjangoJSONEncoder)
@@ -9,3 +9,11 @@ class BlogConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "blog"
+
+    def ready(self) -> None:
+        """Import signals.
+
+        activates the signal handlers that keep the cached post counters
+        in sync with created and deleted posts.
+        """
+        import blog.signals  # noqa: F401
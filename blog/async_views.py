@@ -0,0 +1,279 @@
+# blog/async_views.py
+"""
+Async versions of the blog read views for ASGI deployments.
+
+Queries use Django's async ORM; template rendering (which may still touch
+the session or request.user lazily) runs through sync_to_async. The views
+mirror the class-based views in blog/views.py and render the same templates
+with the same context, and are selected in the URLconf by ASYNC_VIEWS.
+"""
+
+# Import built-in libraries
+from types import SimpleNamespace
+from urllib.parse import urlencode
+
+# Import django libraries
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.models import User
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db.models import QuerySet
+from django.http import Http404, HttpResponse
+from django.shortcuts import aget_object_or_404, render
+
+# Import third-party libraries
+from asgiref.sync import sync_to_async
+
+# Import local modules
+from mysite.page_cache import cache_anonymous_page
+from mysite.routers import read_from_replica
+
+from .conditional import (
+    apost_detail_validators,
+    apost_list_validators,
+    conditional_page,
+)
+from .markdown_cache import render_markdown_file
+from .models import Post
+from .pagination import (
+    KEYSET,
+    OFFSET,
+    InvalidCursor,
+    KeysetPaginator,
+    aget_post_count,
+)
+from .post_cards import aattach_card_versions, post_card_timeout
+from .search import MAX_QUERY_LENGTH, search_posts
+
+# Posts per page, matching paginate_by on the class-based views
+PAGINATE_BY = 3
+
+# Render templates in a thread so lazy session/user access stays synchronous
+arender = sync_to_async(render)
+
+
+# Paginate a post queryset
+async def apaginate(
+    request,
+    queryset: QuerySet,
+    cached_count: bool,
+    author_id: int | None = None,
+    mode: str | None = None,
+) -> dict:
+    """Return the pagination context used by the list templates.
+
+    Args:
+        cached_count (bool): Use the cached post counters instead of COUNT(*).
+        author_id (int | None): Author scope of the cached counter.
+        mode (str | None): "offset", "keyset" or None for the setting.
+    """
+    mode = mode or getattr(settings, "BLOG_PAGINATION_MODE", OFFSET)
+    if mode == KEYSET:
+        paginator = KeysetPaginator(queryset=queryset, per_page=PAGINATE_BY)
+        try:
+            page = await paginator.apage(request.GET.get("cursor"))
+        except InvalidCursor:
+            raise Http404("Invalid pagination cursor.")
+    else:
+        paginator = Paginator(queryset, PAGINATE_BY)
+        if cached_count:
+            count = await aget_post_count(queryset, author_id=author_id)
+        else:
+            count = await queryset.acount()
+        # Paginator.count is a cached_property; prime it with the async count
+        paginator.__dict__["count"] = count
+
+        page_number = request.GET.get("page") or 1
+        if page_number == "last":
+            page_number = paginator.num_pages
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise Http404(f"Invalid page ({page_number}): {exc}")
+        bottom = (number - 1) * PAGINATE_BY
+        object_list = [post async for post in queryset[bottom : bottom + PAGINATE_BY]]
+        page = Page(object_list, number, paginator)
+
+    await aattach_card_versions(page.object_list)
+
+    return {
+        "paginator": paginator,
+        "page_obj": page,
+        "is_paginated": page.has_other_pages(),
+        "object_list": page.object_list,
+        "posts": page.object_list,
+        "pagination_mode": mode,
+        "post_card_timeout": post_card_timeout(),
+    }
+
+
+# Validators of the list and detail pages
+async def index_validators(request):
+    return await apost_list_validators("index", request)
+
+
+async def latest_validators(request):
+    return await apost_list_validators("latest", request)
+
+
+async def user_posts_validators(request, username: str):
+    author_id = await (
+        User.objects.filter(username=username).values_list("pk", flat=True).afirst()
+    )
+    if author_id is None:
+        return None
+    return await apost_list_validators("user_posts", request, author_id=author_id)
+
+
+async def post_detail_validators(request, pk: int):
+    return await apost_detail_validators(pk, request)
+
+
+# List all posts
+@read_from_replica
+@conditional_page(index_validators)
+async def post_list(request) -> HttpResponse:
+    """Async PostListView."""
+    queryset = Post.objects.cards().order_by("-date_posted")
+    context = await apaginate(request, queryset, cached_count=True)
+    return await arender(request, "blog/index.html", context)
+
+
+# List latest posts
+@read_from_replica
+@conditional_page(latest_validators)
+async def latest_posts(request) -> HttpResponse:
+    """Async LatestPostListView."""
+    queryset = Post.objects.latest_per_author().cards().order_by("-date_posted")
+    context = await apaginate(request, queryset, cached_count=False)
+    return await arender(request, "blog/latest_posts.html", context)
+
+
+# List user's posts
+@read_from_replica
+@conditional_page(user_posts_validators)
+async def user_posts(request, username: str) -> HttpResponse:
+    """Async UserPostListView."""
+    user: User = await aget_object_or_404(User, username=username)
+    queryset = Post.objects.cards().filter(author=user).order_by("-date_posted")
+    context = await apaginate(request, queryset, cached_count=True, author_id=user.pk)
+    # user_posts.html reads the username from view.kwargs
+    context["view"] = SimpleNamespace(kwargs={"username": username})
+    return await arender(request, "blog/user_posts.html", context)
+
+
+# Search posts
+@read_from_replica
+async def post_search(request) -> HttpResponse:
+    """Async PostSearchView."""
+    query = request.GET.get("q", "").strip()[:MAX_QUERY_LENGTH]
+    # The fallback index queries the database for its version stamp
+    queryset = await sync_to_async(search_posts)(Post.objects.cards(), query)
+    context = await apaginate(request, queryset, cached_count=False, mode=OFFSET)
+    context["title"] = "Search"
+    context["query"] = query
+    context["pagination_query"] = f"{urlencode({'q': query})}&"
+    return await arender(request, "blog/search.html", context)
+
+
+# Post detail
+@read_from_replica
+@conditional_page(post_detail_validators)
+async def post_detail(request, pk: int) -> HttpResponse:
+    """Async PostDetailView."""
+    post: Post = await aget_object_or_404(
+        Post.objects.select_related("author__profile"), pk=pk
+    )
+    context = {"object": post, "post": post}
+    return await arender(request, "blog/post_detail.html", context)
+
+
+# Render a markdown document page
+async def document_page(
+    request, file_name: str, template_name: str, extensions: list[str]
+) -> HttpResponse:
+    """Render a markdown file from BASE_DIR into a template."""
+    file_path = settings.BASE_DIR / file_name
+
+    # Read and convert to HTML (cached) off the event loop
+    try:
+        html_content = await sync_to_async(
+            render_markdown_file, thread_sensitive=False
+        )(file_path, extensions=extensions)
+    except FileNotFoundError:
+        html_content = f"<p>{file_name} file not found.</p>"
+
+    return await arender(request, template_name, {"markdown_content": html_content})
+
+
+# Home page
+@cache_anonymous_page
+async def home(request) -> HttpResponse:
+    """Async home page view."""
+    return await document_page(
+        request, "README.md", "blog/home.html", extensions=["fenced_code"]
+    )
+
+
+# Landing page for authenticated users
+@cache_anonymous_page
+async def landing_page(request) -> HttpResponse:
+    """Async dispatch view for the landing page.
+    - Authenticated users -> post_list (Blog Index)
+    - Guests -> home (README)
+    """
+    user = await request.auser()
+    if user.is_authenticated:
+        return await post_list(request)
+
+    messages.info(
+        request=request,
+        message="Please login to view the blog. SignUp if you don't have an account.",
+    )
+
+    return await home(request)
+
+
+# About page
+@cache_anonymous_page
+async def about(request) -> HttpResponse:
+    """Async about page view."""
+    return await document_page(
+        request, "DATABASE.md", "blog/about.html", extensions=["fenced_code"]
+    )
+
+
+# Database Ownership page
+@cache_anonymous_page
+async def database_ownership(request) -> HttpResponse:
+    """Async Database Ownership page view."""
+    return await document_page(
+        request,
+        "DATABASE_OWNERSHIP.md",
+        "blog/database_ownership.html",
+        extensions=["fenced_code"],
+    )
+
+
+# Debug Django Container page
+@cache_anonymous_page
+async def debug_django_container(request) -> HttpResponse:
+    """Async Debug Django Container page view."""
+    return await document_page(
+        request,
+        "DEBUG_DJANGO_CONTAINER.md",
+        "blog/debug_django_container.html",
+        extensions=["fenced_code"],
+    )
+
+
+# Docker Commands page
+@cache_anonymous_page
+async def docker_commands(request) -> HttpResponse:
+    """Async Docker Commands page view."""
+    return await document_page(
+        request,
+        "DOCKER_COMMANDS.md",
+        "blog/docker_commands.html",
+        extensions=["fenced_code", "toc"],
+    )
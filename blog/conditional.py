@@ -0,0 +1,316 @@
+# blog/conditional.py
+"""
+Conditional GET support (ETag / Last-Modified) for the post pages.
+
+Validators are computed from cheap lookups only: the post's updated_at and
+author, MAX(updated_at) of the listed posts (served by the updated_at
+indexes), the profile version tokens (users/versions.py) and a token that
+changes when posts are deleted or move to another author. When the client's
+copy is current the view answers 304 without running its main query or
+rendering a template.
+
+Pages are personalised (navbar, edit links) and embed a CSRF token (the
+logout form), so the ETag includes the viewer and their CSRF secret, and
+responses are marked private and `Vary: Cookie`.
+"""
+
+# Import built-in libraries
+import hashlib
+import time
+from calendar import timegm
+from datetime import datetime, timezone
+from functools import wraps
+from inspect import iscoroutinefunction
+
+# Import django libraries
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+
+# Import local modules
+from users.versions import (
+    aget_any_profile_version,
+    aget_profile_versions,
+    get_any_profile_version,
+    get_profile_versions,
+)
+
+from .models import Post
+
+# Key of the token that changes when posts leave a list
+POST_REMOVAL_VERSION_KEY = "blog:post-removal-version"
+
+# (ETag, Last-Modified) of a page
+Validators = tuple[str, datetime]
+
+
+def _new_version() -> str:
+    return str(time.time_ns())
+
+
+def bump_post_removal_version() -> None:
+    """Mark every post list as changed after a post left it."""
+    cache.set(POST_REMOVAL_VERSION_KEY, _new_version(), None)
+
+
+def get_post_removal_version() -> str:
+    """Return the post removal token, creating it when missing."""
+    return cache.get_or_set(POST_REMOVAL_VERSION_KEY, _new_version, None)
+
+
+async def aget_post_removal_version() -> str:
+    """Async version of get_post_removal_version()."""
+    return await cache.aget_or_set(POST_REMOVAL_VERSION_KEY, _new_version, None)
+
+
+def version_time(version: str) -> datetime:
+    """Return the time a version token (time.time_ns()) was created."""
+    return datetime.fromtimestamp(int(version) / 1e9, tz=timezone.utc)
+
+
+def viewer_key(request, user) -> str:
+    """Return the part of the ETag identifying who the page was rendered for.
+
+    Pages of signed-in users embed a CSRF token (the logout form). Logging
+    in rotates the CSRF secret, so a copy rendered before that carries a
+    stale token and must not be revalidated. The secret is only hashed
+    into the ETag, never sent back as is.
+    """
+    if not user.is_authenticated:
+        return "anonymous"
+    # Creates the secret if needed, as rendering the page would
+    get_token(request)
+    return f"{user.pk}:{request.META['CSRF_COOKIE']}"
+
+
+async def aget_user(request):
+    """Return the request's user, loading the lazy user asynchronously."""
+    if hasattr(request, "auser"):
+        return await request.auser()
+    return request.user
+
+
+def make_validators(parts: list, modified: list[datetime | None]) -> Validators:
+    """Build a weak ETag from `parts` and Last-Modified from the newest time."""
+    parts = [
+        getattr(settings, "CONDITIONAL_GET_VERSION", ""),
+        getattr(settings, "BLOG_PAGINATION_MODE", ""),
+        *parts,
+    ]
+    digest = hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()[:32]
+    last_modified = max(moment for moment in modified if moment is not None)
+    return f"W/{quote_etag(digest)}", last_modified
+
+
+def is_conditional_candidate(request) -> bool:
+    """Return True if the request may be answered from the client's copy.
+
+    A pending flash message (messages cookie) is only shown by a full
+    render, so those requests always get one.
+    """
+    return (
+        request.method in ("GET", "HEAD")
+        and CookieStorage.cookie_name not in request.COOKIES
+    )
+
+
+def not_modified(request, validators: Validators) -> HttpResponse | None:
+    """Return a 304 (or 412) response if the client's copy is current."""
+    etag, last_modified = validators
+    response = get_conditional_response(
+        request, etag=etag, last_modified=timegm(last_modified.utctimetuple())
+    )
+    if response is not None:
+        set_validators(response, validators)
+    return response
+
+
+def set_validators(response: HttpResponse, validators: Validators) -> HttpResponse:
+    """Add the validators and revalidation headers to a response."""
+    if response.status_code not in (200, 304):
+        return response
+    etag, last_modified = validators
+    response.headers.setdefault("ETag", etag)
+    response.headers.setdefault(
+        "Last-Modified", http_date(timegm(last_modified.utctimetuple()))
+    )
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Cookie",))
+    return response
+
+
+def post_detail_validators(post_id: int, request) -> Validators | None:
+    """Return the validators of a post page, or None if the post is missing."""
+    row = Post.objects.filter(pk=post_id).values_list("updated_at", "author_id")
+    row = row.first()
+    if row is None:
+        return None
+    updated_at, author_id = row
+    profile_version = get_profile_versions([author_id])[author_id]
+    viewer = viewer_key(request, request.user)
+    return make_validators(
+        ["post", post_id, updated_at.isoformat(), profile_version, viewer],
+        [updated_at, version_time(profile_version)],
+    )
+
+
+async def apost_detail_validators(post_id: int, request) -> Validators | None:
+    """Async version of post_detail_validators()."""
+    row = await (
+        Post.objects.filter(pk=post_id).values_list("updated_at", "author_id").afirst()
+    )
+    if row is None:
+        return None
+    updated_at, author_id = row
+    profile_version = (await aget_profile_versions([author_id]))[author_id]
+    viewer = viewer_key(request, await aget_user(request))
+    return make_validators(
+        ["post", post_id, updated_at.isoformat(), profile_version, viewer],
+        [updated_at, version_time(profile_version)],
+    )
+
+
+def _list_validators(
+    scope: str,
+    last_updated: datetime | None,
+    removal_version: str,
+    profile_version: str,
+    viewer: str,
+) -> Validators:
+    return make_validators(
+        [
+            scope,
+            last_updated.isoformat() if last_updated else "",
+            removal_version,
+            profile_version,
+            viewer,
+        ],
+        [last_updated, version_time(removal_version), version_time(profile_version)],
+    )
+
+
+def post_list_validators(
+    scope: str, request, author_id: int | None = None
+) -> Validators:
+    """Return the validators of a post list page.
+
+    Args:
+        scope (str): Name of the list (part of the ETag).
+        author_id (int | None): Only posts of this author are listed.
+    """
+    posts = Post.objects.all()
+    if author_id is None:
+        profile_version = get_any_profile_version()
+    else:
+        posts = posts.filter(author_id=author_id)
+        profile_version = get_profile_versions([author_id])[author_id]
+    last_updated = posts.aggregate(last_updated=Max("updated_at"))["last_updated"]
+    return _list_validators(
+        scope,
+        last_updated,
+        get_post_removal_version(),
+        profile_version,
+        viewer_key(request, request.user),
+    )
+
+
+async def apost_list_validators(
+    scope: str, request, author_id: int | None = None
+) -> Validators:
+    """Async version of post_list_validators()."""
+    posts = Post.objects.all()
+    if author_id is None:
+        profile_version = await aget_any_profile_version()
+    else:
+        posts = posts.filter(author_id=author_id)
+        profile_version = (await aget_profile_versions([author_id]))[author_id]
+    result = await posts.aaggregate(last_updated=Max("updated_at"))
+    return _list_validators(
+        scope,
+        result["last_updated"],
+        await aget_post_removal_version(),
+        profile_version,
+        viewer_key(request, await aget_user(request)),
+    )
+
+
+def conditional_page(get_validators):
+    """Decorate a function or async view with ETag / Last-Modified validation.
+
+    `get_validators(request, *args, **kwargs)` returns the page's validators
+    or None; for async views it must be a coroutine function.
+    """
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                validators = None
+                if is_conditional_candidate(request):
+                    validators = await get_validators(request, *args, **kwargs)
+                if validators is not None:
+                    response = not_modified(request, validators)
+                    if response is not None:
+                        return response
+                response = await view(request, *args, **kwargs)
+                if validators is not None:
+                    set_validators(response, validators)
+                return response
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            validators = None
+            if is_conditional_candidate(request):
+                validators = get_validators(request, *args, **kwargs)
+            if validators is not None:
+                response = not_modified(request, validators)
+                if response is not None:
+                    return response
+            response = view(request, *args, **kwargs)
+            if validators is not None:
+                set_validators(response, validators)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+class ConditionalGetMixin:
+    """Answer conditional GETs before a class-based view does its work.
+
+    Subclasses implement get_validators(); returning None skips conditional
+    handling (e.g. the object does not exist and the view will 404).
+    """
+
+    # Compute the page's validators
+    def get_validators(self) -> Validators | None:
+        """Get (ETag, Last-Modified) for the requested page."""
+        raise NotImplementedError
+
+    # Return 304 when the client's copy is current
+    def get(self, request, *args, **kwargs) -> HttpResponse:
+        """Handle GET with ETag / Last-Modified validation."""
+        validators = None
+        if is_conditional_candidate(request):
+            validators = self.get_validators()
+        if validators is not None:
+            response = not_modified(request, validators)
+            if response is not None:
+                return response
+        response = super().get(request, *args, **kwargs)  # type: ignore[misc]
+        if validators is not None:
+            set_validators(response, validators)
+        return response
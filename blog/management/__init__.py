@@ -0,0 +1 @@
+# blog/management/__init__.py
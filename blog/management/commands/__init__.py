@@ -0,0 +1 @@
+# blog/management/commands/__init__.py
@@ -0,0 +1,116 @@
+# blog/management/commands/benchmark_db_connections.py
+
+# Import built-in libraries
+import copy
+import statistics
+import time
+
+# Import django libraries
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.utils import load_backend
+
+# Connection strategies compared by the benchmark
+MODES = ("per-request", "persistent", "pool")
+
+
+class Command(BaseCommand):
+    """Benchmark per-request database overhead for each connection strategy.
+
+    Each simulated request does what Django does around a real one: closes
+    unusable or expired connections when it starts, runs a few queries and
+    releases the connection when it finishes. The modes are:
+
+        per-request  CONN_MAX_AGE = 0, a new connection for every request
+        persistent   CONN_MAX_AGE > 0 with health checks
+        pool         psycopg 3 connection pool (PostgreSQL only)
+    """
+
+    help = "Compare per-request latency with and without connection reuse."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=3,
+            help="Queries per simulated request (a list page runs about 3).",
+        )
+        parser.add_argument(
+            "--mode",
+            action="append",
+            choices=MODES,
+            help="Mode to run (repeatable, default: all).",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options) -> None:
+        base_settings = connections[options["database"]].settings_dict
+        modes = options["mode"] or MODES
+
+        self.stdout.write(
+            f"{'mode':<12} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'mean ms':>8}"
+        )
+        for mode in modes:
+            if mode == "pool" and "postgresql" not in base_settings["ENGINE"]:
+                self.stdout.write(f"{mode:<12} skipped (PostgreSQL only)")
+                continue
+            connection = self.make_connection(base_settings, mode)
+            try:
+                latencies = self.run_requests(
+                    connection, options["requests"], options["queries"]
+                )
+            finally:
+                connection.close()
+                if mode == "pool":
+                    connection.close_pool()
+            cut_points = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                f"{mode:<12} "
+                f"{cut_points[49] * 1000:>8.2f} "
+                f"{cut_points[94] * 1000:>8.2f} "
+                f"{cut_points[98] * 1000:>8.2f} "
+                f"{statistics.fmean(latencies) * 1000:>8.2f}"
+            )
+
+    # Build a standalone connection configured for one mode
+    @staticmethod
+    def make_connection(base_settings: dict, mode: str) -> BaseDatabaseWrapper:
+        """Return a connection that does not share state with the app's."""
+        settings_dict = copy.deepcopy(base_settings)
+        settings_dict["OPTIONS"].pop("pool", None)
+        if mode == "per-request":
+            settings_dict["CONN_MAX_AGE"] = 0
+        elif mode == "persistent":
+            settings_dict["CONN_MAX_AGE"] = base_settings["CONN_MAX_AGE"] or 60
+            settings_dict["CONN_HEALTH_CHECKS"] = True
+        else:
+            settings_dict["CONN_MAX_AGE"] = 0
+            pool_options = base_settings["OPTIONS"].get("pool")
+            settings_dict["OPTIONS"]["pool"] = pool_options or {"max_size": 2}
+        backend = load_backend(settings_dict["ENGINE"])
+        # A separate alias keeps the pool apart from the app's own pool
+        return backend.DatabaseWrapper(settings_dict, alias=f"benchmark-{mode}")
+
+    # Time simulated requests
+    @staticmethod
+    def run_requests(
+        connection: BaseDatabaseWrapper, requests: int, queries: int
+    ) -> list[float]:
+        """Return the latency of each simulated request in seconds."""
+        if requests < 2:
+            raise CommandError("--requests must be at least 2.")
+        latencies: list[float] = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            # request_started -> close_old_connections()
+            connection.close_if_unusable_or_obsolete()
+            with connection.cursor() as cursor:
+                for _ in range(queries):
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+            # request_finished -> close_old_connections()
+            connection.close_if_unusable_or_obsolete()
+            latencies.append(time.perf_counter() - started)
+        return latencies
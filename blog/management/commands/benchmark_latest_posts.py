@@ -0,0 +1,123 @@
+# blog/management/commands/benchmark_latest_posts.py
+
+# Import built-in libraries
+import time
+from datetime import timedelta
+
+# Import django libraries
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+# Import local modules
+from blog.models import Post
+
+
+# Previous LatestPostListView implementation, kept for comparison
+def legacy_latest_post_ids() -> list[int]:
+    """Return latest post ids using the former two-list `__in` query."""
+    latest_post_ids = (
+        Post.objects.values("author")
+        .annotate(latest_date=Max("date_posted"))
+        .values_list("author", "latest_date")
+    )
+    return list(
+        Post.objects.filter(
+            author__in=[item[0] for item in latest_post_ids],
+            date_posted__in=[item[1] for item in latest_post_ids],
+        )
+        .order_by("-date_posted")
+        .values_list("id", flat=True)
+    )
+
+
+# Current LatestPostListView implementation
+def latest_post_ids() -> list[int]:
+    """Return latest post ids using the greatest-per-group query."""
+    return list(
+        Post.objects.latest_per_author()
+        .order_by("-date_posted")
+        .values_list("id", flat=True)
+    )
+
+
+class Command(BaseCommand):
+    """Benchmark the latest-post-per-author query.
+
+    Seeds synthetic authors and posts inside a transaction that is rolled
+    back afterwards, then times the legacy and current implementations.
+    """
+
+    help = "Benchmark the latest-post-per-author query against the legacy version."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--authors", type=int, default=100_000)
+        parser.add_argument("--posts-per-author", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument(
+            "--skip-legacy",
+            action="store_true",
+            help="Do not time the legacy implementation.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            self.seed(
+                authors=options["authors"],
+                posts_per_author=options["posts_per_author"],
+                batch_size=options["batch_size"],
+            )
+            current = self.time_query(latest_post_ids, options["repeat"])
+            self.report("latest_per_author", current)
+            if not options["skip_legacy"]:
+                legacy = self.time_query(legacy_latest_post_ids, options["repeat"])
+                self.report("legacy", legacy)
+                extra = len(legacy[1]) - len(current[1])
+                self.stdout.write(f"legacy returned {extra} extra post(s)")
+            # Discard the synthetic data
+            transaction.set_rollback(True)
+
+    # Insert synthetic authors and posts
+    def seed(self, authors: int, posts_per_author: int, batch_size: int) -> None:
+        """Seed authors and posts with bulk inserts."""
+        started = time.perf_counter()
+        prefix = f"bench-{int(time.time())}"
+        users = User.objects.bulk_create(
+            (User(username=f"{prefix}-{i}") for i in range(authors)),
+            batch_size=batch_size,
+        )
+        now = timezone.now()
+        posts = (
+            Post(
+                title=f"Post {n}",
+                content="Benchmark post.",
+                author_id=user.pk,
+                # Share timestamps across authors to expose `__in` mismatches
+                date_posted=now - timedelta(minutes=n + (i % 7)),
+            )
+            for i, user in enumerate(users)
+            for n in range(posts_per_author)
+        )
+        Post.objects.bulk_create(posts, batch_size=batch_size)
+        self.stdout.write(
+            f"seeded {authors} authors x {posts_per_author} posts "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    # Run a query function several times and keep the best timing
+    @staticmethod
+    def time_query(func, repeat: int) -> tuple[float, list[int]]:
+        """Return (best seconds, result) over `repeat` runs."""
+        best, result = float("inf"), []
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - started)
+        return best, result
+
+    def report(self, label: str, timing: tuple[float, list[int]]) -> None:
+        seconds, result = timing
+        self.stdout.write(f"{label}: {seconds * 1000:.1f} ms, {len(result)} posts")
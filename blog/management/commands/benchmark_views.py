@@ -0,0 +1,227 @@
+# blog/management/commands/benchmark_views.py
+
+# Import built-in libraries
+import json
+import statistics
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+# Import django libraries
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connections
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+# Import local modules
+from blog.models import Post
+
+from .seed_posts import seed_username
+
+
+class Command(BaseCommand):
+    """Benchmark the hot views in-process and compare against a baseline.
+
+    Each view is requested --requests times through the test client (full
+    middleware stack, no network), as a user created by seed_posts or as a
+    guest. The report lists requests/sec, latency percentiles and the
+    queries per request (counted on a warm-up request, outside the timed
+    loop). Results can be saved as a JSON baseline and later runs compared
+    with it; --max-regression turns a slower p95 or an extra query into a
+    failing exit status.
+
+        python manage.py seed_posts --users 100 --posts 10000
+        python manage.py benchmark_views --save-baseline benchmarks.json
+        python manage.py benchmark_views --baseline benchmarks.json \\
+            --max-regression 0.2
+    """
+
+    help = "Benchmark hot views with the test client (see seed_posts)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--username",
+            help="User to log in as (default: the first user seeded with --prefix).",
+        )
+        parser.add_argument("--prefix", default="seed")
+        parser.add_argument(
+            "--view",
+            action="append",
+            help="Only run this view (repeatable, default: all).",
+        )
+        parser.add_argument("--baseline", help="Baseline JSON file to compare with.")
+        parser.add_argument("--save-baseline", help="Write the results to this file.")
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            help="Fail if p95 grows by more than this fraction (e.g. 0.2) "
+            "or a view runs more queries than in the baseline.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["requests"] < 2:
+            raise CommandError("--requests must be at least 2.")
+        username = options["username"] or seed_username(options["prefix"], 0)
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            raise CommandError(f"User '{username}' not found; run seed_posts first.")
+        post = Post.objects.filter(author=user).order_by("-date_posted").first()
+        if post is None:
+            raise CommandError(f"User '{username}' has no posts to benchmark.")
+
+        targets = self.get_targets(user, post)
+        if options["view"]:
+            unknown = set(options["view"]) - targets.keys()
+            if unknown:
+                raise CommandError(
+                    f"Unknown view(s): {', '.join(sorted(unknown))}. "
+                    f"Choose from {', '.join(targets)}."
+                )
+            targets = {name: targets[name] for name in options["view"]}
+        baseline = self.load_baseline(options["baseline"])
+        if settings.DEBUG:
+            self.stderr.write("DEBUG is on; timings include debug overhead.")
+
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            guest, member = Client(), Client()
+            member.force_login(user)
+            results = {
+                name: self.run_view(
+                    member if logged_in else guest,
+                    url,
+                    options["requests"],
+                    options["warmup"],
+                )
+                for name, (url, logged_in) in targets.items()
+            }
+
+        self.report(results, baseline)
+        if options["save_baseline"]:
+            Path(options["save_baseline"]).write_text(
+                json.dumps(
+                    {
+                        "created": timezone.now().isoformat(),
+                        "database": connections["default"].vendor,
+                        "requests": options["requests"],
+                        "views": results,
+                    },
+                    indent=2,
+                )
+                + "\n",
+                encoding="utf-8",
+            )
+            self.stdout.write(f"baseline written to {options['save_baseline']}")
+        if options["max_regression"] is not None and baseline:
+            regressions = self.find_regressions(
+                results, baseline, options["max_regression"]
+            )
+            if regressions:
+                raise CommandError("Regressions: " + "; ".join(regressions))
+
+    # Views covered by the benchmark
+    @staticmethod
+    def get_targets(user, post) -> dict[str, tuple[str, bool]]:
+        """Return {name: (url, logged in)} of the benchmarked views."""
+        return {
+            # Guests get the README home page, members the post index
+            "landing-page:guest": (reverse("landing-page"), False),
+            "landing-page": (reverse("landing-page"), True),
+            "post-latest": (reverse("post-latest"), True),
+            "user-posts": (reverse("user-posts", args=[user.username]), True),
+            "post-detail": (reverse("post-detail", args=[post.pk]), True),
+            "profile": (reverse("profile"), True),
+        }
+
+    # Time one view
+    @staticmethod
+    def run_view(client: Client, url: str, requests: int, warmup: int) -> dict:
+        """Return the metrics of `requests` GETs of `url`."""
+        # Warm up templates and caches, counting the queries of the last request
+        for _ in range(max(warmup - 1, 0)):
+            client.get(url)
+        with ExitStack() as stack:
+            captures = [
+                stack.enter_context(CaptureQueriesContext(connection))
+                for connection in connections.all()
+            ]
+            client.get(url)
+        queries = sum(len(capture) for capture in captures)
+
+        latencies: list[float] = []
+        started = time.perf_counter()
+        for _ in range(requests):
+            request_started = time.perf_counter()
+            response = client.get(url)
+            latencies.append(time.perf_counter() - request_started)
+            if response.status_code >= 400:
+                raise CommandError(f"{url} returned {response.status_code}.")
+        elapsed = time.perf_counter() - started
+
+        cut_points = statistics.quantiles(latencies, n=100)
+        return {
+            "url": url,
+            "rps": round(requests / elapsed, 1),
+            "p50_ms": round(cut_points[49] * 1000, 2),
+            "p95_ms": round(cut_points[94] * 1000, 2),
+            "p99_ms": round(cut_points[98] * 1000, 2),
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+            "queries": queries,
+        }
+
+    # Read the views of a baseline file
+    @staticmethod
+    def load_baseline(path: str | None) -> dict:
+        """Return {view: metrics} from a baseline file, or {} without one."""
+        if not path:
+            return {}
+        try:
+            return json.loads(Path(path).read_text(encoding="utf-8"))["views"]
+        except (OSError, ValueError, KeyError) as error:
+            raise CommandError(f"Cannot read baseline '{path}': {error}")
+
+    def report(self, results: dict, baseline: dict) -> None:
+        self.stdout.write(
+            f"{'view':<20} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'mean ms':>8} {'queries':>8}"
+            + (f" {'p95 vs base':>12} {'queries vs base':>16}" if baseline else "")
+        )
+        for name, metrics in results.items():
+            line = (
+                f"{name:<20} {metrics['rps']:>8.1f} {metrics['p50_ms']:>8.2f} "
+                f"{metrics['p95_ms']:>8.2f} {metrics['p99_ms']:>8.2f} "
+                f"{metrics['mean_ms']:>8.2f} {metrics['queries']:>8}"
+            )
+            base = baseline.get(name)
+            if base:
+                change = metrics["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0
+                line += f" {change:>+12.1%} {metrics['queries'] - base['queries']:>+16}"
+            elif baseline:
+                line += f" {'new':>12} {'new':>16}"
+            self.stdout.write(line)
+
+    # Compare the results with the baseline
+    @staticmethod
+    def find_regressions(results: dict, baseline: dict, allowed: float) -> list[str]:
+        """Return a description of each view slower or heavier than its baseline."""
+        regressions = []
+        for name, metrics in results.items():
+            base = baseline.get(name)
+            if not base:
+                continue
+            if metrics["queries"] > base["queries"]:
+                regressions.append(
+                    f"{name} runs {metrics['queries']} queries "
+                    f"(baseline {base['queries']})"
+                )
+            if metrics["p95_ms"] > base["p95_ms"] * (1 + allowed):
+                regressions.append(
+                    f"{name} p95 {metrics['p95_ms']:.2f} ms "
+                    f"(baseline {base['p95_ms']:.2f} ms)"
+                )
+        return regressions
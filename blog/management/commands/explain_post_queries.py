@@ -0,0 +1,113 @@
+# blog/management/commands/explain_post_queries.py
+
+# Import built-in libraries
+import re
+
+# Import django libraries
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.test import RequestFactory
+
+# Import local modules
+from blog.models import Post
+from blog.views import LatestPostListView, PostListView, UserPostListView
+
+# Plan fragments showing blog_post is read sequentially rather than by index
+SEQ_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on blog_post\b"),
+    "sqlite": re.compile(r"SCAN blog_post(?! USING (COVERING )?INDEX)"),
+}
+
+# Index each list view's query must be planned with (see Post.Meta.indexes)
+VIEW_INDEXES = {
+    PostListView: "blog_post_date_posted_idx",
+    LatestPostListView: "blog_post_author_date_idx",
+    UserPostListView: "blog_post_author_date_idx",
+}
+
+
+class Command(BaseCommand):
+    """Verify that the post list view queries are served by their indexes.
+
+    Each list view's first-page query is run through EXPLAIN, and the plan
+    must name the index the view relies on (VIEW_INDEXES) and must not
+    scan blog_post sequentially. Any other index scan (e.g. of the primary
+    key followed by a sort) fails. On PostgreSQL sequential scans are
+    disabled for the check (SET LOCAL) so that small development tables
+    still report whether the index is usable.
+    """
+
+    help = "EXPLAIN the post list queries; fail unless each uses its index."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--username",
+            help="Author used for UserPostListView (defaults to any author).",
+        )
+        parser.add_argument(
+            "--planner-default",
+            action="store_true",
+            help="Keep the PostgreSQL planner defaults (allow seq scans).",
+        )
+        parser.add_argument(
+            "--show-plan", action="store_true", help="Print each query plan."
+        )
+
+    def handle(self, *args, **options) -> None:
+        vendor = connection.vendor
+        if vendor not in SEQ_SCAN_PATTERNS:
+            raise CommandError(f"EXPLAIN checks are not supported on '{vendor}'.")
+
+        failures = []
+        with transaction.atomic():
+            if vendor == "postgresql" and not options["planner_default"]:
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for name, index, queryset in self.view_querysets(options["username"]):
+                plan = queryset.explain()
+                uses_index = bool(re.search(rf"\b{index}\b", plan))
+                seq_scan = bool(SEQ_SCAN_PATTERNS[vendor].search(plan))
+                ok = uses_index and not seq_scan
+                status = self.style.SUCCESS("OK") if ok else self.style.ERROR("FAIL")
+                self.stdout.write(f"{status} {name} ({index})")
+                if options["show_plan"] or not ok:
+                    self.stdout.write(plan)
+                if not ok:
+                    failures.append(name)
+
+        if failures:
+            raise CommandError(
+                f"Not served by the expected index: {', '.join(failures)}"
+            )
+
+    # Build each list view's first-page queryset
+    def view_querysets(self, username: str | None) -> list[tuple[str, str, QuerySet]]:
+        """Return (view name, expected index, first page queryset) triples."""
+        if username is None:
+            author = Post.objects.values_list("author__username", flat=True).first()
+            username = author or "unknown"
+
+        request = RequestFactory().get("/")
+        views = [
+            (PostListView, {}),
+            (LatestPostListView, {}),
+            (UserPostListView, {"username": username}),
+        ]
+        querysets = []
+        for view_class, kwargs in views:
+            view = view_class()
+            view.setup(request, **kwargs)
+            try:
+                queryset = view.get_queryset()
+            except Exception as exc:
+                raise CommandError(f"{view_class.__name__}: {exc}") from exc
+            querysets.append(
+                (
+                    view_class.__name__,
+                    VIEW_INDEXES[view_class],
+                    queryset[: view.get_paginate_by(queryset)],
+                )
+            )
+        return querysets
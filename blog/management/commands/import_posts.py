@@ -0,0 +1,191 @@
+# blog/management/commands/import_posts.py
+
+# Import built-in libraries
+import sys
+import time
+from contextlib import nullcontext
+
+# Import django libraries
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+# Import local modules
+from blog.models import Post
+from blog.pagination import post_count_key
+from blog.search import reset_fallback_index
+from blog.transfer import (
+    FORMATS,
+    AuthorCache,
+    InvalidRecord,
+    detect_format,
+    parse_record,
+    read_records,
+)
+
+# Columns filled by the PostgreSQL COPY fast path
+COPY_COLUMNS = [
+    "title",
+    "content",
+    "content_html",
+    "excerpt_html",
+    "date_posted",
+    "updated_at",
+    "author_id",
+]
+
+
+class Command(BaseCommand):
+    """Import posts from a JSON Lines or CSV file.
+
+    Each record needs `title`, `content` and `author` (an existing
+    username); `date_posted` is optional. The file is read one record at a
+    time and written in batches of --batch-size posts, each batch in its own
+    transaction, so memory use stays flat however large the file is. On
+    PostgreSQL batches are sent with COPY instead of INSERT.
+
+    bulk_create and COPY send no post_save signals, so the cached post
+    counters and the in-memory search index are reset once at the end.
+    With a locmem cache that only reaches this process; running workers
+    recount once their counters expire (POST_COUNT_CACHE_TIMEOUT).
+    """
+
+    help = "Import posts in bulk from JSONL or CSV (use - for stdin)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="File to read, or - for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="File format (default: from the extension, else jsonl).",
+        )
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--skip-invalid",
+            action="store_true",
+            help="Skip invalid records and unknown authors instead of stopping.",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use INSERT on PostgreSQL instead of COPY.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        self.using = options["database"]
+        self.skip_invalid = options["skip_invalid"]
+        self.authors = AuthorCache(self.using)
+        self.author_ids: set[int] = set()
+        self.skipped = 0
+        use_copy = (
+            connections[self.using].vendor == "postgresql" and not options["no_copy"]
+        )
+        write_batch = self.copy_batch if use_copy else self.create_batch
+
+        path = options["path"]
+        fmt = detect_format(path, options["format"])
+        started = time.perf_counter()
+        imported = 0
+        source = (
+            nullcontext(sys.stdin)
+            if path == "-"
+            else open(path, newline="", encoding="utf-8")
+        )
+        with source as stream:
+            try:
+                batch: list[tuple] = []
+                for line_number, record in read_records(stream, fmt):
+                    try:
+                        batch.append((line_number, *parse_record(record)))
+                    except InvalidRecord as error:
+                        self.reject(f"line {line_number}: {error}", imported)
+                    if len(batch) >= batch_size:
+                        imported += write_batch(self.build_posts(batch, imported))
+                        batch = []
+                if batch:
+                    imported += write_batch(self.build_posts(batch, imported))
+            except InvalidRecord as error:
+                # The rest of an unreadable file cannot be recovered
+                raise CommandError(f"{error} ({imported} posts imported before it)")
+            finally:
+                self.finish()
+
+        self.stdout.write(
+            f"imported {imported} posts ({self.skipped} skipped) in "
+            f"{time.perf_counter() - started:.1f}s"
+        )
+
+    # Stop, or count the record as skipped
+    def reject(self, message: str, imported: int) -> None:
+        """Raise CommandError for a bad record unless --skip-invalid is set."""
+        if not self.skip_invalid:
+            raise CommandError(f"{message} ({imported} posts imported before it)")
+        self.skipped += 1
+
+    # Turn parsed records into unsaved posts
+    def build_posts(self, batch: list[tuple], imported: int) -> list[Post]:
+        """Resolve the batch's authors and render each post's HTML."""
+        self.authors.load(author for _, _, _, author, _ in batch)
+        now = timezone.now()
+        posts: list[Post] = []
+        for line_number, title, content, author, date_posted in batch:
+            author_id = self.authors.get(author)
+            if author_id is None:
+                self.reject(f"line {line_number}: unknown author '{author}'", imported)
+                continue
+            post = Post(
+                title=title,
+                content=content,
+                author_id=author_id,
+                date_posted=date_posted or now,
+            )
+            post.render_content()
+            posts.append(post)
+            self.author_ids.add(author_id)
+        return posts
+
+    # Insert a batch with bulk_create
+    def create_batch(self, posts: list[Post]) -> int:
+        """Insert posts with multi-row INSERTs (split by the backend's limits)."""
+        with transaction.atomic(using=self.using):
+            Post.objects.using(self.using).bulk_create(posts)
+        return len(posts)
+
+    # Insert a batch with COPY (PostgreSQL)
+    def copy_batch(self, posts: list[Post]) -> int:
+        """Stream posts into blog_post with COPY ... FROM STDIN."""
+        connection = connections[self.using]
+        quote = connection.ops.quote_name
+        sql = (
+            f"COPY {quote(Post._meta.db_table)} "
+            f"({', '.join(quote(column) for column in COPY_COLUMNS)}) FROM STDIN"
+        )
+        now = timezone.now()
+        with transaction.atomic(using=self.using), connection.cursor() as cursor:
+            # The search_vector trigger also fires for copied rows
+            with cursor.cursor.copy(sql) as copy:
+                for post in posts:
+                    copy.write_row(
+                        (
+                            post.title,
+                            post.content,
+                            post.content_html,
+                            post.excerpt_html,
+                            post.date_posted,
+                            now,
+                            post.author_id,
+                        )
+                    )
+        return len(posts)
+
+    # Reset what the skipped post_save signals would have updated
+    def finish(self) -> None:
+        """Drop the cached counters of the affected scopes and the search index."""
+        if self.author_ids:
+            cache.delete_many([post_count_key(), *map(post_count_key, self.author_ids)])
+            reset_fallback_index()
@@ -0,0 +1,140 @@
+# blog/management/commands/load_benchmark.py
+
+# Import built-in libraries
+import http.client
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# Import django libraries
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+# Pages exercised by default (guest-visible read paths)
+DEFAULT_PATHS = ["/", "/home/", "/about/", "/latest/", "/docker-commands/"]
+
+
+class Command(BaseCommand):
+    """Load-test running servers and compare throughput and latency.
+
+    Start the site once with SERVER_INTERFACE=wsgi and once with
+    SERVER_INTERFACE=asgi (e.g. on ports 8000 and 8001), then pass both
+    base URLs to compare requests/sec and p50/p95/p99 latency side by side:
+
+        python manage.py load_benchmark --url http://127.0.0.1:8000 \\
+            --url http://127.0.0.1:8001 --concurrency 64 --duration 30
+    """
+
+    help = "Load-test one or more running servers over HTTP."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--url",
+            action="append",
+            required=True,
+            help="Base URL of a running server (repeat to compare servers).",
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            help="Path to request (repeatable, default: guest read pages).",
+        )
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--duration", type=float, default=15.0)
+        parser.add_argument("--warmup", type=float, default=2.0)
+        parser.add_argument(
+            "--cookie", help="Cookie header to send, e.g. 'sessionid=...'."
+        )
+
+    def handle(self, *args, **options) -> None:
+        paths = options["path"] or DEFAULT_PATHS
+        headers = {"Cookie": options["cookie"]} if options["cookie"] else {}
+
+        rows = []
+        for base_url in options["url"]:
+            if options["warmup"]:
+                self.run_load(
+                    base_url, paths, options["concurrency"], options["warmup"], headers
+                )
+            latencies, errors, elapsed = self.run_load(
+                base_url, paths, options["concurrency"], options["duration"], headers
+            )
+            rows.append((base_url, latencies, errors, elapsed))
+
+        self.stdout.write(
+            f"{'server':<32} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'mean ms':>8} {'errors':>7}"
+        )
+        for base_url, latencies, errors, elapsed in rows:
+            if len(latencies) < 2:
+                self.stdout.write(
+                    f"{base_url:<32} {len(latencies)} successful requests, "
+                    f"{errors} errors (too few for percentiles)"
+                )
+                continue
+            cut_points = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                f"{base_url:<32} {len(latencies) / elapsed:>9.1f} "
+                f"{cut_points[49] * 1000:>8.1f} "
+                f"{cut_points[94] * 1000:>8.1f} "
+                f"{cut_points[98] * 1000:>8.1f} "
+                f"{statistics.fmean(latencies) * 1000:>8.1f} {errors:>7}"
+            )
+
+    # Drive concurrent keep-alive clients for a fixed duration
+    def run_load(
+        self,
+        base_url: str,
+        paths: list[str],
+        concurrency: int,
+        duration: float,
+        headers: dict[str, str],
+    ) -> tuple[list[float], int, float]:
+        """Return (latencies in seconds, error count, elapsed seconds)."""
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise CommandError(f"Invalid --url '{base_url}'.")
+        connection_class = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        prefix = parts.path.rstrip("/")
+
+        lock = threading.Lock()
+        latencies: list[float] = []
+        errors = 0
+        deadline = time.perf_counter() + duration
+
+        def client(worker: int) -> None:
+            nonlocal errors
+            connection = connection_class(parts.hostname, parts.port, timeout=30)
+            local_latencies: list[float] = []
+            local_errors = 0
+            n = worker
+            while time.perf_counter() < deadline:
+                path = prefix + paths[n % len(paths)]
+                n += 1
+                started = time.perf_counter()
+                try:
+                    connection.request("GET", path, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    if response.status >= 400:
+                        local_errors += 1
+                        continue
+                except (OSError, http.client.HTTPException):
+                    local_errors += 1
+                    connection.close()
+                    continue
+                local_latencies.append(time.perf_counter() - started)
+            connection.close()
+            with lock:
+                latencies.extend(local_latencies)
+                errors += local_errors
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(client, range(concurrency)))
+        return latencies, errors, time.perf_counter() - started
@@ -0,0 +1,67 @@
+# blog/management/commands/render_posts.py
+
+# Import built-in libraries
+import time
+
+# Import django libraries
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+# Import local modules
+from blog.models import Post
+from blog.post_cards import bump_post_card_versions
+
+
+class Command(BaseCommand):
+    """Render stored HTML for existing posts.
+
+    New and edited posts are rendered on save; this backfills rows created
+    before content_html existed (NULL until rendered, since the HTML of a
+    post can legitimately be empty), or re-renders every post (--all)
+    after the markdown extensions or sanitizer settings change.
+    """
+
+    help = "Render content_html and excerpt_html for posts in bulk."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-render every post, not only those without HTML.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options) -> None:
+        started = time.perf_counter()
+        batch_size = options["batch_size"]
+        queryset = Post.objects.only("pk", "content").order_by("pk")
+        if not options["all"]:
+            queryset = queryset.filter(content_html__isnull=True)
+
+        rendered = 0
+        batch: list[Post] = []
+        for post in queryset.iterator(chunk_size=batch_size):
+            post.render_content()
+            batch.append(post)
+            if len(batch) >= batch_size:
+                rendered += self.write_batch(batch)
+                batch = []
+        if batch:
+            rendered += self.write_batch(batch)
+
+        self.stdout.write(
+            f"rendered {rendered} posts in {time.perf_counter() - started:.1f}s"
+        )
+
+    # Store a batch of rendered posts
+    @staticmethod
+    def write_batch(batch: list[Post]) -> int:
+        """Bulk update the rendered HTML and refresh the cached cards."""
+        # bulk_update skips auto_now, so mark the posts changed explicitly
+        now = timezone.now()
+        for post in batch:
+            post.updated_at = now
+        Post.objects.bulk_update(batch, ["content_html", "excerpt_html", "updated_at"])
+        # bulk_update sends no post_save signals
+        bump_post_card_versions(post.pk for post in batch)
+        return len(batch)
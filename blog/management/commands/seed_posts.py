@@ -0,0 +1,130 @@
+# blog/management/commands/seed_posts.py
+
+# Import built-in libraries
+import time
+from datetime import timedelta
+
+# Import django libraries
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.utils import timezone
+
+# Import local modules
+from blog.models import Post
+from blog.pagination import post_count_key
+from blog.rendering import render_excerpt_html, render_post_html
+from blog.search import reset_fallback_index
+from users.models import Profile
+
+# Markdown bodies cycled through by the seeded posts
+CONTENT_VARIANTS = [
+    "A short post with **bold** text and a [link](https://example.com).",
+    "## Heading\n\nTwo paragraphs of text.\n\nThe second one has `inline code`.",
+    "- first item\n- second item\n- third item\n\nFollowed by a paragraph.",
+    "```python\nprint('hello')\n```\n\nA code block and some *emphasis*.",
+    " ".join(["Longer post body with enough words to be truncated."] * 20),
+]
+
+
+def seed_username(prefix: str, number: int) -> str:
+    """Return the username of the n-th seeded user."""
+    return f"{prefix}-user-{number}"
+
+
+class Command(BaseCommand):
+    """Fill the database with synthetic users and posts for benchmarking.
+
+    Users get profiles and share one password (hashed once). Posts are
+    spread round-robin over the users, one minute apart, with their HTML
+    rendered once per content variant. Everything is written with
+    bulk_create, so the cached post counters and the in-memory search index
+    are reset at the end (with a locmem cache, running workers recount once
+    their counters expire, see POST_COUNT_CACHE_TIMEOUT). Seeded users are
+    named `<prefix>-user-<n>`; --clear deletes the users (and their posts)
+    of an earlier run first.
+    """
+
+    help = "Seed synthetic users and posts (see benchmark_views)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--posts", type=int, default=10_000)
+        parser.add_argument("--prefix", default="seed")
+        parser.add_argument("--password", default="benchmark")
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete the users and posts of an earlier run with this prefix.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["users"] < 1 or options["posts"] < 0:
+            raise CommandError("--users must be at least 1 and --posts at least 0.")
+        prefix = options["prefix"]
+        seeded = User.objects.filter(username__startswith=f"{prefix}-user-")
+        if options["clear"]:
+            deleted = seeded.delete()[1].get(Post._meta.label, 0)
+            self.stdout.write(f"deleted {deleted} posts of earlier seeded users")
+        elif seeded.exists():
+            raise CommandError(
+                f"Users named '{prefix}-user-*' already exist; pass --clear."
+            )
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            user_ids = self.seed_users(
+                prefix, options["users"], options["password"], options["batch_size"]
+            )
+            self.seed_posts(user_ids, options["posts"], options["batch_size"])
+        reset_fallback_index()
+        cache.delete_many([post_count_key(), *map(post_count_key, user_ids)])
+
+        self.stdout.write(
+            f"seeded {len(user_ids)} users and {options['posts']} posts in "
+            f"{time.perf_counter() - started:.1f}s"
+        )
+
+    # Create the users and their profiles
+    @staticmethod
+    def seed_users(prefix: str, count: int, password: str, batch_size: int) -> list:
+        """Bulk create users with profiles and return their ids."""
+        password_hash = make_password(password)
+        users = User.objects.bulk_create(
+            (
+                User(username=seed_username(prefix, i), password=password_hash)
+                for i in range(count)
+            ),
+            batch_size=batch_size,
+        )
+        # bulk_create sends no post_save, so create_profile does not run
+        Profile.objects.bulk_create(
+            (Profile(user_id=user.pk) for user in users), batch_size=batch_size
+        )
+        return [user.pk for user in users]
+
+    # Create posts spread over the users
+    @staticmethod
+    def seed_posts(user_ids: list, count: int, batch_size: int) -> None:
+        """Bulk create posts with pre-rendered HTML, newest first."""
+        rendered = []
+        for content in CONTENT_VARIANTS:
+            content_html = render_post_html(content)
+            rendered.append((content, content_html, render_excerpt_html(content_html)))
+        now = timezone.now()
+        # bulk_create materializes its input, so hand it one batch at a time
+        for start in range(0, count, batch_size):
+            Post.objects.bulk_create(
+                Post(
+                    title=f"Seeded post {n}",
+                    content=rendered[n % len(rendered)][0],
+                    content_html=rendered[n % len(rendered)][1],
+                    excerpt_html=rendered[n % len(rendered)][2],
+                    author_id=user_ids[n % len(user_ids)],
+                    date_posted=now - timedelta(minutes=n),
+                )
+                for n in range(start, min(start + batch_size, count))
+            )
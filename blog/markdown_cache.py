@@ -0,0 +1,123 @@
+# blog/markdown_cache.py
+
+# Import built-in libraries
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# Import django libraries
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+
+# Import third-party libraries
+from markdown import markdown
+
+# Get an instance of a logger
+logger = logging.getLogger(__name__)
+
+# Default number of compiled documents kept in the per-process LRU
+DEFAULT_MAX_ENTRIES = 32
+
+
+class RenderedDocumentCache:
+    """Cache of markdown documents compiled to HTML.
+
+    Entries are keyed on the file path, its modification time and size plus
+    the markdown extensions used, so editing a file invalidates its entry on
+    the next lookup without any explicit purge.
+
+    Attributes:
+        max_entries (int): Maximum number of documents kept in-process.
+        cache_alias (str | None): Optional Django cache alias used as a
+            second, shared tier between worker processes.
+    """
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, cache_alias: str | None = None
+    ) -> None:
+        self.max_entries = max_entries
+        self.cache_alias = cache_alias
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Build the in-process key for a file version
+    @staticmethod
+    def _make_key(file_path: Path, extensions: tuple[str, ...]) -> tuple:
+        """Return a key that changes whenever the file changes on disk."""
+        stat = file_path.stat()
+        return (str(file_path), stat.st_mtime_ns, stat.st_size, extensions)
+
+    # Build the shared cache key for a file version
+    @staticmethod
+    def _make_shared_key(key: tuple) -> str:
+        """Return a backend-safe cache key for the shared tier."""
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return f"blog:markdown:{digest}"
+
+    # Resolve the optional shared cache backend
+    def _shared_cache(self):
+        """Return the shared cache backend, or None if not configured."""
+        if not self.cache_alias:
+            return None
+        try:
+            return caches[self.cache_alias]
+        except InvalidCacheBackendError:
+            logger.warning(f"Markdown cache alias '{self.cache_alias}' is not defined.")
+            return None
+
+    # Render a markdown file, using cached HTML where possible
+    def render(self, file_path: Path, extensions: list[str] | None = None) -> str:
+        """Return the HTML for a markdown file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        extensions_key = tuple(extensions or ())
+        key = self._make_key(file_path, extensions_key)
+
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                return html
+
+        shared_cache = self._shared_cache()
+        shared_key = self._make_shared_key(key)
+        html = shared_cache.get(shared_key) if shared_cache is not None else None
+
+        if html is None:
+            markdown_text = file_path.read_text(encoding="utf-8")
+            html = markdown(markdown_text, extensions=list(extensions_key))
+            if shared_cache is not None:
+                shared_cache.set(shared_key, html, timeout=None)
+
+        with self._lock:
+            # Drop stale versions of the same file before storing the new one
+            for stale_key in [k for k in self._entries if k[0] == key[0]]:
+                del self._entries[stale_key]
+            self._entries[key] = html
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return html
+
+    # Remove all in-process entries
+    def clear(self) -> None:
+        """Clear the in-process tier."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared instance used by the document views
+document_cache = RenderedDocumentCache(
+    max_entries=getattr(settings, "MARKDOWN_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+    cache_alias=getattr(settings, "MARKDOWN_CACHE_ALIAS", None),
+)
+
+
+def render_markdown_file(file_path: Path, extensions: list[str] | None = None) -> str:
+    """Render a markdown file to HTML through the shared document cache."""
+    return document_cache.render(file_path=file_path, extensions=extensions)
@@ -0,0 +1,52 @@
+# blog/migration_operations.py
+"""
+Migration operations shared by the blog migrations.
+"""
+
+# Import django libraries
+from django.db import migrations
+
+
+class AddIndexConcurrentlyOnPostgres(migrations.AddIndex):
+    """AddIndex that uses CREATE INDEX CONCURRENTLY on PostgreSQL.
+
+    Concurrent builds do not lock the table against writes, so the index
+    can be added to a live blog_post table. Other databases fall back to a
+    regular CREATE INDEX. Migrations using it must set `atomic = False`.
+
+    Attributes:
+        postgres_only (bool): Skip the index on other databases.
+    """
+
+    postgres_only = False
+
+    # Whether the index is built on this connection
+    def _applies(self, schema_editor, model) -> bool:
+        if self.postgres_only and schema_editor.connection.vendor != "postgresql":
+            return False
+        return self.allow_migrate_model(schema_editor.connection.alias, model)
+
+    # Only the PostgreSQL schema editor accepts `concurrently`
+    @staticmethod
+    def _options(schema_editor) -> dict:
+        if schema_editor.connection.vendor == "postgresql":
+            return {"concurrently": True}
+        return {}
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self._applies(schema_editor, model):
+            schema_editor.add_index(model, self.index, **self._options(schema_editor))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self._applies(schema_editor, model):
+            schema_editor.remove_index(
+                model, self.index, **self._options(schema_editor)
+            )
+
+
+class AddIndexConcurrentlyOnlyOnPostgres(AddIndexConcurrentlyOnPostgres):
+    """AddIndexConcurrentlyOnPostgres for PostgreSQL-only index types (GIN)."""
+
+    postgres_only = True
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+from blog.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('blog', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='post',
+            index=models.Index(fields=['author', '-date_posted'], name='blog_post_author_date_idx'),
+        ),
+    ]
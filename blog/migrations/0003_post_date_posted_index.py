@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+from blog.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('blog', '0002_post_author_date_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='post',
+            index=models.Index(fields=['-date_posted'], name='blog_post_date_posted_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0003_post_date_posted_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="content_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="excerpt_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+    ]
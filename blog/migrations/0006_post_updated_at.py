@@ -0,0 +1,60 @@
+# Generated by Django 5.1.15 on 2026-10-18 20:05
+
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+from blog.migration_operations import AddIndexConcurrentlyOnPostgres
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+# Existing posts were last changed, as far as we know, when they were posted.
+# Rows are updated in primary key batches so no single statement locks the
+# whole table (the migration is not atomic, so each batch commits on its own)
+def backfill_updated_at(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    posts = Post.objects.using(schema_editor.connection.alias)
+    last_pk = 0
+    while True:
+        pks = list(
+            posts.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:BACKFILL_BATCH_SIZE]
+        )
+        if not pks:
+            break
+        posts.filter(pk__gte=pks[0], pk__lte=pks[-1]).update(
+            updated_at=F("date_posted")
+        )
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("blog", "0005_post_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="post",
+            index=models.Index(fields=["updated_at"], name="blog_post_updated_at_idx"),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="post",
+            index=models.Index(
+                fields=["author", "updated_at"], name="blog_post_author_updated_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.15 on 2026-10-18 23:10
+
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+# Rows never rendered hold "", which could also be a post whose HTML is
+# empty; mark them NULL so render_posts renders each of them once. Rows are
+# updated in primary key batches so no single statement locks the table
+def mark_unrendered(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    posts = Post.objects.using(schema_editor.connection.alias)
+    last_pk = 0
+    while True:
+        pks = list(
+            posts.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:BACKFILL_BATCH_SIZE]
+        )
+        if not pks:
+            break
+        posts.filter(pk__gte=pks[0], pk__lte=pks[-1], content_html="").update(
+            content_html=None
+        )
+        last_pk = pks[-1]
+
+
+def mark_unrendered_reverse(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Post.objects.using(schema_editor.connection.alias).filter(
+        content_html__isnull=True
+    ).update(content_html="")
+
+
+class Migration(migrations.Migration):
+
+    # Each backfill batch commits on its own
+    atomic = False
+
+    dependencies = [
+        ("blog", "0006_post_updated_at"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="content_html",
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(mark_unrendered, mark_unrendered_reverse),
+    ]
@@ -2,25 +2,116 @@
 
 # Import django libraries
 from django.contrib.auth.models import User
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connections, models
+from django.db.models import OuterRef, Subquery
 from django.urls import reverse
 from django.utils import timezone
 
+# Import local modules
+from .rendering import render_excerpt_html, render_post_html
+
+
+class PostQuerySet(models.QuerySet):
+    """Post queryset with shared query helpers."""
+
+    # Get each author's most recent post
+    def latest_per_author(self) -> "PostQuerySet":
+        """Return the latest post of every author (greatest-per-group).
+
+        Ties on date_posted are broken by id so exactly one post per author
+        is returned. PostgreSQL uses DISTINCT ON; other databases use a
+        correlated subquery. Both are served by the (author, -date_posted)
+        index.
+        """
+        if connections[self.db].vendor == "postgresql":
+            latest_ids = (
+                self.order_by("author_id", "-date_posted", "-id")
+                .distinct("author_id")
+                .values("id")
+            )
+        else:
+            newest_of_author = (
+                self.model._default_manager.using(self.db)
+                .filter(author_id=OuterRef("author_id"))
+                .order_by("-date_posted", "-id")
+                .values("id")[:1]
+            )
+            latest_ids = self.filter(id=Subquery(newest_of_author)).values("id")
+        return self.filter(id__in=latest_ids)
+
+    # Load what the list-page post cards render
+    def cards(self) -> "PostQuerySet":
+        """Join the author and profile and skip the full post bodies."""
+        return self.select_related("author__profile").defer(
+            "content", "content_html", "search_vector"
+        )
+
 
 class Post(models.Model):
     """Post model.
 
     Attributes:
         title (str): Post title.
-        content (str): Post content.
+        content (str): Post content (markdown).
+        content_html (str | None): Sanitized HTML rendered from content on
+            save, or None until the post is rendered (see render_posts).
+        excerpt_html (str): Truncated content_html shown on list pages.
+        search_vector (SearchVector): Weighted title/content lexemes, kept up
+            to date by a PostgreSQL trigger (unused on other databases).
         date_posted (datetime): Post date posted.
+        updated_at (datetime): Last change, used for conditional GETs.
         author (User): Post author."""
 
     title = models.CharField(max_length=100)
     content = models.TextField()
+    content_html = models.TextField(blank=True, null=True, editable=False)
+    excerpt_html = models.TextField(blank=True, default="", editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
     date_posted = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
 
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-date_posted"], name="blog_post_date_posted_idx"),
+            models.Index(
+                fields=["author", "-date_posted"], name="blog_post_author_date_idx"
+            ),
+            GinIndex(fields=["search_vector"], name="blog_post_search_vector_idx"),
+            models.Index(fields=["updated_at"], name="blog_post_updated_at_idx"),
+            models.Index(
+                fields=["author", "updated_at"], name="blog_post_author_updated_idx"
+            ),
+        ]
+
+    # Remember the loaded author so signal handlers can detect reassignment
+    @classmethod
+    def from_db(cls, db, field_names, values) -> "Post":
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_author_id = instance.__dict__.get("author_id")
+        return instance
+
+    # Render the stored HTML from the markdown content
+    def render_content(self) -> None:
+        """Set content_html and excerpt_html from content."""
+        self.content_html = render_post_html(self.content)
+        self.excerpt_html = render_excerpt_html(self.content_html)
+
+    # Keep the rendered HTML and updated_at in step with the content
+    def save(self, *args, **kwargs) -> None:
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            self.render_content()
+            if update_fields is not None:
+                update_fields = {*update_fields, "content_html", "excerpt_html"}
+        if update_fields:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+        super().save(*args, **kwargs)
+
     # Represent post title
     def __str__(self) -> str:
         return self.title
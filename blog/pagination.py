@@ -0,0 +1,332 @@
+# blog/pagination.py
+
+# Import built-in libraries
+import base64
+import binascii
+from datetime import datetime
+
+# Import django libraries
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.http import Http404
+from django.utils.functional import cached_property
+
+# Import third-party libraries
+from asgiref.sync import sync_to_async
+
+# Pagination modes supported by the list views
+OFFSET = "offset"
+KEYSET = "keyset"
+
+
+class InvalidCursor(Exception):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(date_posted: datetime, pk: int, direction: str) -> str:
+    """Encode a (date_posted, id) position as an opaque cursor token.
+
+    Args:
+        date_posted (datetime): Sort key of the boundary row.
+        pk (int): Primary key of the boundary row (tie breaker).
+        direction (str): "n" to page forward, "p" to page backward.
+    """
+    raw = f"{direction}|{date_posted.isoformat()}|{pk}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[str, datetime, int]:
+    """Decode a cursor token into (direction, date_posted, id)."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        direction, date_value, pk = raw.split("|")
+        if direction not in ("n", "p"):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(date_value), int(pk)
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise InvalidCursor(token) from exc
+
+
+class KeysetPage:
+    """A page of results from a KeysetPaginator.
+
+    Attributes:
+        object_list (list): Objects on this page.
+        next_cursor (str | None): Token for the following page.
+        previous_cursor (str | None): Token for the preceding page.
+    """
+
+    is_keyset = True
+
+    def __init__(
+        self,
+        object_list: list,
+        paginator: "KeysetPaginator",
+        has_next: bool,
+        has_previous: bool,
+    ) -> None:
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __repr__(self) -> str:
+        return f"<KeysetPage of {len(self.object_list)} objects>"
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self) -> str | None:
+        if not self._has_next or not self.object_list:
+            return None
+        last = self.object_list[-1]
+        return encode_cursor(last.date_posted, last.pk, "n")
+
+    @property
+    def previous_cursor(self) -> str | None:
+        if not self._has_previous or not self.object_list:
+            return None
+        first = self.object_list[0]
+        return encode_cursor(first.date_posted, first.pk, "p")
+
+
+class KeysetPaginator:
+    """Cursor paginator ordered by (-date_posted, -id).
+
+    Each page is fetched with a range condition on the sort key instead of
+    OFFSET, and no COUNT(*) is issued, so page N costs the same as page 1.
+
+    Attributes:
+        queryset (QuerySet): Posts to paginate.
+        per_page (int): Number of objects per page.
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int) -> None:
+        self.queryset = queryset
+        self.per_page = int(per_page)
+
+    def _page_queryset(self, cursor: str | None) -> tuple[QuerySet, str | None]:
+        """Return the queryset fetching one row past the page, and direction.
+
+        Raises:
+            InvalidCursor: If the cursor token is malformed.
+        """
+        queryset = self.queryset.order_by()
+        limit = self.per_page + 1
+        if not cursor:
+            return queryset.order_by("-date_posted", "-id")[:limit], None
+
+        direction, date_posted, pk = decode_cursor(cursor)
+        if direction == "n":
+            return (
+                queryset.filter(
+                    Q(date_posted__lt=date_posted)
+                    | Q(date_posted=date_posted, id__lt=pk)
+                ).order_by("-date_posted", "-id")[:limit],
+                direction,
+            )
+        return (
+            queryset.filter(
+                Q(date_posted__gt=date_posted) | Q(date_posted=date_posted, id__gt=pk)
+            ).order_by("date_posted", "id")[:limit],
+            direction,
+        )
+
+    def _build_page(self, rows: list, direction: str | None) -> KeysetPage:
+        """Build a page from the fetched rows."""
+        has_more = len(rows) > self.per_page
+        object_list = rows[: self.per_page]
+        if direction == "p":
+            object_list.reverse()
+            return KeysetPage(object_list, self, has_next=True, has_previous=has_more)
+        return KeysetPage(
+            object_list, self, has_next=has_more, has_previous=direction == "n"
+        )
+
+    def page(self, cursor: str | None) -> KeysetPage:
+        """Return the page following/preceding the given cursor.
+
+        Raises:
+            InvalidCursor: If the cursor token is malformed.
+        """
+        queryset, direction = self._page_queryset(cursor)
+        return self._build_page(list(queryset), direction)
+
+    async def apage(self, cursor: str | None) -> KeysetPage:
+        """Async version of page()."""
+        queryset, direction = self._page_queryset(cursor)
+        return self._build_page([row async for row in queryset], direction)
+
+
+class KeysetPaginationMixin:
+    """Opt-in keyset pagination for ListView subclasses.
+
+    The mode is taken from `pagination_mode` on the view, falling back to
+    the BLOG_PAGINATION_MODE setting. In keyset mode the `cursor` query
+    parameter replaces `page`.
+
+    Attributes:
+        pagination_mode (str | None): "offset", "keyset" or None for the setting.
+        cursor_kwarg (str): Query parameter carrying the cursor token.
+    """
+
+    pagination_mode: str | None = None
+    cursor_kwarg = "cursor"
+
+    # Resolve the pagination mode for this view
+    def get_pagination_mode(self) -> str:
+        """Get pagination mode."""
+        return self.pagination_mode or getattr(settings, "BLOG_PAGINATION_MODE", OFFSET)
+
+    # Paginate with cursors when keyset mode is enabled
+    def paginate_queryset(self, queryset, page_size):
+        """Paginate queryset."""
+        if self.get_pagination_mode() != KEYSET:
+            return super().paginate_queryset(queryset, page_size)  # type: ignore[misc]
+
+        paginator = KeysetPaginator(queryset=queryset, per_page=page_size)
+        cursor = self.request.GET.get(self.cursor_kwarg)  # type: ignore[attr-defined]
+        try:
+            page = paginator.page(cursor)
+        except InvalidCursor:
+            raise Http404("Invalid pagination cursor.")
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    # Expose the active mode to templates
+    def get_context_data(self, **kwargs):
+        """Add pagination mode to context."""
+        context = super().get_context_data(**kwargs)  # type: ignore[misc]
+        context["pagination_mode"] = self.get_pagination_mode()
+        return context
+
+
+def post_count_timeout() -> int:
+    """Return how long post counters stay cached (POST_COUNT_CACHE_TIMEOUT).
+
+    Counters are adjusted in the cache on save and delete, which other
+    workers only see with a shared backend. With locmem they are kept for
+    a short time, so another worker's count (and with it the last page
+    number) is never stale for long.
+    """
+    return getattr(settings, "POST_COUNT_CACHE_TIMEOUT", 60)
+
+
+def post_count_key(author_id: int | None = None) -> str:
+    """Return the cache key of the global or per-author post counter."""
+    if author_id is None:
+        return "blog:post-count:global"
+    return f"blog:post-count:author:{author_id}"
+
+
+# Estimate the table size from PostgreSQL planner statistics
+def estimated_post_count(queryset: QuerySet) -> int | None:
+    """Return pg_class.reltuples for blog_post, or None when unavailable."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 (or 0) until the table has been analyzed
+    if row is None or row[0] <= 0:
+        return None
+    return int(row[0])
+
+
+def get_post_count(queryset: QuerySet, author_id: int | None = None) -> int:
+    """Return the cached post count for a scope, computing it when cold.
+
+    The global count falls back to the planner estimate when the table is
+    larger than BLOG_APPROXIMATE_COUNT_THRESHOLD, so a cold cache never
+    triggers a full COUNT(*) scan of a very large table.
+    """
+    key = post_count_key(author_id)
+    count = cache.get(key)
+    if count is not None:
+        return count
+
+    count = None
+    if author_id is None:
+        threshold = getattr(settings, "BLOG_APPROXIMATE_COUNT_THRESHOLD", None)
+        estimate = estimated_post_count(queryset) if threshold else None
+        if estimate is not None and estimate >= threshold:
+            count = estimate
+    if count is None:
+        count = queryset.count()
+
+    cache.add(key, count, timeout=post_count_timeout())
+    return count
+
+
+async def aget_post_count(queryset: QuerySet, author_id: int | None = None) -> int:
+    """Async version of get_post_count()."""
+    key = post_count_key(author_id)
+    count = await cache.aget(key)
+    if count is not None:
+        return count
+
+    count = None
+    if author_id is None:
+        threshold = getattr(settings, "BLOG_APPROXIMATE_COUNT_THRESHOLD", None)
+        estimate = (
+            await sync_to_async(estimated_post_count)(queryset) if threshold else None
+        )
+        if estimate is not None and estimate >= threshold:
+            count = estimate
+    if count is None:
+        count = await queryset.acount()
+
+    await cache.aadd(key, count, timeout=post_count_timeout())
+    return count
+
+
+def adjust_post_count(author_id: int, delta: int) -> None:
+    """Add delta to the global and per-author counters that are cached."""
+    for key in (post_count_key(), post_count_key(author_id)):
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # Counter not cached; it will be computed on the next request
+            pass
+
+
+def invalidate_post_count(author_id: int | None = None) -> None:
+    """Drop a cached counter so it is recomputed on the next request."""
+    cache.delete(post_count_key(author_id))
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator whose count comes from a cached per-scope post counter.
+
+    Attributes:
+        author_id (int | None): Author scope, or None for all posts.
+    """
+
+    def __init__(self, *args, author_id: int | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.author_id = author_id
+
+    @cached_property
+    def count(self) -> int:
+        """Return the total number of posts in scope."""
+        return get_post_count(self.object_list, author_id=self.author_id)
@@ -0,0 +1,96 @@
+# blog/post_cards.py
+"""
+Versioned post-card fragments for the list pages.
+
+Each card is cached with {% cache %} under the post id plus a version made
+of the post's token and its author's profile token (users/versions.py).
+blog/signals.py and users/signals.py replace a token when the post, user or
+profile changes, so only the affected cards are rendered again.
+"""
+
+# Import built-in libraries
+import time
+
+# Import django libraries
+from django.conf import settings
+from django.core.cache import cache
+
+# Import local modules
+from users.versions import aget_profile_versions, get_profile_versions
+
+# Version tokens never expire on their own; eviction just forces a new token
+POST_CARD_VERSION_TIMEOUT = None
+
+
+def post_card_version_key(post_id: int) -> str:
+    """Return the cache key of a post card's version token."""
+    return f"blog:post-card-version:{post_id}"
+
+
+def _new_version() -> str:
+    return str(time.time_ns())
+
+
+def bump_post_card_version(post_id: int) -> None:
+    """Invalidate the cached card of a post."""
+    cache.set(post_card_version_key(post_id), _new_version(), POST_CARD_VERSION_TIMEOUT)
+
+
+def bump_post_card_versions(post_ids) -> None:
+    """Invalidate the cached cards of many posts with one cache call."""
+    cache.set_many(
+        {post_card_version_key(post_id): _new_version() for post_id in post_ids},
+        POST_CARD_VERSION_TIMEOUT,
+    )
+
+
+def _missing_versions(keys, found: dict) -> dict[str, str]:
+    return {key: _new_version() for key in keys if key not in found}
+
+
+def _set_card_versions(posts, post_versions: dict, author_versions: dict) -> None:
+    for post in posts:
+        post.card_version = (
+            f"{post_versions[post_card_version_key(post.pk)]}"
+            f"-{author_versions[post.author_id]}"
+        )
+
+
+def attach_card_versions(posts) -> None:
+    """Set `card_version` on each post for the {% cache %} fragment key."""
+    posts = list(posts)
+    keys = [post_card_version_key(post.pk) for post in posts]
+    post_versions = cache.get_many(keys)
+    missing = _missing_versions(keys, post_versions)
+    if missing:
+        cache.set_many(missing, POST_CARD_VERSION_TIMEOUT)
+    author_versions = get_profile_versions(post.author_id for post in posts)
+    _set_card_versions(posts, {**post_versions, **missing}, author_versions)
+
+
+async def aattach_card_versions(posts) -> None:
+    """Async version of attach_card_versions()."""
+    keys = [post_card_version_key(post.pk) for post in posts]
+    post_versions = await cache.aget_many(keys)
+    missing = _missing_versions(keys, post_versions)
+    if missing:
+        await cache.aset_many(missing, POST_CARD_VERSION_TIMEOUT)
+    author_versions = await aget_profile_versions(post.author_id for post in posts)
+    _set_card_versions(posts, {**post_versions, **missing}, author_versions)
+
+
+def post_card_timeout() -> int:
+    """Return how long rendered cards stay cached (seconds)."""
+    return getattr(settings, "POST_CARD_CACHE_TIMEOUT", 60)
+
+
+class PostCardMixin:
+    """Attach card versions to the posts of a list view's page."""
+
+    # Add card versions and the fragment timeout to the context
+    def get_context_data(self, **kwargs):
+        """Get context data."""
+        context = super().get_context_data(**kwargs)  # type: ignore[misc]
+        attach_card_versions(context["object_list"])
+        context["post_card_timeout"] = post_card_timeout()
+        return context
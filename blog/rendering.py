@@ -0,0 +1,43 @@
+# blog/rendering.py
+"""
+Markdown rendering for post content.
+
+Posts are rendered once when saved (Post.render_content) and the sanitized
+HTML is stored on the row, so pages never run markdown per request.
+"""
+
+# Import django libraries
+from django.utils.text import Truncator
+
+# Import third-party libraries
+import nh3
+from markdown import markdown
+
+# Markdown extensions used for posts
+POST_EXTENSIONS = ["fenced_code", "tables"]
+
+# Words kept in the list-card excerpt
+EXCERPT_WORDS = 60
+
+# nh3 defaults, plus the language class fenced_code puts on code blocks
+ALLOWED_ATTRIBUTES = {**nh3.ALLOWED_ATTRIBUTES, "code": {"class"}}
+
+
+def render_post_html(content: str) -> str:
+    """Convert post markdown to sanitized HTML.
+
+    Raw HTML in the source is filtered, scripts and event handlers are
+    removed and links may only use http(s) or mailto.
+    """
+    html = markdown(content, extensions=POST_EXTENSIONS)
+    return nh3.clean(
+        html,
+        attributes=ALLOWED_ATTRIBUTES,
+        url_schemes={"http", "https", "mailto"},
+        link_rel="nofollow noopener noreferrer",
+    )
+
+
+def render_excerpt_html(content_html: str, words: int = EXCERPT_WORDS) -> str:
+    """Truncate rendered HTML to a number of words, closing open tags."""
+    return Truncator(content_html).words(words, html=True)
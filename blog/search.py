@@ -0,0 +1,207 @@
+# blog/search.py
+"""
+Full-text search over post titles and contents.
+
+On PostgreSQL each post carries a stored `search_vector` (title weighted A,
+content weighted B) kept up to date by a database trigger (see migration
+0005) and served by a GIN index. Matches are capped at
+BLOG_SEARCH_MAX_RESULTS newest posts before ranking, so the cost of a
+query stays bounded however common its terms are.
+
+Other databases (SQLite dev setups) use an in-memory inverted index per
+process. Each search first reads a cheap version stamp (post count and
+newest updated_at); when another worker or a management command has
+changed the posts since the index was built, it is rebuilt. Writes that
+skip updated_at (queryset.update()) need reset_fallback_index().
+"""
+
+# Import built-in libraries
+import math
+import re
+import threading
+from collections import defaultdict
+
+# Import django libraries
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    Max,
+    QuerySet,
+    Value,
+    When,
+)
+
+# Text search configuration of the stored vectors (see migration 0005)
+SEARCH_CONFIG = "english"
+
+# Longest query string that is searched; the rest is ignored
+MAX_QUERY_LENGTH = 200
+
+# Fallback index weights, mirroring PostgreSQL's default A and B weights
+TITLE_WEIGHT = 1.0
+CONTENT_WEIGHT = 0.4
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens of two or more characters."""
+    return [token for token in TOKEN_RE.findall(text.lower()) if len(token) > 1]
+
+
+def max_results() -> int:
+    """Return the number of matches ranked per search."""
+    return getattr(settings, "BLOG_SEARCH_MAX_RESULTS", 1000)
+
+
+class InvertedIndex:
+    """In-memory inverted index of post titles and contents.
+
+    Attributes:
+        postings (dict[str, dict[int, float]]): Term -> {post id: weight}.
+        terms (dict[int, set[str]]): Post id -> indexed terms.
+    """
+
+    def __init__(self) -> None:
+        self.postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self.terms: dict[int, set[str]] = {}
+        self.lock = threading.Lock()
+
+    # Index (or re-index) a post
+    def add(self, post_id: int, title: str, content: str) -> None:
+        """Index the terms of a post, replacing what was indexed before."""
+        weights: dict[str, float] = defaultdict(float)
+        for token in tokenize(title):
+            weights[token] += TITLE_WEIGHT
+        for token in tokenize(content):
+            weights[token] += CONTENT_WEIGHT
+        with self.lock:
+            self._remove(post_id)
+            for term, weight in weights.items():
+                self.postings[term][post_id] = weight
+            self.terms[post_id] = set(weights)
+
+    # Drop a post from the index
+    def remove(self, post_id: int) -> None:
+        """Remove a post from the index."""
+        with self.lock:
+            self._remove(post_id)
+
+    def _remove(self, post_id: int) -> None:
+        for term in self.terms.pop(post_id, ()):
+            postings = self.postings[term]
+            postings.pop(post_id, None)
+            if not postings:
+                del self.postings[term]
+
+    # Rank the posts containing every query term
+    def search(self, query: str, limit: int) -> list[int]:
+        """Return up to `limit` post ids matching all terms, best first.
+
+        Scores add up each term's weight times its inverse document
+        frequency; ties go to the newer (higher id) post.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        with self.lock:
+            postings = sorted((self.postings.get(term, {}) for term in terms), key=len)
+            if not postings[0]:
+                return []
+            matches = set(postings[0]).intersection(*postings[1:])
+            total = len(self.terms)
+            scores = dict.fromkeys(matches, 0.0)
+            for term_postings in postings:
+                idf = math.log(1 + total / len(term_postings))
+                for post_id in matches:
+                    scores[post_id] += term_postings[post_id] * idf
+        ranked = sorted(scores, key=lambda post_id: (-scores[post_id], -post_id))
+        return ranked[:limit]
+
+
+_index: InvertedIndex | None = None
+_index_version: tuple | None = None
+_index_lock = threading.Lock()
+
+
+def fallback_index_version(queryset: QuerySet) -> tuple:
+    """Return (post count, newest updated_at), which changes on every write."""
+    posts = queryset.model._default_manager.using(queryset.db)
+    stamp = posts.aggregate(count=Count("pk"), last_updated=Max("updated_at"))
+    return stamp["count"], stamp["last_updated"]
+
+
+def get_fallback_index(queryset: QuerySet) -> InvertedIndex:
+    """Return the process-wide fallback index, (re)building it when stale."""
+    global _index, _index_version
+    version = fallback_index_version(queryset)
+    with _index_lock:
+        if _index is None or _index_version != version:
+            index = InvertedIndex()
+            rows = queryset.model._default_manager.using(queryset.db).values_list(
+                "pk", "title", "content"
+            )
+            for post_id, title, content in rows.iterator(chunk_size=2000):
+                index.add(post_id, title, content)
+            _index, _index_version = index, version
+        return _index
+
+
+def reset_fallback_index() -> None:
+    """Forget the fallback index so the next search rebuilds it."""
+    global _index, _index_version
+    with _index_lock:
+        _index, _index_version = None, None
+
+
+def uses_fallback_index(using: str) -> bool:
+    """Return True if searches on a database go through the fallback index."""
+    return connections[using].vendor != "postgresql"
+
+
+def search_posts(queryset: QuerySet, query: str) -> QuerySet:
+    """Return the posts of `queryset` matching `query`, best match first.
+
+    The result holds at most BLOG_SEARCH_MAX_RESULTS posts. An empty query
+    matches nothing.
+    """
+    query = query.strip()[:MAX_QUERY_LENGTH]
+    if not tokenize(query):
+        return queryset.none()
+    if uses_fallback_index(queryset.db):
+        return _fallback_search(queryset, query)
+    return _postgres_search(queryset, query)
+
+
+def _postgres_search(queryset: QuerySet, query: str) -> QuerySet:
+    search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+    # Newest matches first, so common terms can walk the date index
+    candidates = (
+        queryset.filter(search_vector=search_query)
+        .order_by("-date_posted")
+        .values("pk")[: max_results()]
+    )
+    return (
+        queryset.filter(pk__in=candidates)
+        .annotate(rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-rank", "-date_posted", "-pk")
+    )
+
+
+def _fallback_search(queryset: QuerySet, query: str) -> QuerySet:
+    post_ids = get_fallback_index(queryset).search(query, max_results())
+    if not post_ids:
+        return queryset.none()
+    ranking = Case(
+        *(
+            When(pk=post_id, then=Value(position))
+            for position, post_id in enumerate(post_ids)
+        ),
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=post_ids).order_by(ranking)
@@ -0,0 +1,53 @@
+# blog/signals.py
+
+# Import built-in libraries
+from functools import partial
+
+# Import django libraries
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Import local modules
+from .conditional import bump_post_removal_version
+from .models import Post
+from .pagination import adjust_post_count, invalidate_post_count
+from .post_cards import bump_post_card_version
+
+
+@receiver(signal=post_save, sender=Post)
+def update_post_count_on_save(sender, instance, created, **kwargs) -> None:
+    """Keep the cached post counters in sync with new or reassigned posts."""
+    if kwargs.get("raw", False):
+        return
+    if created:
+        transaction.on_commit(partial(adjust_post_count, instance.author_id, 1))
+        return
+
+    loaded_author_id = getattr(instance, "_loaded_author_id", instance.author_id)
+    if loaded_author_id != instance.author_id:
+        for author_id in (loaded_author_id, instance.author_id):
+            transaction.on_commit(partial(invalidate_post_count, author_id))
+        # The post left its old author's list without changing its MAX(updated_at)
+        transaction.on_commit(bump_post_removal_version)
+        instance._loaded_author_id = instance.author_id
+
+
+@receiver(signal=post_delete, sender=Post)
+def update_post_count_on_delete(sender, instance, **kwargs) -> None:
+    """Decrement the cached post counters when a post is deleted."""
+    transaction.on_commit(partial(adjust_post_count, instance.author_id, -1))
+
+
+@receiver(signal=post_delete, sender=Post)
+def invalidate_post_lists_on_delete(sender, instance, **kwargs) -> None:
+    """Change the list ETags; a deletion leaves MAX(updated_at) unchanged."""
+    transaction.on_commit(bump_post_removal_version)
+
+
+@receiver(signal=post_save, sender=Post)
+def invalidate_post_card(sender, instance, **kwargs) -> None:
+    """Re-render the post's cached card after it changes."""
+    if kwargs.get("raw", False):
+        return
+    transaction.on_commit(partial(bump_post_card_version, instance.pk))
@@ -1,6 +1,1141 @@
 # blog/tests.py
 
+# Import built-in libraries
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
 # Import django libraries
-from django.test import TestCase  # noqa: F401
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import CommandError, call_command
+from django.http import Http404, HttpResponse
+from django.test import (
+    Client,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+from django.utils import timezone
+
+# Import third-party libraries
+from asgiref.sync import async_to_sync
+from PIL import Image
+
+# Import local modules
+from mysite import profiling, routers
+
+from . import api, async_views
+from .conditional import bump_post_removal_version
+from .markdown_cache import RenderedDocumentCache
+from .models import Post
+from .pagination import KeysetPaginator, get_post_count, post_count_key
+from .post_cards import post_card_version_key
+from .search import InvertedIndex, reset_fallback_index, search_posts
+
+
+class MediaRootMixin:
+    """Point MEDIA_ROOT at a temporary directory holding the default avatar.
+
+    Attributes:
+        media_root (Path): The temporary MEDIA_ROOT.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._media_dir = tempfile.TemporaryDirectory()
+        cls.media_root = Path(cls._media_dir.name)
+        Image.new("RGB", (300, 300)).save(cls.media_root / "default.jpg")
+        cls._media_override = override_settings(MEDIA_ROOT=cls._media_dir.name)
+        cls._media_override.enable()
+        super().setUpClass()  # type: ignore[misc]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()  # type: ignore[misc]
+        cls._media_override.disable()
+        cls._media_dir.cleanup()
+
+
+class RenderedDocumentCacheTests(SimpleTestCase):
+    """Tests for the compiled markdown document cache."""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = Path(self.tmp_dir.name) / "DOC.md"
+        self.file_path.write_text("# Title", encoding="utf-8")
+        self.cache = RenderedDocumentCache(max_entries=2)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_render_reuses_compiled_html(self) -> None:
+        first = self.cache.render(self.file_path, extensions=["fenced_code"])
+        self.assertIn("<h1>Title</h1>", first)
+        self.assertIs(self.cache.render(self.file_path, ["fenced_code"]), first)
+
+    def test_render_invalidates_on_file_change(self) -> None:
+        self.cache.render(self.file_path)
+        self.file_path.write_text("# Changed title", encoding="utf-8")
+        stat = self.file_path.stat()
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertIn("Changed title", self.cache.render(self.file_path))
+        self.assertEqual(len(self.cache._entries), 1)
+
+    def test_missing_file_raises(self) -> None:
+        with self.assertRaises(FileNotFoundError):
+            self.cache.render(Path(self.tmp_dir.name) / "MISSING.md")
+
+
+class KeysetPaginatorTests(MediaRootMixin, TestCase):
+    """Tests for cursor based pagination of posts."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_user(username="author", password="pass")
+        same_time = timezone.now()
+        # Two posts share a timestamp to exercise the id tie breaker
+        cls.posts = [
+            Post.objects.create(
+                title=f"Post {i}",
+                content="content",
+                author=cls.user,
+                date_posted=same_time if i < 2 else same_time - timezone.timedelta(i),
+            )
+            for i in range(7)
+        ]
+
+    def collect_forward(self, paginator: KeysetPaginator) -> list[list[int]]:
+        pages, cursor = [], None
+        while True:
+            page = paginator.page(cursor)
+            pages.append([post.pk for post in page])
+            if not page.has_next():
+                return pages
+            cursor = page.next_cursor
+
+    def test_forward_pages_cover_all_posts_once(self) -> None:
+        paginator = KeysetPaginator(Post.objects.all(), per_page=3)
+        pages = self.collect_forward(paginator)
+        expected = list(
+            Post.objects.order_by("-date_posted", "-id").values_list("pk", flat=True)
+        )
+        self.assertEqual([pk for page in pages for pk in page], expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+    def test_previous_cursor_returns_preceding_page(self) -> None:
+        paginator = KeysetPaginator(Post.objects.all(), per_page=3)
+        first = paginator.page(None)
+        second = paginator.page(first.next_cursor)
+        back = paginator.page(second.previous_cursor)
+        self.assertEqual([p.pk for p in back], [p.pk for p in first])
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    @override_settings(BLOG_PAGINATION_MODE="keyset")
+    def test_list_view_renders_cursor_links(self) -> None:
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("blog-index"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "?cursor=")
+        response = self.client.get(reverse("blog-index"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+
+class PostQueryBudgetTests(MediaRootMixin, TestCase):
+    """Guard the list and detail views against per-row (N+1) queries.
+
+    Each view is rendered with a full page of posts by distinct authors;
+    the budget must not depend on the number of rows rendered.
+    """
+
+    # session, user, MAX(updated_at), COUNT(*), posts
+    INDEX_BUDGET = 5
+    # session, user, author lookup, MAX(updated_at), COUNT(*), posts
+    USER_POSTS_BUDGET = 6
+    # session, user, MAX(updated_at), COUNT(*), posts
+    LATEST_BUDGET = 5
+    # session, user, updated_at lookup, post
+    DETAIL_BUDGET = 4
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.viewer = User.objects.create_user(username="viewer", password="pass")
+        cls.posts = []
+        for i in range(3):
+            author = User.objects.create_user(username=f"author{i}", password="pass")
+            cls.posts.append(
+                Post.objects.create(title=f"Post {i}", content="content", author=author)
+            )
+
+    def setUp(self) -> None:
+        # Start with cold post counters so COUNT(*) is part of the budget
+        cache.clear()
+        self.client.force_login(self.viewer)
+
+    def test_index_query_budget(self) -> None:
+        with self.assertNumQueries(self.INDEX_BUDGET):
+            response = self.client.get(reverse("blog-index"))
+        self.assertEqual(len(response.context["posts"]), 3)
+
+    def test_user_posts_query_budget(self) -> None:
+        with self.assertNumQueries(self.USER_POSTS_BUDGET):
+            self.client.get(reverse("user-posts", args=["author0"]))
+
+    def test_latest_posts_query_budget(self) -> None:
+        with self.assertNumQueries(self.LATEST_BUDGET):
+            response = self.client.get(reverse("post-latest"))
+        self.assertEqual(len(response.context["posts"]), 3)
+
+    def test_post_detail_query_budget(self) -> None:
+        with self.assertNumQueries(self.DETAIL_BUDGET):
+            self.client.get(reverse("post-detail", args=[self.posts[0].pk]))
+
+
+class LatestPerAuthorTests(MediaRootMixin, TestCase):
+    """Tests for the greatest-per-group latest post query."""
+
+    def test_returns_one_latest_post_per_author(self) -> None:
+        now = timezone.now()
+        earlier = now - timezone.timedelta(hours=1)
+        alice = User.objects.create_user(username="alice", password="pass")
+        bob = User.objects.create_user(username="bob", password="pass")
+        alice_latest = Post.objects.create(
+            title="a2", content="c", author=alice, date_posted=now
+        )
+        # Bob has two posts sharing a timestamp; the higher id wins the tie
+        Post.objects.create(title="b1", content="c", author=bob, date_posted=now)
+        Post.objects.create(title="a1", content="c", author=alice, date_posted=earlier)
+        bob_latest = Post.objects.create(
+            title="b2", content="c", author=bob, date_posted=now
+        )
+        latest = Post.objects.latest_per_author()
+        self.assertCountEqual(latest, [alice_latest, bob_latest])
+
+
+class CachedPostCountTests(MediaRootMixin, TestCase):
+    """Tests for the signal-maintained post counters."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = User.objects.create_user(username="author", password="pass")
+        cls.other = User.objects.create_user(username="other", password="pass")
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def create_post(self, author: User) -> Post:
+        with self.captureOnCommitCallbacks(execute=True):
+            return Post.objects.create(title="t", content="c", author=author)
+
+    def test_count_is_cached_after_first_lookup(self) -> None:
+        self.create_post(self.author)
+        self.assertEqual(get_post_count(Post.objects.all()), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_post_count(Post.objects.all()), 1)
+
+    @override_settings(POST_COUNT_CACHE_TIMEOUT=60)
+    def test_counter_expires_after_timeout(self) -> None:
+        with mock.patch.object(cache, "add", wraps=cache.add) as add:
+            get_post_count(Post.objects.all())
+        add.assert_called_once_with(post_count_key(), 0, timeout=60)
+
+    def test_signals_adjust_cached_counters(self) -> None:
+        get_post_count(Post.objects.all())
+        get_post_count(Post.objects.filter(author=self.author), self.author.pk)
+        post = self.create_post(self.author)
+        self.assertEqual(cache.get(post_count_key()), 1)
+        self.assertEqual(cache.get(post_count_key(self.author.pk)), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+        self.assertEqual(cache.get(post_count_key()), 0)
+        self.assertEqual(cache.get(post_count_key(self.author.pk)), 0)
+
+    def test_reassigning_author_invalidates_both_counters(self) -> None:
+        post = Post.objects.get(pk=self.create_post(self.author).pk)
+        get_post_count(Post.objects.filter(author=self.author), self.author.pk)
+        post.author = self.other
+        with self.captureOnCommitCallbacks(execute=True):
+            post.save()
+        self.assertIsNone(cache.get(post_count_key(self.author.pk)))
+
+
+class AsyncViewTests(MediaRootMixin, TestCase):
+    """Tests for the async read views used under ASGI."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = User.objects.create_user(username="author", password="pass")
+        cls.posts = [
+            Post.objects.create(title=f"Post {i}", content="c", author=cls.author)
+            for i in range(4)
+        ]
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def get(self, path: str, **params):
+        request = self.factory.get(path, params)
+        request.user = self.author
+        return request
+
+    async def test_post_list_paginates(self) -> None:
+        response = await async_views.post_list(self.get("/", page=2))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Post 0")
+        self.assertNotContains(response, "Post 3")
+        with self.assertRaises(Http404):
+            await async_views.post_list(self.get("/", page=9))
+
+    async def test_user_posts_and_detail(self) -> None:
+        response = await async_views.user_posts(self.get("/"), username="author")
+        self.assertContains(response, "Posts by author (4)")
+        response = await async_views.post_detail(self.get("/"), pk=self.posts[0].pk)
+        self.assertContains(response, "Post 0")
+        with self.assertRaises(Http404):
+            await async_views.user_posts(self.get("/"), username="nobody")
+
+    async def test_latest_posts_and_docs(self) -> None:
+        response = await async_views.latest_posts(self.get("/"))
+        self.assertContains(response, "Post 3")
+        response = await async_views.docker_commands(self.get("/"))
+        self.assertEqual(response.status_code, 200)
+
+
+class ExplainPostQueriesTests(MediaRootMixin, TestCase):
+    """Tests for the explain_post_queries command."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        author = User.objects.create_user(username="author", password="pass")
+        Post.objects.create(title="Post", content="c", author=author)
+
+    def test_list_views_use_their_indexes(self) -> None:
+        out = StringIO()
+        call_command("explain_post_queries", stdout=out)
+        self.assertIn("OK PostListView (blog_post_date_posted_idx)", out.getvalue())
+        self.assertNotIn("FAIL", out.getvalue())
+
+    def test_other_index_with_sort_fails(self) -> None:
+        # What the plan looks like once the list indexes are dropped
+        plan = (
+            "SCAN blog_post USING INDEX sqlite_autoindex_blog_post_1\n"
+            "USE TEMP B-TREE FOR ORDER BY"
+        )
+        with mock.patch("django.db.models.QuerySet.explain", return_value=plan):
+            with self.assertRaisesMessage(CommandError, "PostListView"):
+                call_command("explain_post_queries", stdout=StringIO())
+
+
+class ConnectionBenchmarkTests(TestCase):
+    """Tests for the benchmark_db_connections command."""
+
+    def test_reports_each_mode(self) -> None:
+        out = StringIO()
+        call_command(
+            "benchmark_db_connections",
+            "--requests=5",
+            "--mode=per-request",
+            "--mode=persistent",
+            stdout=out,
+        )
+        lines = out.getvalue().splitlines()
+        self.assertEqual(
+            [line.split()[0] for line in lines[1:]], ["per-request", "persistent"]
+        )
+
+
+class ReplicaRoutingTests(MediaRootMixin, TestCase):
+    """Tests for replica reads and read-your-writes pinning."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = User.objects.create_user(username="author", password="pass")
+        cls.post = Post.objects.create(title="Post", content="c", author=cls.author)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.author)
+        self.router = routers.PrimaryReplicaRouter()
+
+    def test_router_only_uses_replicas_when_opted_in(self) -> None:
+        with override_settings(DATABASE_REPLICAS=["replica_1"]):
+            self.assertIsNone(self.router.db_for_read(Post))
+            with routers.replica_reads():
+                self.assertEqual(self.router.db_for_read(Post), "replica_1")
+                # Sessions and the logged-in user always come from the primary
+                self.assertIsNone(self.router.db_for_read(User))
+            self.assertEqual(self.router.db_for_write(Post), "default")
+            self.assertFalse(self.router.allow_migrate("replica_1", "blog"))
+
+    def test_writes_pin_browser_to_primary(self) -> None:
+        # Point the "replica" at the primary and record when one is chosen
+        with mock.patch.object(
+            routers, "choose_replica", return_value="default"
+        ) as choose:
+            self.client.get(reverse("blog-index"))
+            self.assertTrue(choose.called)
+
+            response = self.client.post(
+                reverse("post-create"), {"title": "New", "content": "c"}
+            )
+            self.assertIn(routers.PRIMARY_PIN_COOKIE, response.cookies)
+            choose.reset_mock()
+            response = self.client.get(reverse("blog-index"))
+            self.assertFalse(choose.called)
+            self.assertContains(response, "New")
+
+    async def test_async_views_use_replicas(self) -> None:
+        request = RequestFactory().get("/")
+        request.user = self.author
+        with mock.patch.object(
+            routers, "choose_replica", return_value="default"
+        ) as choose:
+            await async_views.post_detail(request, pk=self.post.pk)
+        self.assertTrue(choose.called)
+
+
+class AnonymousPageCacheTests(MediaRootMixin, TestCase):
+    """Tests for the full-page cache on guest pages."""
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_guest_page_is_served_from_cache(self) -> None:
+        first = self.client.get(reverse("blog-about"))
+        self.assertIn("Cookie", first["Vary"])
+        with mock.patch("blog.views.render_markdown_file") as render_markdown:
+            second = self.client.get(reverse("blog-about"))
+        render_markdown.assert_not_called()
+        self.assertEqual(second.templates, [])
+        self.assertEqual(second.content, first.content)
+
+    def test_landing_page_keeps_guest_message_without_cookie(self) -> None:
+        self.client.get(reverse("landing-page"))
+        response = self.client.get(reverse("landing-page"))
+        self.assertEqual(response.templates, [])
+        self.assertContains(response, "Please login to view the blog.")
+        self.assertNotIn("messages", response.cookies)
+
+    def test_session_and_message_cookies_bypass_cache(self) -> None:
+        self.client.get(reverse("blog-calendar"))
+        self.client.cookies["messages"] = "pending"
+        response = self.client.get(reverse("blog-calendar"))
+        self.assertNotEqual(response.templates, [])
+
+        del self.client.cookies["messages"]
+        user = User.objects.create_user(username="member", password="pass")
+        self.client.force_login(user)
+        response = self.client.get(reverse("landing-page"))
+        self.assertTemplateUsed(response, "blog/index.html")
+
+    async def test_async_guest_page_is_cached(self) -> None:
+        first = await async_views.about(RequestFactory().get("/about/"))
+        with mock.patch("blog.async_views.render_markdown_file") as render_markdown:
+            second = await async_views.about(RequestFactory().get("/about/"))
+        render_markdown.assert_not_called()
+        self.assertEqual(second.content, first.content)
+
+    @override_settings(PAGE_CACHE_TIMEOUT=0)
+    def test_timeout_zero_disables_cache(self) -> None:
+        self.client.get(reverse("blog-calendar"))
+        response = self.client.get(reverse("blog-calendar"))
+        self.assertNotEqual(response.templates, [])
+
+
+class PostCardCacheTests(MediaRootMixin, TestCase):
+    """Tests for the cached post cards on the list pages."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.viewer = User.objects.create_user(username="viewer", password="pass")
+        cls.author = User.objects.create_user(username="author", password="pass")
+        cls.posts = [
+            Post.objects.create(title=f"Post {i}", content="c", author=cls.author)
+            for i in range(2)
+        ]
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.viewer)
+
+    def rendered_cards(self, response) -> int:
+        return sum(t.name == "blog/post_card.html" for t in response.templates)
+
+    def test_unchanged_cards_are_not_rendered_again(self) -> None:
+        response = self.client.get(reverse("post-latest"))
+        self.assertEqual(self.rendered_cards(response), 1)
+        response = self.client.get(reverse("user-posts", args=["author"]))
+        # The latest post's card is already cached
+        self.assertEqual(self.rendered_cards(response), 1)
+        response = self.client.get(reverse("user-posts", args=["author"]))
+        self.assertEqual(self.rendered_cards(response), 0)
+        self.assertContains(response, "Post 0")
+
+    def test_post_change_rerenders_only_its_card(self) -> None:
+        self.client.get(reverse("user-posts", args=["author"]))
+        post = self.posts[0]
+        post.title = "Edited"
+        with self.captureOnCommitCallbacks(execute=True):
+            post.save()
+        response = self.client.get(reverse("user-posts", args=["author"]))
+        self.assertEqual(self.rendered_cards(response), 1)
+        self.assertContains(response, "Edited")
+
+    def test_author_rename_rerenders_cards(self) -> None:
+        self.client.get(reverse("user-posts", args=["author"]))
+        self.author.username = "renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.save()
+        response = self.client.get(reverse("user-posts", args=["renamed"]))
+        self.assertEqual(self.rendered_cards(response), 2)
+        self.assertContains(response, "/user/renamed/")
+
+    def test_login_keeps_cached_cards(self) -> None:
+        self.client.get(reverse("user-posts", args=["author"]))
+        version = cache.get(post_card_version_key(self.posts[0].pk))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.login(username="author", password="pass")
+        response = self.client.get(reverse("user-posts", args=["author"]))
+        self.assertEqual(self.rendered_cards(response), 0)
+        self.assertEqual(cache.get(post_card_version_key(self.posts[0].pk)), version)
+
+
+class CompileTemplatesTests(SimpleTestCase):
+    """Tests for the compile_templates command."""
+
+    def test_compiles_project_templates(self) -> None:
+        out = StringIO()
+        call_command("compile_templates", stdout=out)
+        self.assertRegex(out.getvalue(), r"compiled \d+ templates")
+
+    def test_reports_broken_templates(self) -> None:
+        with mock.patch(
+            "blog.management.commands.compile_templates.app_template_names",
+            return_value=["blog/index.html", "blog/missing.html"],
+        ):
+            with self.assertRaisesMessage(CommandError, "blog/missing.html"):
+                call_command("compile_templates", "blog", stdout=StringIO())
+
+
+class PostRenderingTests(MediaRootMixin, TestCase):
+    """Tests for the stored, sanitized post HTML."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = User.objects.create_user(username="author", password="pass")
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_save_renders_sanitized_markdown(self) -> None:
+        post = Post.objects.create(
+            title="Post",
+            content="**bold** <script>alert(1)</script> [x](javascript:alert(1))",
+            author=self.author,
+        )
+        self.assertIn("<strong>bold</strong>", post.content_html)
+        self.assertNotIn("<script", post.content_html)
+        self.assertNotIn("javascript:", post.content_html)
+        self.assertTrue(post.excerpt_html.startswith("<p><strong>bold"))
+
+    def test_partial_save_of_content_updates_html(self) -> None:
+        post = Post.objects.create(title="Post", content="old", author=self.author)
+        post.content = "# new"
+        post.save(update_fields=["content"])
+        post.refresh_from_db()
+        self.assertEqual(post.content_html, "<h1>new</h1>")
+
+    def test_excerpt_is_truncated(self) -> None:
+        post = Post.objects.create(
+            title="Post", content="word " * 100, author=self.author
+        )
+        self.assertLess(len(post.excerpt_html), len(post.content_html))
+        self.assertTrue(post.excerpt_html.endswith("…</p>"))
+
+    def test_render_posts_backfills_missing_html(self) -> None:
+        post = Post.objects.create(title="Post", content="*text*", author=self.author)
+        Post.objects.update(content_html=None, excerpt_html="")
+        # Rendered to empty HTML, so not rendered again
+        Post.objects.create(
+            title="Empty", content="<script></script>", author=self.author
+        )
+        out = StringIO()
+        call_command("render_posts", "--batch-size=1", stdout=out)
+        self.assertIn("rendered 1 posts", out.getvalue())
+        post.refresh_from_db()
+        self.assertEqual(post.content_html, "<p><em>text</em></p>")
+        self.assertIsNotNone(cache.get(post_card_version_key(post.pk)))
+
+    def test_pages_render_stored_html(self) -> None:
+        post = Post.objects.create(title="Post", content="*text*", author=self.author)
+        self.client.force_login(self.author)
+        response = self.client.get(reverse("post-detail", args=[post.pk]))
+        self.assertContains(response, "<p><em>text</em></p>", html=True)
+        with self.assertNumQueries(PostQueryBudgetTests.USER_POSTS_BUDGET) as queries:
+            response = self.client.get(reverse("user-posts", args=["author"]))
+        self.assertContains(response, "<em>text</em>")
+        post_query = queries.captured_queries[-1]["sql"]
+        self.assertNotIn('"blog_post"."content"', post_query)
+
+    def test_card_of_post_with_empty_html_skips_content(self) -> None:
+        post = Post.objects.create(
+            title="Post", content="<script>x</script>", author=self.author
+        )
+        self.assertEqual(post.content_html, "")
+        self.client.force_login(self.author)
+        # No deferred content load per card
+        with self.assertNumQueries(PostQueryBudgetTests.USER_POSTS_BUDGET):
+            response = self.client.get(reverse("user-posts", args=["author"]))
+        self.assertNotContains(response, "&lt;script&gt;")
+
+
+class PostSearchTests(MediaRootMixin, TestCase):
+    """Tests for post search (in-memory index fallback on SQLite)."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = User.objects.create_user(username="author", password="pass")
+        cls.title_match = Post.objects.create(
+            title="Django caching", content="Notes.", author=cls.author
+        )
+        cls.content_match = Post.objects.create(
+            title="Notes", content="Caching pages in Django.", author=cls.author
+        )
+        Post.objects.create(title="Other", content="Unrelated.", author=cls.author)
+
+    def setUp(self) -> None:
+        cache.clear()
+        reset_fallback_index()
+        self.addCleanup(reset_fallback_index)
+
+    def test_index_ranks_title_matches_first(self) -> None:
+        index = InvertedIndex()
+        index.add(1, "Caching", "other words")
+        index.add(2, "Other", "caching words")
+        index.add(3, "Other", "words")
+        self.assertEqual(index.search("caching words", limit=10), [1, 2])
+        index.remove(1)
+        self.assertEqual(index.search("caching", limit=10), [2])
+        self.assertEqual(index.search("?", limit=10), [])
+
+    def test_search_posts_requires_all_terms(self) -> None:
+        results = list(search_posts(Post.objects.all(), "django CACHING"))
+        self.assertEqual(results, [self.title_match, self.content_match])
+        self.assertFalse(search_posts(Post.objects.all(), "django missing").exists())
+        self.assertFalse(search_posts(Post.objects.all(), "  ").exists())
+
+    def test_index_is_rebuilt_after_writes_elsewhere(self) -> None:
+        search_posts(Post.objects.all(), "django")
+        # bulk_create sends no signals, like a write by another worker
+        Post.objects.bulk_create(
+            [Post(title="Searchable", content="x", author=self.author)]
+        )
+        post = Post.objects.get(title="Searchable")
+        self.assertEqual(list(search_posts(Post.objects.all(), "searchable")), [post])
+        with self.assertNumQueries(2):
+            # Version stamp and the ranked posts; the index is current
+            list(search_posts(Post.objects.all(), "searchable"))
+
+    def test_signals_keep_index_current(self) -> None:
+        search_posts(Post.objects.all(), "django")
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(
+                title="Searchable", content="x", author=self.author
+            )
+        self.assertEqual(list(search_posts(Post.objects.all(), "searchable")), [post])
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+        self.assertFalse(search_posts(Post.objects.all(), "searchable").exists())
+
+    def test_search_view_paginates_with_query(self) -> None:
+        for i in range(3):
+            Post.objects.create(title=f"Django {i}", content="c", author=self.author)
+        response = self.client.get(reverse("post-search"), {"q": "django"})
+        self.assertContains(response, 'Search results for "django" (5)')
+        self.assertContains(response, 'href="?q=django&amp;page=2"')
+        self.assertEqual(response.context["pagination_mode"], "offset")
+        response = self.client.get(reverse("post-search"), {"q": "nothing"})
+        self.assertContains(response, "No posts match your search.")
+
+    async def test_async_search_view(self) -> None:
+        request = RequestFactory().get("/search/", {"q": "caching"})
+        request.user = self.author
+        response = await async_views.post_search(request)
+        self.assertContains(response, 'Search results for "caching" (2)')
+
+
+class ConditionalGetTests(MediaRootMixin, TestCase):
+    """Tests for ETag / Last-Modified handling on the post pages."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = User.objects.create_user(username="author", password="pass")
+        cls.viewer = User.objects.create_user(username="viewer", password="pass")
+        cls.posts = [
+            Post.objects.create(title=f"Post {i}", content="c", author=cls.author)
+            for i in range(2)
+        ]
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.viewer)
+
+    def revalidate(self, url: str, response):
+        return self.client.get(url, headers={"if-none-match": response["ETag"]})
+
+    def test_detail_returns_304_without_main_query(self) -> None:
+        url = reverse("post-detail", args=[self.posts[0].pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertIn("private", response["Cache-Control"])
+        # session, user, updated_at lookup
+        with self.assertNumQueries(3):
+            revalidated = self.revalidate(url, response)
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated["ETag"], response["ETag"])
+
+        self.posts[0].title = "Changed"
+        self.posts[0].save()
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_detail_last_modified(self) -> None:
+        url = reverse("post-detail", args=[self.posts[0].pk])
+        response = self.client.get(url)
+        revalidated = self.client.get(
+            url, headers={"if-modified-since": response["Last-Modified"]}
+        )
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_etag_depends_on_viewer_and_profile(self) -> None:
+        url = reverse("post-detail", args=[self.posts[0].pk])
+        response = self.client.get(url)
+        self.client.force_login(self.author)
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+        response = self.client.get(url)
+        self.author.username = "renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.save()
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_etag_changes_when_login_rotates_csrf_token(self) -> None:
+        client = Client(enforce_csrf_checks=True)
+        url = reverse("post-detail", args=[self.posts[0].pk])
+
+        def log_in() -> None:
+            token = client.get(reverse("login")).context["csrf_token"]
+            client.post(
+                reverse("login"),
+                {
+                    "username": "viewer",
+                    "password": "pass",
+                    "csrfmiddlewaretoken": token,
+                },
+            )
+
+        log_in()
+        response = client.get(url)
+        logout = client.post(
+            reverse("logout"), {"csrfmiddlewaretoken": response.context["csrf_token"]}
+        )
+        self.assertNotEqual(logout.status_code, 403)
+        log_in()
+
+        # The copy rendered before logging in again carries a stale token
+        revalidated = client.get(url, headers={"if-none-match": response["ETag"]})
+        self.assertEqual(revalidated.status_code, 200)
+        logout = client.post(
+            reverse("logout"),
+            {"csrfmiddlewaretoken": revalidated.context["csrf_token"]},
+        )
+        self.assertNotEqual(logout.status_code, 403)
+
+    def test_lists_change_on_new_and_deleted_posts(self) -> None:
+        for url in (
+            reverse("blog-index"),
+            reverse("post-latest"),
+            reverse("user-posts", args=["author"]),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(self.revalidate(url, response).status_code, 304)
+                bump_post_removal_version()
+                self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+        url = reverse("blog-index")
+        response = self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.posts[1].delete()
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+        response = self.client.get(url)
+        Post.objects.create(title="New", content="c", author=self.author)
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    async def test_async_views_return_304(self) -> None:
+        factory = RequestFactory()
+
+        def make_request(**kwargs):
+            request = factory.get("/", **kwargs)
+            request.user = self.viewer
+            # The CSRF secret CsrfViewMiddleware reads from the cookie
+            request.META["CSRF_COOKIE"] = "s" * 32
+            return request
+
+        response = await async_views.post_detail(make_request(), pk=self.posts[0].pk)
+        self.assertEqual(response.status_code, 200)
+
+        request = make_request(headers={"if-none-match": response["ETag"]})
+        response = await async_views.post_detail(request, pk=self.posts[0].pk)
+        self.assertEqual(response.status_code, 304)
+
+        response = await async_views.user_posts(make_request(), username="author")
+        request = make_request(headers={"if-none-match": response["ETag"]})
+        response = await async_views.user_posts(request, username="author")
+        self.assertEqual(response.status_code, 304)
+
+
+class ProfilingTests(MediaRootMixin, TestCase):
+    """Tests for the request profiling middleware and its endpoints."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = User.objects.create_user(username="author", password="pass")
+        cls.staff = User.objects.create_user(
+            username="staff", password="pass", is_staff=True
+        )
+        Post.objects.create(title="Post", content="c", author=cls.author)
+
+    def setUp(self) -> None:
+        cache.clear()
+        profiling.reset_store()
+        self.addCleanup(profiling.reset_store)
+
+    def test_histogram_percentiles(self) -> None:
+        histogram = profiling.Histogram()
+        for value in range(1, 101):
+            histogram.observe(value)
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.percentile(0.5), 50, delta=5)
+        self.assertAlmostEqual(histogram.percentile(0.99), 99, delta=5)
+        self.assertEqual(profiling.Histogram().percentile(0.5), 0.0)
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled_middleware_is_removed(self) -> None:
+        with self.assertRaises(MiddlewareNotUsed):
+            profiling.ProfilingMiddleware(lambda request: None)
+
+    @override_settings(PROFILING_ENABLED=True)
+    def test_records_per_url_name(self) -> None:
+        self.client.force_login(self.author)
+        self.client.get(reverse("post-latest"))
+        self.client.get("/no-such-page/")
+        stats = profiling.get_store().snapshot()
+        self.assertEqual(stats[("post-latest", "wall_ms")].count, 1)
+        self.assertGreater(stats[("post-latest", "queries")].total, 0)
+        self.assertGreater(stats[("post-latest", "template_ms")].total, 0)
+        self.assertEqual(stats[(profiling.UNRESOLVED, "wall_ms")].count, 1)
+
+    @override_settings(PROFILING_ENABLED=True)
+    async def test_async_middleware(self) -> None:
+        async def view(request):
+            return HttpResponse("ok")
+
+        middleware = profiling.ProfilingMiddleware(view)
+        request = RequestFactory().get("/")
+        request.resolver_match = mock.Mock(view_name="async-view")
+        response = await middleware(request)
+        self.assertEqual(response.status_code, 200)
+        stats = profiling.get_store().snapshot()
+        self.assertEqual(stats[("async-view", "wall_ms")].count, 1)
+
+    @override_settings(PROFILING_ENABLED=True)
+    def test_async_view_queries_are_counted(self) -> None:
+        # The view runs in an event loop thread and its ORM calls in this
+        # thread (sync_to_async), on this thread's connection
+        async def view(request):
+            count = await Post.objects.acount()
+            return HttpResponse(str(count))
+
+        middleware = profiling.ProfilingMiddleware(view)
+        request = RequestFactory().get("/")
+        request.resolver_match = mock.Mock(view_name="async-view")
+        async_to_sync(middleware)(request)
+        stats = profiling.get_store().snapshot()
+        self.assertEqual(stats[("async-view", "queries")].total, 1)
+        self.assertGreater(stats[("async-view", "db_ms")].total, 0)
+
+    def test_stats_page_is_staff_only(self) -> None:
+        profiling.get_store().record("blog-index", {"wall_ms": 12.0, "queries": 3})
+        url = reverse("profiling-stats")
+        self.client.force_login(self.author)
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(self.staff)
+        response = self.client.get(url)
+        self.assertContains(response, "blog-index")
+        self.client.post(url)
+        self.assertEqual(profiling.get_store().snapshot(), {})
+
+    @override_settings(PROFILING_METRICS_TOKEN="secret")
+    def test_metrics_endpoint(self) -> None:
+        profiling.get_store().record("blog-index", {"wall_ms": 12.0})
+        url = reverse("profiling-metrics")
+        self.assertEqual(self.client.get(url).status_code, 403)
+        response = self.client.get(url, headers={"authorization": "Bearer secret"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'mysite_view_duration_seconds_bucket{view="blog-index",le="+Inf"} 1',
+            response.content.decode(),
+        )
+        self.assertIn(
+            'mysite_view_duration_seconds_sum{view="blog-index"} 0.012',
+            response.content.decode(),
+        )
+
+    def test_sqlite_store_merges_workers(self) -> None:
+        path = self.media_root / "profiling.sqlite3"
+        workers = [profiling.SQLiteStore(path, flush_seconds=60) for _ in range(2)]
+        for worker in workers:
+            worker.record("blog-index", {"wall_ms": 10.0})
+        workers[0].flush()
+        stats = workers[1].snapshot()
+        self.assertEqual(stats[("blog-index", "wall_ms")].count, 2)
+        workers[0].reset()
+        self.assertEqual(workers[1].snapshot(), {})
+
+
+class PostTransferTests(MediaRootMixin, TestCase):
+    """Tests for the import_posts and export_posts commands."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.author = User.objects.create_user(username="author", password="pass")
+        User.objects.create_user(username="other", password="pass")
+
+    def write(self, name: str, text: str) -> str:
+        path = Path(self.tmp_dir.name) / name
+        path.write_text(text, encoding="utf-8")
+        return str(path)
+
+    def test_import_jsonl_in_batches(self) -> None:
+        lines = [
+            f'{{"title": "Post {i}", "content": "**bold** {i}", "author": "author"}}'
+            for i in range(5)
+        ]
+        lines.append(
+            '{"title": "Dated", "content": "x", "author": "other", '
+            '"date_posted": "2024-01-02T03:04:05+00:00"}'
+        )
+        path = self.write("posts.jsonl", "\n".join(lines) + "\n")
+        cache.set(post_count_key(self.author.pk), 0)
+        out = StringIO()
+        # 3 batches of SAVEPOINT, INSERT, RELEASE; authors are looked up once
+        with self.assertNumQueries(3 * 3 + 2):
+            call_command("import_posts", path, "--batch-size=2", stdout=out)
+        self.assertIn("imported 6 posts (0 skipped)", out.getvalue())
+        post = Post.objects.get(title="Post 0")
+        self.assertEqual(post.content_html, "<p><strong>bold</strong> 0</p>")
+        self.assertEqual(Post.objects.get(title="Dated").date_posted.year, 2024)
+        # bulk_create sends no signals, so the stale counter was dropped
+        self.assertIsNone(cache.get(post_count_key(self.author.pk)))
+        self.assertEqual(
+            get_post_count(Post.objects.filter(author=self.author), self.author.pk), 5
+        )
+
+    def test_unknown_author_stops_unless_skipped(self) -> None:
+        path = self.write(
+            "posts.jsonl",
+            '{"title": "A", "content": "a", "author": "author"}\n'
+            '{"title": "B", "content": "b", "author": "nobody"}\n',
+        )
+        with self.assertRaisesMessage(CommandError, "line 2: unknown author"):
+            call_command("import_posts", path, stdout=StringIO())
+        self.assertFalse(Post.objects.exists())
+        out = StringIO()
+        call_command("import_posts", path, "--skip-invalid", stdout=out)
+        self.assertIn("imported 1 posts (1 skipped)", out.getvalue())
+
+    def test_export_round_trips_through_csv_and_jsonl(self) -> None:
+        for i in range(3):
+            Post.objects.create(
+                title=f"Post {i}", content='Line, "quoted"\nnext', author=self.author
+            )
+        for fmt in ("csv", "jsonl"):
+            with self.subTest(fmt=fmt):
+                path = str(Path(self.tmp_dir.name) / f"posts.{fmt}")
+                out = StringIO()
+                call_command("export_posts", path, "--batch-size=2", stdout=out)
+                self.assertIn("exported 3 posts", out.getvalue())
+                Post.objects.all().delete()
+                call_command("import_posts", path, stdout=StringIO())
+                self.assertEqual(
+                    list(
+                        Post.objects.order_by("title").values_list("title", "content")
+                    ),
+                    [(f"Post {i}", 'Line, "quoted"\nnext') for i in range(3)],
+                )
+
+    def test_export_to_stdout_filters_by_author(self) -> None:
+        Post.objects.create(title="Mine", content="c", author=self.author)
+        Post.objects.create(
+            title="Theirs", content="c", author=User.objects.get(username="other")
+        )
+        out, err = StringIO(), StringIO()
+        call_command("export_posts", "--author=author", stdout=out, stderr=err)
+        self.assertEqual(out.getvalue().count("\n"), 1)
+        self.assertIn('"title": "Mine"', out.getvalue())
+        self.assertIn("exported 1 posts", err.getvalue())
+
+
+class ViewBenchmarkTests(MediaRootMixin, TestCase):
+    """Tests for the seed_posts and benchmark_views commands."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        call_command("seed_posts", "--users=3", "--posts=10", stdout=StringIO())
+
+    def test_seed_creates_users_profiles_and_posts(self) -> None:
+        seeded = User.objects.filter(username__startswith="seed-user-")
+        self.assertEqual(seeded.filter(profile__isnull=False).count(), 3)
+        self.assertEqual(Post.objects.filter(author__in=seeded).count(), 10)
+        self.assertTrue(self.client.login(username="seed-user-0", password="benchmark"))
+        with self.assertRaisesMessage(CommandError, "pass --clear"):
+            call_command("seed_posts", "--users=1", "--posts=0", stdout=StringIO())
+        call_command(
+            "seed_posts", "--users=1", "--posts=2", "--clear", stdout=StringIO()
+        )
+        self.assertEqual(Post.objects.count(), 2)
+
+    def test_benchmark_saves_and_compares_baseline(self) -> None:
+        path = str(Path(self.tmp_dir.name) / "baseline.json")
+        out = StringIO()
+        call_command(
+            "benchmark_views", "--requests=2", f"--save-baseline={path}", stdout=out
+        )
+        lines = out.getvalue().splitlines()
+        self.assertEqual(
+            [line.split()[0] for line in lines[1:7]],
+            [
+                "landing-page:guest",
+                "landing-page",
+                "post-latest",
+                "user-posts",
+                "post-detail",
+                "profile",
+            ],
+        )
+        baseline = json.loads(Path(path).read_text(encoding="utf-8"))
+        self.assertGreater(baseline["views"]["post-detail"]["queries"], 0)
+
+        # A view running more queries than its baseline is a regression
+        baseline["views"]["post-detail"]["queries"] -= 1
+        Path(path).write_text(json.dumps(baseline), encoding="utf-8")
+        with self.assertRaisesMessage(CommandError, "post-detail runs"):
+            call_command(
+                "benchmark_views",
+                "--requests=2",
+                "--view=post-detail",
+                f"--baseline={path}",
+                "--max-regression=1000",
+                stdout=StringIO(),
+            )
+
+
+class PostApiTests(MediaRootMixin, TestCase):
+    """Tests for the JSON API in blog/api.py."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = User.objects.create_user(username="author", password="pass")
+        other = User.objects.create_user(username="other", password="pass")
+        now = timezone.now()
+        cls.posts = [
+            Post.objects.create(
+                title=f"Post {i}",
+                content=f"**{i}**",
+                author=cls.author if i % 2 else other,
+                date_posted=now - timedelta(minutes=i),
+            )
+            for i in range(5)
+        ]
+
+    def get_json(self, url: str, **params) -> tuple[int, dict]:
+        response = self.client.get(url, params)
+        if response.streaming:
+            body = b"".join(response.streaming_content)
+        else:
+            body = response.content
+        return response.status_code, json.loads(body)
+
+    def test_list_pages_with_cursor(self) -> None:
+        url = reverse("api-post-list")
+        titles = []
+        with self.assertNumQueries(1):
+            status, page = self.get_json(url, limit=2)
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            list(page["results"][0]),
+            ["id", "title", "excerpt_html", "author", "date_posted", "updated_at"],
+        )
+        while True:
+            titles += [post["title"] for post in page["results"]]
+            if page["next"] is None:
+                break
+            status, page = self.get_json(page["next"])
+        self.assertEqual(titles, [f"Post {i}" for i in range(5)])
+
+    def test_field_selection(self) -> None:
+        status, page = self.get_json(
+            reverse("api-post-list"), fields="title,author", limit=1
+        )
+        self.assertEqual(page["results"], [{"title": "Post 0", "author": "other"}])
+        status, body = self.get_json(reverse("api-post-list"), fields="title,password")
+        self.assertEqual(status, 400)
+        self.assertIn("password", body["error"])
+        status, body = self.get_json(reverse("api-post-list"), cursor="bogus")
+        self.assertEqual(status, 400)
+
+    def test_user_posts_and_detail(self) -> None:
+        status, page = self.get_json(reverse("api-user-posts", args=["author"]))
+        self.assertEqual(
+            [post["title"] for post in page["results"]], ["Post 1", "Post 3"]
+        )
+        status, _ = self.get_json(reverse("api-user-posts", args=["nobody"]))
+        self.assertEqual(status, 404)
+
+        post = self.posts[1]
+        status, body = self.get_json(reverse("api-post-detail", args=[post.pk]))
+        self.assertEqual(body["content_html"], "<p><strong>1</strong></p>")
+        self.assertEqual(body["author"], "author")
+        status, body = self.get_json(
+            reverse("api-post-detail", args=[post.pk]), fields="id"
+        )
+        self.assertEqual(body, {"id": post.pk})
+        status, _ = self.get_json(reverse("api-post-detail", args=[0]))
+        self.assertEqual(status, 404)
 
-# Create your tests here.
+    async def test_async_list_streams(self) -> None:
+        request = RequestFactory().get("/api/posts/", {"limit": 3, "fields": "id"})
+        response = await api.apost_list(request)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        page = json.loads(body)
+        self.assertEqual(
+            [post["id"] for post in page["results"]],
+            [post.pk for post in self.posts[:3]],
+        )
+        self.assertIn("cursor=", page["next"])
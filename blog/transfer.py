@@ -0,0 +1,148 @@
+# blog/transfer.py
+"""
+Streaming post import/export shared by the import_posts and export_posts
+management commands.
+
+Posts are exchanged as JSON Lines (one object per line) or CSV with a
+header row. Authors are referenced by username. Records are read and written
+one at a time, so memory use does not grow with the file size.
+"""
+
+# Import built-in libraries
+import csv
+import json
+import sys
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+# Import django libraries
+from django.contrib.auth.models import User
+from django.utils.dateparse import parse_datetime
+
+# Supported file formats
+JSONL = "jsonl"
+CSV = "csv"
+FORMATS = (JSONL, CSV)
+
+# Columns written by export_posts, in order
+EXPORT_FIELDS = ["id", "title", "content", "author", "date_posted", "updated_at"]
+
+# Post bodies are longer than the csv module's default 128 KiB field limit
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+
+class InvalidRecord(Exception):
+    """Raised when an import record cannot be turned into a post."""
+
+
+def detect_format(path: str, fmt: str | None) -> str:
+    """Return the explicit format, or guess it from the file extension."""
+    if fmt:
+        return fmt
+    return CSV if Path(path).suffix.lower() == ".csv" else JSONL
+
+
+def read_records(stream: IO[str], fmt: str) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield (line number, record) pairs from a JSONL or CSV stream."""
+    if fmt == CSV:
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            raise InvalidRecord(f"line {line_number}: {error}") from None
+        if not isinstance(record, dict):
+            raise InvalidRecord(f"line {line_number}: expected a JSON object")
+        yield line_number, record
+
+
+def write_records(stream: IO[str], rows: Iterable[tuple], fmt: str) -> int:
+    """Write EXPORT_FIELDS rows to a stream and return how many were written."""
+    written = 0
+    if fmt == CSV:
+        writer = csv.writer(stream)
+        writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            writer.writerow(
+                [
+                    value.isoformat() if isinstance(value, datetime) else value
+                    for value in row
+                ]
+            )
+            written += 1
+        return written
+    for row in rows:
+        stream.write(json.dumps(dict(zip(EXPORT_FIELDS, row)), default=_json_default))
+        stream.write("\n")
+        written += 1
+    return written
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def parse_record(record: dict[str, Any]) -> tuple[str, str, str, datetime | None]:
+    """Return (title, content, author username, date_posted) of a record."""
+    title = str(record.get("title") or "").strip()
+    if not title:
+        raise InvalidRecord("missing title")
+    if len(title) > 100:
+        raise InvalidRecord("title is longer than 100 characters")
+    content = str(record.get("content") or "")
+    if not content.strip():
+        raise InvalidRecord("missing content")
+    author = str(record.get("author") or "").strip()
+    if not author:
+        raise InvalidRecord("missing author")
+    date_posted = None
+    if record.get("date_posted"):
+        date_posted = parse_datetime(str(record["date_posted"]))
+        if date_posted is None:
+            raise InvalidRecord(f"invalid date_posted '{record['date_posted']}'")
+    return title, content, author, date_posted
+
+
+class AuthorCache:
+    """Resolve usernames to user ids with one query per batch of new names.
+
+    Attributes:
+        max_size (int): Entries kept before the cache is cleared.
+    """
+
+    def __init__(self, using: str, max_size: int = 100_000) -> None:
+        self.using = using
+        self.max_size = max_size
+        self._ids: dict[str, int | None] = {}
+
+    # Look up the usernames not seen yet
+    def load(self, usernames: Iterable[str]) -> None:
+        """Fetch the ids of the given usernames that are not cached."""
+        usernames = set(usernames)
+        missing = usernames - self._ids.keys()
+        if not missing:
+            return
+        if len(self._ids) + len(missing) > self.max_size:
+            self._ids.clear()
+            missing = usernames
+        found = dict(
+            User._default_manager.using(self.using)
+            .filter(username__in=missing)
+            .values_list("username", "pk")
+        )
+        for name in missing:
+            self._ids[name] = found.get(name)
+
+    # Return a loaded user id
+    def get(self, username: str) -> int | None:
+        """Return the id of a username passed to load(), or None if unknown."""
+        return self._ids.get(username)
@@ -1,30 +1,67 @@
 # blog/urls.py
 
 # Import django libraries
+from django.conf import settings
 from django.urls import path
 from django.urls.resolvers import URLPattern
 
 # Import local modules
-from . import views
+from . import api, async_views, views
 from .views import (
     LatestPostListView,
     PostCreateView,
     PostDeleteView,
     PostDetailView,
     PostListView,
+    PostSearchView,
     PostUpdateView,
     UserPostListView,
 )
 
+# Select sync or async read views (ASYNC_VIEWS, for ASGI deployments)
+if settings.ASYNC_VIEWS:
+    read_views = {
+        "index": async_views.post_list,
+        "latest": async_views.latest_posts,
+        "user_posts": async_views.user_posts,
+        "search": async_views.post_search,
+        "detail": async_views.post_detail,
+        "home": async_views.home,
+        "about": async_views.about,
+        "database_ownership": async_views.database_ownership,
+        "debug_django_container": async_views.debug_django_container,
+        "docker_commands": async_views.docker_commands,
+        "api_posts": api.apost_list,
+        "api_post_detail": api.apost_detail,
+        "api_user_posts": api.auser_posts,
+    }
+else:
+    read_views = {
+        "index": PostListView.as_view(),
+        "latest": LatestPostListView.as_view(),
+        "user_posts": UserPostListView.as_view(),
+        "search": PostSearchView.as_view(),
+        "detail": PostDetailView.as_view(),
+        "home": views.home,
+        "about": views.about,
+        "database_ownership": views.database_ownership,
+        "debug_django_container": views.debug_django_container,
+        "docker_commands": views.docker_commands,
+        "api_posts": api.post_list,
+        "api_post_detail": api.post_detail,
+        "api_user_posts": api.user_posts,
+    }
+
 # Define urlpatterns
 urlpatterns: list[URLPattern] = [
     # path(route="", view=views.home, name="blog-home"), # function base view
-    path(route="", view=PostListView.as_view(), name="blog-index"),
-    path(route="latest/", view=LatestPostListView.as_view(), name="post-latest"),
+    path(route="", view=read_views["index"], name="blog-index"),
+    path(route="latest/", view=read_views["latest"], name="post-latest"),
     path(
-        route="user/<str:username>/", view=UserPostListView.as_view(), name="user-posts"
+        route="user/<str:username>/", view=read_views["user_posts"], name="user-posts"
     ),
-    path(route="post/<int:pk>/", view=PostDetailView.as_view(), name="post-detail"),
+    path(route="search/", view=read_views["search"], name="post-search"),
+    path(route="post/<int:pk>/", view=read_views["detail"], name="post-detail"),
     path(route="post/new/", view=PostCreateView.as_view(), name="post-create"),
     path(
         route="post/<int:pk>/update/", view=PostUpdateView.as_view(), name="post-update"
@@ -32,22 +69,34 @@ urlpatterns: list[URLPattern] = [
     path(
         route="post/<int:pk>/delete/", view=PostDeleteView.as_view(), name="post-delete"
     ),
-    path(route="home/", view=views.home, name="blog-home"),
-    path(route="about/", view=views.about, name="blog-about"),
+    path(route="home/", view=read_views["home"], name="blog-home"),
+    path(route="about/", view=read_views["about"], name="blog-about"),
     path(route="calendar/", view=views.calendar, name="blog-calendar"),
     path(
         route="database-ownership/",
-        view=views.database_ownership,
+        view=read_views["database_ownership"],
         name="blog-database_ownership",
     ),
     path(
         route="debug-django-container/",
-        view=views.debug_django_container,
+        view=read_views["debug_django_container"],
         name="blog-debug_django_container",
     ),
     path(
         route="docker-commands/",
-        view=views.docker_commands,
+        view=read_views["docker_commands"],
         name="blog-docker_commands",
     ),
+    # Read-only JSON API (see blog/api.py)
+    path(route="api/posts/", view=read_views["api_posts"], name="api-post-list"),
+    path(
+        route="api/posts/<int:pk>/",
+        view=read_views["api_post_detail"],
+        name="api-post-detail",
+    ),
+    path(
+        route="api/users/<str:username>/posts/",
+        view=read_views["api_user_posts"],
+        name="api-user-posts",
+    ),
 ]
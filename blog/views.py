@@ -3,6 +3,7 @@
 # Import built-in libraries
 import logging
 from typing import cast
+from urllib.parse import urlencode
 
 from django.conf import settings
 
@@ -10,7 +11,6 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth.models import User
-from django.db.models import Max
 from django.db.models.manager import BaseManager
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, render
@@ -22,36 +22,67 @@ from django.views.generic import (
     UpdateView,
 )
 
-# Import third-party libraries
-from markdown import markdown
-
 # Import local modules
+from mysite.page_cache import cache_anonymous_page
+from mysite.routers import PrimaryPinMixin, ReplicaReadMixin
+
+from .conditional import (
+    ConditionalGetMixin,
+    post_detail_validators,
+    post_list_validators,
+)
+from .markdown_cache import render_markdown_file
 from .models import Post
+from .pagination import OFFSET, CachedCountPaginator, KeysetPaginationMixin
+from .post_cards import PostCardMixin
+from .search import MAX_QUERY_LENGTH, search_posts
 
 # Get an instance of a logger
 logger = logging.getLogger(__name__)
 
 
 # List all posts
-class PostListView(ListView):
+class PostListView(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    PostCardMixin,
+    KeysetPaginationMixin,
+    ListView,
+):
     """List all posts.
     Attributes:
         model (Post): Post model.
+        queryset (QuerySet[Post]): Post cards with author and profile joined.
         template_name (str): Template name(<app>/<model>_<viewtype>.html).
         context_object_name (str): Context object name.
         ordering (list[str]): Ordering.
         paginate_by (int): Paginate by.
+        paginator_class (type): Paginator with a cached post count.
+        pagination_mode (str | None): "offset", "keyset" or None for settings.
     """
 
     model = Post
+    queryset = Post.objects.cards()
     template_name = "blog/index.html"
     context_object_name = "posts"
     ordering = ["-date_posted"]
     paginate_by = 3
+    paginator_class = CachedCountPaginator
+
+    # Validate conditional GETs against the newest post change
+    def get_validators(self):
+        """Get ETag / Last-Modified."""
+        return post_list_validators("index", self.request)
 
 
 # List latest posts
-class LatestPostListView(ListView):
+class LatestPostListView(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    PostCardMixin,
+    KeysetPaginationMixin,
+    ListView,
+):
     """List latest posts.
     Attributes:
         model (Post): Post model.
@@ -59,6 +90,7 @@ class LatestPostListView(ListView):
         context_object_name (str): Context object name.
         ordering (list[str]): Ordering.
         paginate_by (int): Paginate by.
+        pagination_mode (str | None): "offset", "keyset" or None for settings.
     """
 
     model = Post
@@ -67,26 +99,27 @@ class LatestPostListView(ListView):
     ordering = ["-date_posted"]
     paginate_by = 3
 
+    # Validate conditional GETs against the newest post change
+    def get_validators(self):
+        """Get ETag / Last-Modified."""
+        return post_list_validators("latest", self.request)
+
     # Get latest posts
     def get_queryset(self) -> BaseManager[Post]:
         """Get latest posts."""
 
-        # Get the latest post ID for each author
-        latest_post_ids = (
-            Post.objects.values("author")
-            .annotate(latest_date=Max("date_posted"))
-            .values_list("author", "latest_date")
-        )
-
-        # Get the actual posts and order by date_posted desc
-        return Post.objects.filter(
-            author__in=[item[0] for item in latest_post_ids],
-            date_posted__in=[item[1] for item in latest_post_ids],
-        ).order_by("-date_posted")
+        # Get each author's latest post in a single database-side query
+        return Post.objects.latest_per_author().cards().order_by("-date_posted")
 
 
 # List user's posts
-class UserPostListView(ListView):
+class UserPostListView(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    PostCardMixin,
+    KeysetPaginationMixin,
+    ListView,
+):
     """List all posts.
     Attributes:
         model (Post): Post model.
@@ -94,31 +127,109 @@ class UserPostListView(ListView):
         context_object_name (str): Context object name.
         ordering (list[str]): Ordering.
         paginate_by (int): Paginate by.
+        paginator_class (type): Paginator with a cached per-author post count.
+        pagination_mode (str | None): "offset", "keyset" or None for settings.
     """
 
     model = Post
     template_name = "blog/user_posts.html"
     context_object_name = "posts"
     paginate_by = 3
+    paginator_class = CachedCountPaginator
+
+    # Get the author of the listed posts (once per request)
+    def get_author(self) -> User:
+        """Get author."""
+        if not hasattr(self, "author"):
+            self.author = get_object_or_404(User, username=self.kwargs.get("username"))
+        return self.author
+
+    # Validate conditional GETs against the author's newest post change
+    def get_validators(self):
+        """Get ETag / Last-Modified."""
+        return post_list_validators(
+            "user_posts", self.request, author_id=self.get_author().pk
+        )
 
     # Get user's posts
     def get_queryset(self) -> BaseManager[Post]:
         """Get user's posts."""
-        user: User = get_object_or_404(User, username=self.kwargs.get("username"))
-        return Post.objects.filter(author=user).order_by("-date_posted")
+        user = self.get_author()
+        return Post.objects.cards().filter(author=user).order_by("-date_posted")
+
+    # Count posts with the author's cached counter
+    def get_paginator(
+        self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs
+    ):
+        """Get paginator scoped to the author."""
+        return super().get_paginator(
+            queryset,
+            per_page,
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            author_id=self.author.pk,
+            **kwargs,
+        )
+
+
+# Search posts
+class PostSearchView(ReplicaReadMixin, PostCardMixin, KeysetPaginationMixin, ListView):
+    """Search post titles and contents.
+    Attributes:
+        model (Post): Post model.
+        template_name (str): Template name(<app>/<model>_<viewtype>.html).
+        context_object_name (str): Context object name.
+        paginate_by (int): Paginate by.
+        pagination_mode (str): Always "offset"; ranked results have no cursor.
+        query_kwarg (str): Query parameter carrying the search terms.
+    """
+
+    model = Post
+    template_name = "blog/search.html"
+    context_object_name = "posts"
+    paginate_by = 3
+    pagination_mode = OFFSET
+    query_kwarg = "q"
+
+    # Get the search terms
+    def get_query(self) -> str:
+        """Get search terms."""
+        return self.request.GET.get(self.query_kwarg, "").strip()[:MAX_QUERY_LENGTH]
+
+    # Get ranked matching posts
+    def get_queryset(self) -> BaseManager[Post]:
+        """Get matching posts, best match first."""
+        return search_posts(Post.objects.cards(), self.get_query())
+
+    # Keep the search terms in the pagination links
+    def get_context_data(self, **kwargs):
+        """Add search terms to context."""
+        context = super().get_context_data(**kwargs)
+        query = self.get_query()
+        context["title"] = "Search"
+        context["query"] = query
+        context["pagination_query"] = f"{urlencode({self.query_kwarg: query})}&"
+        return context
 
 
 # Post detail
-class PostDetailView(DetailView):
+class PostDetailView(ReplicaReadMixin, ConditionalGetMixin, DetailView):
     """Post detail.
     Attributes:
-        model (Post): Post model."""
+        model (Post): Post model.
+        queryset (QuerySet[Post]): Post with its author and profile joined."""
 
     model = Post
+    queryset = Post.objects.select_related("author__profile")
+
+    # Validate conditional GETs against the post and its author's profile
+    def get_validators(self):
+        """Get ETag / Last-Modified."""
+        return post_detail_validators(self.kwargs["pk"], self.request)
 
 
 # Create post
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCreateView(LoginRequiredMixin, PrimaryPinMixin, CreateView):
     """Create post.
     Attributes:
         model (Post): Post model.
@@ -141,7 +252,9 @@ class PostCreateView(LoginRequiredMixin, CreateView):
 
 
 # Update post
-class PostUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class PostUpdateView(
+    LoginRequiredMixin, UserPassesTestMixin, PrimaryPinMixin, UpdateView
+):
     """Update post.
     Attributes:
         model (Post): Post model.
@@ -174,7 +287,9 @@ class PostUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
 
 
 # Delete post
-class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class PostDeleteView(
+    LoginRequiredMixin, UserPassesTestMixin, PrimaryPinMixin, DeleteView
+):
     """Delete post.
     Attributes:
         model (Post): Post model.
@@ -204,16 +319,16 @@ class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
 
 
 # Home page
+@cache_anonymous_page
 def home(request) -> HttpResponse:
     """Home page view."""
     # Construct the path to README.md
     file_path = settings.BASE_DIR / "README.md"
 
-    # Read and convert to HTML
+    # Read and convert to HTML (cached)
     try:
-        markdown_text = file_path.read_text(encoding="utf-8")
         # 'fenced_code' extension supports the triple backticks used in markdown
-        html_content = markdown(markdown_text, extensions=["fenced_code"])
+        html_content = render_markdown_file(file_path, extensions=["fenced_code"])
     except FileNotFoundError:
         html_content = "<p>README.md file not found.</p>"
 
@@ -225,6 +340,7 @@ def home(request) -> HttpResponse:
 
 
 # Landing page for authenticated users
+@cache_anonymous_page
 def landing_page(request) -> HttpResponse:
     """Dispatch view for the landing page.
     - Authenticated users -> PostListView (Blog Index)
@@ -242,17 +358,17 @@ def landing_page(request) -> HttpResponse:
 
 
 # About page
+@cache_anonymous_page
 def about(request) -> HttpResponse:
     """About page view."""
 
     # Construct the path to DATABASE.md
     readme_path = settings.BASE_DIR / "DATABASE.md"
 
-    # Read and convert to HTML
+    # Read and convert to HTML (cached)
     try:
-        markdown_text = readme_path.read_text(encoding="utf-8")
         # 'fenced_code' extension supports the triple backticks used in markdown
-        html_content = markdown(markdown_text, extensions=["fenced_code"])
+        html_content = render_markdown_file(readme_path, extensions=["fenced_code"])
     except FileNotFoundError:
         html_content = "<p>DATABASE.md file not found.</p>"
 
@@ -264,6 +380,7 @@ def about(request) -> HttpResponse:
 
 
 # Calendar page
+@cache_anonymous_page
 def calendar(request) -> HttpResponse:
     """Calendar page view."""
     return render(
@@ -274,16 +391,16 @@ def calendar(request) -> HttpResponse:
 
 
 # Database Ownership page
+@cache_anonymous_page
 def database_ownership(request) -> HttpResponse:
     """Database Ownership page view."""
     # Construct the path to DATABASE_OWNERSHIP.md
     file_path = settings.BASE_DIR / "DATABASE_OWNERSHIP.md"
 
-    # Read and convert to HTML
+    # Read and convert to HTML (cached)
     try:
-        markdown_text = file_path.read_text(encoding="utf-8")
         # 'fenced_code' extension supports the triple backticks used in markdown
-        html_content = markdown(markdown_text, extensions=["fenced_code"])
+        html_content = render_markdown_file(file_path, extensions=["fenced_code"])
     except FileNotFoundError:
         html_content = "<p>DATABASE_OWNERSHIP.md file not found.</p>"
 
@@ -295,16 +412,16 @@ def database_ownership(request) -> HttpResponse:
 
 
 # Debug Django Container page
+@cache_anonymous_page
 def debug_django_container(request) -> HttpResponse:
     """Debug Django Container page view."""
     # Construct the path to DEBUG_DJANGO_CONTAINER.md
     file_path = settings.BASE_DIR / "DEBUG_DJANGO_CONTAINER.md"
 
-    # Read and convert to HTML
+    # Read and convert to HTML (cached)
     try:
-        markdown_text = file_path.read_text(encoding="utf-8")
         # 'fenced_code' extension supports the triple backticks used in markdown
-        html_content = markdown(markdown_text, extensions=["fenced_code"])
+        html_content = render_markdown_file(file_path, extensions=["fenced_code"])
     except FileNotFoundError:
         html_content = "<p>DEBUG_DJANGO_CONTAINER.md file not found.</p>"
 
@@ -316,17 +433,19 @@ def debug_django_container(request) -> HttpResponse:
 
 
 # Docker Commands page
+@cache_anonymous_page
 def docker_commands(request) -> HttpResponse:
     """Docker Commands page view."""
     # Construct the path to DOCKER_COMMANDS.md
     file_path = settings.BASE_DIR / "DOCKER_COMMANDS.md"
 
-    # Read and convert to HTML
+    # Read and convert to HTML (cached)
     try:
-        markdown_text = file_path.read_text(encoding="utf-8")
         # 'fenced_code' extension supports the triple backticks used in markdown
         # 'toc' extension generates a table of contents
-        html_content = markdown(markdown_text, extensions=["fenced_code", "toc"])
+        html_content = render_markdown_file(
+            file_path, extensions=["fenced_code", "toc"]
+        )
     except FileNotFoundError:
         html_content = "<p>DOCKER_COMMANDS.md file not found.</p>"
 
@@ -1,14 +1,29 @@
 # Gunicorn configuration file
 import multiprocessing
+import os
+
+# Server interface: "wsgi" (sync workers) or "asgi" (uvicorn workers).
+# Start with `gunicorn -c gunicorn.conf.py` so wsgi_app below is used.
+server_interface = os.environ.get("SERVER_INTERFACE", "wsgi")
 
 # Server socket
 bind = "0.0.0.0:8000"
 
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
+if server_interface == "asgi":
+    # Each uvicorn worker runs an event loop serving many requests at once,
+    # so one worker per CPU is enough.
+    wsgi_app = "mysite.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+    default_workers = multiprocessing.cpu_count()
+else:
+    wsgi_app = "mysite.wsgi:application"
+    worker_class = "sync"
+    default_workers = multiprocessing.cpu_count() * 2 + 1
+
+workers = int(os.environ.get("GUNICORN_WORKERS", str(default_workers)))
 worker_connections = 1000
-timeout = 300  # 5 minutes
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "300"))  # 5 minutes
 keepalive = 2
 
 # Logging
@@ -28,4 +43,23 @@ group = None
 tmp_upload_dir = None
 
 # Preload app for faster worker spawn
-preload_app = True
\ No newline at end of file
+preload_app = True
+
+
+def when_ready(server):
+    """Warm the template cache, then close the master's database connections.
+
+    Runs in the master after the app is preloaded and before workers are
+    forked. Every worker inherits the compiled templates, a broken template
+    stops the server at boot, and no worker inherits a connection socket or
+    a connection pool (and its threads) from the master process.
+    """
+    from django.core.management import call_command
+    from django.db import connections
+
+    call_command("compile_templates", verbosity=0)
+
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+        if hasattr(connection, "close_pool"):
+            connection.close_pool()
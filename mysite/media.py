@@ -0,0 +1,112 @@
+# mysite/media.py
+"""
+Media file serving for non-DEBUG deployments.
+
+With MEDIA_ACCEL set, Django only authorizes the request and hands the file
+transfer to the fronting proxy:
+    - "nginx":  X-Accel-Redirect to MEDIA_ACCEL_REDIRECT_PREFIX + path
+                (an `internal` location aliased to MEDIA_ROOT), percent-encoded
+                so non-ASCII avatar names survive the header.
+    - "sendfile": X-Sendfile with the absolute file path (Apache, lighttpd).
+                Paths that are not ASCII are streamed by Django instead, since
+                the header cannot carry them.
+
+Without a proxy, files are streamed with FileResponse, which Gunicorn sends
+with os.sendfile through wsgi.file_wrapper. Responses carry a strong ETag
+and Last-Modified, conditional requests get 304, and content-hashed avatar
+variants are marked immutable.
+"""
+
+# Import built-in libraries
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+# Import django libraries
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+# Paths containing a sha256 directory (avatar variants) never change content
+HASHED_PATH_RE = re.compile(r"(^|/)[0-9a-f]{64}/")
+
+# One year, the conventional maximum for immutable assets
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def make_etag(file_stat: os.stat_result) -> str:
+    """Return a strong ETag derived from the file's size and mtime."""
+    return f'"{file_stat.st_size:x}-{file_stat.st_mtime_ns:x}"'
+
+
+def cache_control(path: str) -> str:
+    """Return the Cache-Control header value for a media path."""
+    if HASHED_PATH_RE.search(path):
+        return f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    max_age = getattr(settings, "MEDIA_CACHE_MAX_AGE", 3600)
+    return f"public, max-age={max_age}"
+
+
+def is_not_modified(request, etag: str, last_modified: int) -> bool:
+    """Return True if the client's cached copy is still current."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        etags = parse_etags(if_none_match)
+        return "*" in etags or etag in etags
+    if_modified_since = parse_http_date_safe(
+        request.headers.get("If-Modified-Since", "")
+    )
+    return if_modified_since is not None and int(last_modified) <= if_modified_since
+
+
+def offload_response(full_path: str) -> HttpResponse:
+    """Return an empty response whose body the fronting proxy will send."""
+    content_type, _ = mimetypes.guess_type(full_path)
+    return HttpResponse(content_type=content_type or "application/octet-stream")
+
+
+# Serve a file from MEDIA_ROOT
+@require_safe
+def serve_media(request, path: str) -> HttpResponse:
+    """Media file view."""
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        file_stat = os.stat(full_path)
+    except (OSError, ValueError, SuspiciousFileOperation):
+        raise Http404("Media file not found.")
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404("Media file not found.")
+
+    etag = make_etag(file_stat)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(file_stat.st_mtime),
+        "Cache-Control": cache_control(path),
+    }
+
+    if is_not_modified(request, etag, int(file_stat.st_mtime)):
+        response = HttpResponseNotModified()
+        for header, value in headers.items():
+            response.headers[header] = value
+        return response
+
+    accel = getattr(settings, "MEDIA_ACCEL", "")
+    if accel == "nginx":
+        prefix = getattr(settings, "MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+        response = offload_response(full_path)
+        response.headers["X-Accel-Redirect"] = quote(prefix.rstrip("/") + "/" + path)
+    elif accel == "sendfile" and full_path.isascii():
+        response = offload_response(full_path)
+        response.headers["X-Sendfile"] = full_path
+    else:
+        response = FileResponse(open(full_path, "rb"))
+        response.headers["Content-Length"] = str(file_stat.st_size)
+
+    for header, value in headers.items():
+        response.headers[header] = value
+    return response
@@ -0,0 +1,100 @@
+# mysite/page_cache.py
+"""
+Full-page caching for anonymous visitors.
+
+Only requests without a session or messages cookie are served from or
+stored in the cache, so logged-in users, visitors with a pending flash
+message and anyone whose page depends on session state always get a freshly
+rendered page. Responses carry `Vary: Cookie` so downstream caches keep the
+anonymous and personalised variants apart.
+"""
+
+# Import built-in libraries
+import hashlib
+from functools import wraps
+from inspect import iscoroutinefunction
+
+# Import django libraries
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+# Marks a request whose page is already handled by an outer cached view
+_ACTIVE_ATTR = "_page_cache_active"
+
+
+def page_cache_key(request) -> str:
+    """Return the cache key for a request's full URL."""
+    url = request.build_absolute_uri()
+    return f"page:{hashlib.sha256(url.encode()).hexdigest()}"
+
+
+def is_cacheable_request(request) -> bool:
+    """Return True if the request can be answered with the shared page."""
+    return (
+        _get_timeout() > 0
+        and request.method == "GET"
+        and not getattr(request, _ACTIVE_ATTR, False)
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and CookieStorage.cookie_name not in request.COOKIES
+    )
+
+
+def is_cacheable_response(response: HttpResponse) -> bool:
+    """Return True if the response is the same for every anonymous visitor."""
+    return (
+        response.status_code == 200 and not response.streaming and not response.cookies
+    )
+
+
+def _get_cache():
+    return caches[getattr(settings, "PAGE_CACHE_ALIAS", "default")]
+
+
+def _get_timeout() -> int:
+    return getattr(settings, "PAGE_CACHE_TIMEOUT", 300)
+
+
+def cache_anonymous_page(view):
+    """Decorate a function or async view with the anonymous page cache."""
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if not is_cacheable_request(request):
+                response = await view(request, *args, **kwargs)
+                patch_vary_headers(response, ("Cookie",))
+                return response
+
+            cache, key = _get_cache(), page_cache_key(request)
+            response = await cache.aget(key)
+            if response is None:
+                setattr(request, _ACTIVE_ATTR, True)
+                response = await view(request, *args, **kwargs)
+                patch_vary_headers(response, ("Cookie",))
+                if is_cacheable_response(response):
+                    await cache.aset(key, response, _get_timeout())
+            return response
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not is_cacheable_request(request):
+            response = view(request, *args, **kwargs)
+            patch_vary_headers(response, ("Cookie",))
+            return response
+
+        cache, key = _get_cache(), page_cache_key(request)
+        response = cache.get(key)
+        if response is None:
+            setattr(request, _ACTIVE_ATTR, True)
+            response = view(request, *args, **kwargs)
+            patch_vary_headers(response, ("Cookie",))
+            if is_cacheable_response(response):
+                cache.set(key, response, _get_timeout())
+        return response
+
+    return wrapper
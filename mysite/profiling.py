@@ -0,0 +1,489 @@
+# mysite/profiling.py
+"""
+Opt-in request profiling per URL name.
+
+With PROFILING_ENABLED, ProfilingMiddleware records for every request the
+wall time, the number and duration of database queries and the time spent
+rendering templates, keyed by the resolved URL name. Values go into
+fixed-bucket histograms, from which p50/p95/p99 are estimated.
+
+Stats live in memory per process (PROFILING_STORE="memory") or are merged
+into a SQLite file shared by all workers on the host (PROFILING_STORE=
+"sqlite"); workers flush their local counts every PROFILING_FLUSH_SECONDS.
+They are shown to staff under secure-admin-portal/profiling/ and exported
+in the Prometheus text format under secure-admin-portal/profiling/metrics/.
+
+When disabled the middleware removes itself at startup (MiddlewareNotUsed),
+so requests pay nothing.
+"""
+
+# Import built-in libraries
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from contextlib import closing
+from contextvars import ContextVar
+
+# Import django libraries
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from django.shortcuts import redirect, render
+from django.template.backends.django import Template as DjangoTemplate
+from django.utils.crypto import constant_time_compare
+from django.utils.decorators import sync_and_async_middleware
+
+# Import third-party libraries
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+# Histogram upper bounds; values above the last bound go to a +Inf bucket
+BUCKETS = (
+    0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 50, 75,
+    100, 150, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000,
+)  # fmt: skip
+
+# Recorded metrics: name -> (Prometheus name, unit scale, help text)
+METRICS = {
+    "wall_ms": (
+        "mysite_view_duration_seconds",
+        0.001,
+        "Request wall time by URL name.",
+    ),
+    "db_ms": (
+        "mysite_view_db_duration_seconds",
+        0.001,
+        "Time spent in database queries per request by URL name.",
+    ),
+    "queries": (
+        "mysite_view_db_queries",
+        1,
+        "Database queries per request by URL name.",
+    ),
+    "template_ms": (
+        "mysite_view_template_duration_seconds",
+        0.001,
+        "Time spent rendering templates per request by URL name.",
+    ),
+}
+
+# URL name used for requests that did not resolve (e.g. 404s)
+UNRESOLVED = "<unresolved>"
+
+# Profile of the request being handled in this context
+_current: ContextVar["RequestProfile | None"] = ContextVar(
+    "profiling_request", default=None
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram.
+
+    Attributes:
+        buckets (list[int]): Counts per BUCKETS bound, plus the +Inf bucket.
+        count (int): Number of observations.
+        total (float): Sum of observations.
+        maximum (float): Largest observation.
+    """
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    # Add one value
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        self.buckets[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    # Add another histogram's counts
+    def merge(self, other: "Histogram") -> None:
+        """Merge the counts of another histogram into this one."""
+        for index, bucket_count in enumerate(other.buckets):
+            self.buckets[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+
+    # Estimate a quantile by interpolating inside its bucket
+    def percentile(self, quantile: float) -> float:
+        """Return the estimated value below which `quantile` of values fall."""
+        if not self.count:
+            return 0.0
+        rank = quantile * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = BUCKETS[index - 1] if index else 0.0
+                upper = BUCKETS[index] if index < len(BUCKETS) else self.maximum
+                upper = min(upper, self.maximum)
+                fraction = (rank - seen) / bucket_count
+                return lower + (upper - lower) * fraction
+            seen += bucket_count
+        return self.maximum
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+# Stats: {(url name, metric): Histogram}
+Stats = dict[tuple[str, str], Histogram]
+
+
+class MemoryStore:
+    """Per-process stats store."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.stats: Stats = {}
+
+    # Record one request
+    def record(self, view_name: str, values: dict[str, float]) -> None:
+        """Record the metric values of a request."""
+        with self.lock:
+            for metric, value in values.items():
+                key = (view_name, metric)
+                if key not in self.stats:
+                    self.stats[key] = Histogram()
+                self.stats[key].observe(value)
+
+    # Copy of the aggregated stats
+    def snapshot(self) -> Stats:
+        """Return the aggregated stats."""
+        with self.lock:
+            return {key: _copy(histogram) for key, histogram in self.stats.items()}
+
+    # Forget everything recorded
+    def reset(self) -> None:
+        """Clear the stats."""
+        with self.lock:
+            self.stats = {}
+
+
+class SQLiteStore(MemoryStore):
+    """Stats merged into a SQLite file shared by the workers of a host.
+
+    Requests are recorded in memory; the counts are added to the file at
+    most every `flush_seconds`, and before the stats are read.
+
+    Attributes:
+        path (str): SQLite database file.
+        flush_seconds (float): Minimum interval between flushes.
+    """
+
+    def __init__(self, path: str, flush_seconds: float = 5.0) -> None:
+        super().__init__()
+        self.path = str(path)
+        self.flush_seconds = flush_seconds
+        self.last_flush = time.monotonic()
+        with closing(self._connect()) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS profile_histograms ("
+                " view TEXT, metric TEXT, count INTEGER, total REAL, maximum REAL,"
+                " buckets TEXT, PRIMARY KEY (view, metric))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per flush keeps the store safe across fork()
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    # Record locally and flush when due
+    def record(self, view_name: str, values: dict[str, float]) -> None:
+        """Record the metric values of a request."""
+        super().record(view_name, values)
+        if time.monotonic() - self.last_flush >= self.flush_seconds:
+            self.flush()
+
+    # Add the local counts to the shared file
+    def flush(self) -> None:
+        """Merge the stats recorded since the last flush into the file."""
+        with self.lock:
+            pending, self.stats = self.stats, {}
+            self.last_flush = time.monotonic()
+        if not pending:
+            return
+        with closing(self._connect()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            for (view_name, metric), histogram in pending.items():
+                row = db.execute(
+                    "SELECT count, total, maximum, buckets FROM profile_histograms"
+                    " WHERE view = ? AND metric = ?",
+                    (view_name, metric),
+                ).fetchone()
+                if row is not None:
+                    histogram.merge(_from_row(row))
+                db.execute(
+                    "INSERT OR REPLACE INTO profile_histograms"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (view_name, metric, *_to_row(histogram)),
+                )
+            db.execute("COMMIT")
+
+    # Read the merged stats of every worker
+    def snapshot(self) -> Stats:
+        """Return the stats of all workers."""
+        self.flush()
+        with closing(self._connect()) as db:
+            rows = db.execute(
+                "SELECT view, metric, count, total, maximum, buckets"
+                " FROM profile_histograms"
+            ).fetchall()
+        return {(row[0], row[1]): _from_row(row[2:]) for row in rows}
+
+    # Forget everything recorded by every worker
+    def reset(self) -> None:
+        """Clear the stats in memory and in the file."""
+        super().reset()
+        with closing(self._connect()) as db:
+            db.execute("DELETE FROM profile_histograms")
+
+
+def _copy(histogram: Histogram) -> Histogram:
+    copy = Histogram()
+    copy.merge(histogram)
+    return copy
+
+
+def _to_row(histogram: Histogram) -> tuple:
+    buckets = ",".join(map(str, histogram.buckets))
+    return histogram.count, histogram.total, histogram.maximum, buckets
+
+
+def _from_row(row) -> Histogram:
+    histogram = Histogram()
+    histogram.count, histogram.total, histogram.maximum = row[0], row[1], row[2]
+    histogram.buckets = [int(value) for value in row[3].split(",")]
+    return histogram
+
+
+_store: MemoryStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> MemoryStore:
+    """Return the configured stats store (created on first use)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if getattr(settings, "PROFILING_STORE", "memory") == "sqlite":
+                _store = SQLiteStore(
+                    settings.PROFILING_SQLITE_PATH,
+                    flush_seconds=getattr(settings, "PROFILING_FLUSH_SECONDS", 5.0),
+                )
+            else:
+                _store = MemoryStore()
+        return _store
+
+
+def reset_store() -> None:
+    """Forget the store so the next get_store() reads the settings again."""
+    global _store
+    with _store_lock:
+        _store = None
+
+
+class RequestProfile:
+    """Measurements of the request being handled.
+
+    Attributes:
+        queries (int): Database queries executed.
+        db_seconds (float): Time spent in those queries.
+        template_seconds (float): Time spent rendering templates.
+    """
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+
+
+# Database execute wrapper (see connection.execute_wrapper) counting the
+# queries of the current request, whichever thread's connection runs them
+def _timed_execute(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += 1
+        profile.db_seconds += time.perf_counter() - started
+
+
+def _add_query_timer(connection, **kwargs) -> None:
+    # First in the list, so execute_wrapper() blocks still pop their own
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _timed_execute)
+
+
+def install_query_timer() -> None:
+    """Time the queries of every database connection of the process.
+
+    Each thread has its own connections, and async views run their
+    queries in sync_to_async threads, so the wrapper is added to every
+    connection as it is created. The profile is found through a
+    ContextVar, which sync_to_async carries into those threads.
+    """
+    connection_created.connect(_add_query_timer, dispatch_uid="profiling")
+    for connection in connections.all(initialized_only=True):
+        _add_query_timer(connection)
+
+
+# Time top-level template renders for the current request
+def _timed_render(render):
+    def timed_render(self, context=None, request=None):
+        profile = _current.get()
+        if profile is None:
+            return render(self, context, request)
+        started = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            profile.template_seconds += time.perf_counter() - started
+
+    timed_render.profiling = True
+    return timed_render
+
+
+def install_template_timer() -> None:
+    """Wrap the Django template backend's render() once per process.
+
+    Includes are rendered inside their parent, so only the templates
+    rendered by views (render(), TemplateResponse) are timed.
+    """
+    if not getattr(DjangoTemplate.render, "profiling", False):
+        DjangoTemplate.render = _timed_render(DjangoTemplate.render)
+
+
+@sync_and_async_middleware
+def ProfilingMiddleware(get_response):
+    """Record per-URL-name timings and query counts (PROFILING_ENABLED)."""
+    if not getattr(settings, "PROFILING_ENABLED", False):
+        raise MiddlewareNotUsed
+    install_template_timer()
+    install_query_timer()
+
+    def start():
+        profile = RequestProfile()
+        return profile, _current.set(profile), time.perf_counter()
+
+    def finish(request, profile, token, started) -> None:
+        wall_seconds = time.perf_counter() - started
+        _current.reset(token)
+        match = getattr(request, "resolver_match", None)
+        get_store().record(
+            match.view_name if match is not None else UNRESOLVED,
+            {
+                "wall_ms": wall_seconds * 1000,
+                "db_ms": profile.db_seconds * 1000,
+                "queries": profile.queries,
+                "template_ms": profile.template_seconds * 1000,
+            },
+        )
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            state = start()
+            try:
+                return await get_response(request)
+            finally:
+                finish(request, *state)
+
+        return markcoroutinefunction(middleware)
+
+    def middleware(request):
+        state = start()
+        try:
+            return get_response(request)
+        finally:
+            finish(request, *state)
+
+    return middleware
+
+
+# Rows of the staff stats page, slowest total wall time first
+def stats_rows(stats: Stats) -> list[dict]:
+    """Summarise the stats per URL name."""
+    rows = []
+    for view_name in sorted({view_name for view_name, _ in stats}):
+        histograms = {metric: stats.get((view_name, metric)) for metric in METRICS}
+        wall = histograms["wall_ms"] or Histogram()
+        row = {"view": view_name, "requests": wall.count, "total_ms": wall.total}
+        for metric, histogram in histograms.items():
+            histogram = histogram or Histogram()
+            row[metric] = {
+                "mean": histogram.mean,
+                "p50": histogram.percentile(0.50),
+                "p95": histogram.percentile(0.95),
+                "p99": histogram.percentile(0.99),
+            }
+        rows.append(row)
+    return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+
+def prometheus_text(stats: Stats) -> str:
+    """Render the stats in the Prometheus text exposition format."""
+    lines = []
+    for metric, (name, scale, help_text) in METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (view_name, recorded), histogram in sorted(stats.items()):
+            if recorded != metric:
+                continue
+            label = view_name.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for bound, bucket_count in zip(
+                [*BUCKETS, None], histogram.buckets, strict=True
+            ):
+                cumulative += bucket_count
+                le = "+Inf" if bound is None else f"{bound * scale:g}"
+                lines.append(f'{name}_bucket{{view="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{view="{label}"}} {histogram.total * scale:g}')
+            lines.append(f'{name}_count{{view="{label}"}} {histogram.count}')
+    return "\n".join(lines) + "\n"
+
+
+# Staff page with per-URL-name percentiles
+@staff_member_required
+def profiling_stats(request) -> HttpResponse:
+    """Show (GET) or reset (POST) the profiling stats."""
+    if request.method == "POST":
+        get_store().reset()
+        return redirect("profiling-stats")
+    return render(
+        request=request,
+        template_name="mysite/profiling_stats.html",
+        context={
+            **admin.site.each_context(request),
+            "title": "Request profiling",
+            "enabled": getattr(settings, "PROFILING_ENABLED", False),
+            "rows": stats_rows(get_store().snapshot()),
+        },
+    )
+
+
+# Prometheus scrape endpoint
+def profiling_metrics(request) -> HttpResponse:
+    """Export the stats for staff users or a bearer PROFILING_METRICS_TOKEN."""
+    token = getattr(settings, "PROFILING_METRICS_TOKEN", "")
+    authorization = request.headers.get("Authorization", "")
+    authorized = request.user.is_active and request.user.is_staff
+    if token and constant_time_compare(authorization, f"Bearer {token}"):
+        authorized = True
+    if not authorized:
+        return HttpResponseForbidden()
+    return HttpResponse(
+        prometheus_text(get_store().snapshot()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
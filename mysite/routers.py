@@ -0,0 +1,134 @@
+# mysite/routers.py
+"""
+Read-replica routing.
+
+Reads of blog and users models go to a replica only inside views that opt
+in with ReplicaReadMixin (class-based) or the read_from_replica decorator
+(functions and async views). Everything else, including sessions, the
+authenticated user lookup, all writes and migrations, uses "default".
+
+A successful write through PrimaryPinMixin (or pin_to_primary) sets a short
+lived cookie. While it is present that browser reads from the primary, so a
+user always sees their own changes even if the replicas lag behind.
+"""
+
+# Import built-in libraries
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+
+# Import django libraries
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpResponse
+
+# Apps whose models may be read from a replica
+REPLICA_APP_LABELS = frozenset({"blog", "users"})
+
+# Cookie pinning a browser to the primary after it writes
+PRIMARY_PIN_COOKIE = "db_primary_pin"
+
+_use_replica: ContextVar[bool] = ContextVar("use_replica", default=False)
+
+
+def choose_replica() -> str | None:
+    """Return a random replica alias, or None if no replicas are configured."""
+    replicas = getattr(settings, "DATABASE_REPLICAS", [])
+    return random.choice(replicas) if replicas else None
+
+
+def is_pinned(request) -> bool:
+    """Return True if the request must read from the primary."""
+    return PRIMARY_PIN_COOKIE in request.COOKIES
+
+
+def pin_to_primary(response: HttpResponse) -> HttpResponse:
+    """Pin the browser to the primary for DATABASE_REPLICA_PIN_SECONDS."""
+    response.set_cookie(
+        PRIMARY_PIN_COOKIE,
+        "1",
+        max_age=getattr(settings, "DATABASE_REPLICA_PIN_SECONDS", 10),
+        secure=settings.SESSION_COOKIE_SECURE,
+        httponly=True,
+        samesite="Lax",
+    )
+    return response
+
+
+@contextmanager
+def replica_reads(request=None):
+    """Route reads in this block to a replica unless the request is pinned."""
+    if request is not None and is_pinned(request):
+        yield
+        return
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def read_from_replica(view):
+    """Decorate a function or async view so its reads use a replica."""
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            with replica_reads(request):
+                return await view(request, *args, **kwargs)
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with replica_reads(request):
+            return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+class ReplicaReadMixin:
+    """Serve a class-based view's reads from a replica.
+
+    The response is rendered inside the replica block, since list templates
+    evaluate their querysets lazily while rendering.
+    """
+
+    # Dispatch and render with replica reads enabled
+    def dispatch(self, request, *args, **kwargs) -> HttpResponse:
+        """Dispatch with replica reads."""
+        with replica_reads(request):
+            response = super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+            if hasattr(response, "render") and callable(response.render):
+                response.render()
+        return response
+
+
+class PrimaryPinMixin:
+    """Pin the author to the primary after a successful form submission."""
+
+    # Set the pin cookie on the redirect response
+    def form_valid(self, form) -> HttpResponse:
+        """Validate form and pin to the primary."""
+        return pin_to_primary(super().form_valid(form))  # type: ignore[misc]
+
+
+class PrimaryReplicaRouter:
+    """Send opted-in reads to replicas and everything else to the primary."""
+
+    def db_for_read(self, model, **hints) -> str | None:
+        if _use_replica.get() and model._meta.app_label in REPLICA_APP_LABELS:
+            return choose_replica()
+        return None
+
+    def db_for_write(self, model, **hints) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> bool:
+        return db not in getattr(settings, "DATABASE_REPLICAS", [])
@@ -12,9 +12,14 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 # Import built-in libraries
+import copy
 import os
+import tempfile
 from pathlib import Path
 
+# Import django libraries
+from django.core.exceptions import ImproperlyConfigured
+
 # Import third-party libraries
 from dotenv import load_dotenv
 
@@ -73,10 +78,11 @@ INSTALLED_APPS: list[str] = [
 MIDDLEWARE: list[str] = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "mysite.profiling.ProfilingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "users.middleware.ProfileAuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -85,12 +91,27 @@ MIDDLEWARE: list[str] = [
 ROOT_URLCONF = "mysite.urls"
 
 # Template configuration
+# With TEMPLATE_CACHE (default: on unless DEBUG) templates are compiled once
+# per process by the cached loader; gunicorn.conf.py fills that cache in the
+# master before forking by running `manage.py compile_templates`.
+TEMPLATE_CACHE: bool = (
+    os.environ.get("TEMPLATE_CACHE", default=str(not DEBUG)) == "True"
+)
+TEMPLATE_LOADERS: list = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [],
-        "APP_DIRS": True,
+        # Templates of project-level modules (mysite/profiling.py)
+        "DIRS": [BASE_DIR / "mysite" / "templates"],
         "OPTIONS": {
+            "loaders": (
+                [("django.template.loaders.cached.Loader", TEMPLATE_LOADERS)]
+                if TEMPLATE_CACHE
+                else TEMPLATE_LOADERS
+            ),
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
@@ -104,11 +125,39 @@ TEMPLATES = [
 # WSGI configuration
 WSGI_APPLICATION = "mysite.wsgi.application"
 
+# Server interface used by gunicorn.conf.py: "wsgi" (sync workers) or "asgi"
+# (uvicorn workers). Async blog read views default on under ASGI.
+SERVER_INTERFACE: str = os.environ.get("SERVER_INTERFACE", default="wsgi")
+ASYNC_VIEWS: bool = (
+    os.environ.get("ASYNC_VIEWS", default=str(SERVER_INTERFACE == "asgi")) == "True"
+)
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES: dict[str, dict[str, str]] = {
+# Connection reuse. Either keep one persistent connection per worker thread
+# for DB_CONN_MAX_AGE seconds ("None" = unlimited, 0 = close after each request)
+# or, with DB_POOL=True, share a psycopg 3 connection pool per worker process.
+# Django does not allow both, so persistent connections are off when pooling.
+# Under ASGI every request runs in its own thread, so use the pool there.
+DB_POOL: bool = os.environ.get("DB_POOL", default="False") == "True"
+_conn_max_age: str = os.environ.get(
+    "DB_CONN_MAX_AGE", default="0" if SERVER_INTERFACE == "asgi" else "60"
+)
+DB_CONN_MAX_AGE: int | None = None if _conn_max_age == "None" else int(_conn_max_age)
+DB_POOL_OPTIONS: dict[str, int | float] = {
+    "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", default="2")),
+    "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", default="4")),
+    # Seconds a request waits for a free connection before failing
+    "timeout": float(os.environ.get("DB_POOL_TIMEOUT", default="10")),
+    # Idle connections above min_size are closed after this many seconds
+    "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", default="600")),
+    # Connections are recycled after this many seconds
+    "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", default="3600")),
+}
+
+DATABASES: dict[str, dict] = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
         "NAME": os.environ.get("SQL_DATABASE", default="django_mysite_db"),
@@ -118,9 +167,38 @@ DATABASES: dict[str, dict[str, str]] = {
             "SQL_HOST", default="localhost"
         ),  # Defaults to localhost for local dev
         "PORT": os.environ.get("SQL_PORT", default="5432"),
+        "CONN_MAX_AGE": 0 if DB_POOL else DB_CONN_MAX_AGE,
+        # Ping reused connections before a request uses them
+        "CONN_HEALTH_CHECKS": os.environ.get("DB_CONN_HEALTH_CHECKS", default="True")
+        == "True",
+        "OPTIONS": {"pool": DB_POOL_OPTIONS} if DB_POOL else {},
     }
 }
 
+# Read replicas: comma-separated host[:port] list, each added as a
+# "replica_<n>" alias sharing the primary's name and credentials. The blog
+# list and detail views read from them (see mysite/routers.py); a browser that
+# just wrote is pinned to the primary for DATABASE_REPLICA_PIN_SECONDS.
+DATABASE_REPLICAS: list[str] = []
+for _number, _replica in enumerate(
+    filter(None, os.environ.get("SQL_REPLICA_HOSTS", default="").split(",")), 1
+):
+    _host, _, _port = _replica.strip().partition(":")
+    _alias = f"replica_{_number}"
+    DATABASES[_alias] = {
+        **copy.deepcopy(DATABASES["default"]),
+        "HOST": _host,
+        "PORT": _port or DATABASES["default"]["PORT"],
+        # Tests read replicas through the primary's test database
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(_alias)
+
+DATABASE_ROUTERS: list[str] = ["mysite.routers.PrimaryReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS: int = int(
+    os.environ.get("DATABASE_REPLICA_PIN_SECONDS", default="10")
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -181,11 +259,170 @@ if not DEBUG:
 MEDIA_ROOT: Path = BASE_DIR / "media"
 MEDIA_URL = "/media/"
 
+# Media serving when DEBUG is off (see mysite/media.py):
+# "" streams files from Django, "nginx" uses X-Accel-Redirect, "sendfile" X-Sendfile.
+MEDIA_ACCEL_MODES: tuple[str, ...] = ("", "nginx", "sendfile")
+MEDIA_ACCEL: str = os.environ.get("MEDIA_ACCEL", default="")
+if MEDIA_ACCEL not in MEDIA_ACCEL_MODES:
+    raise ImproperlyConfigured(
+        f"MEDIA_ACCEL must be empty, nginx or sendfile, got '{MEDIA_ACCEL}'."
+    )
+MEDIA_ACCEL_REDIRECT_PREFIX: str = os.environ.get(
+    "MEDIA_ACCEL_REDIRECT_PREFIX", default="/protected-media/"
+)
+# Cache lifetime for media without a content hash in its path (seconds)
+MEDIA_CACHE_MAX_AGE: int = int(os.environ.get("MEDIA_CACHE_MAX_AGE", default="3600"))
+
+# Profile image processing: "async" (background worker threads) or "sync"
+PROFILE_IMAGE_PROCESSING: str = os.environ.get(
+    "PROFILE_IMAGE_PROCESSING", default="async"
+)
+PROFILE_IMAGE_WORKERS: int = int(os.environ.get("PROFILE_IMAGE_WORKERS", default="2"))
+
+# Avatar variants generated per profile image (widths in px, preferred format first)
+AVATAR_VARIANT_SIZES: tuple[int, ...] = (32, 64, 128, 300)
+AVATAR_VARIANT_FORMATS: tuple[str, ...] = ("avif", "webp")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Cache backend: "locmem" (per worker process), "file" (shared by the
+# workers on one host) or "redis" (shared by every host, e.g.
+# CACHE_LOCATION=redis://redis:6379/0).
+CACHE_BACKEND: str = os.environ.get("CACHE_BACKEND", default="locmem")
+CACHE_BACKENDS: dict[str, tuple[str, str]] = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "mysite"),
+    "file": (
+        "django.core.cache.backends.filebased.FileBasedCache",
+        "/tmp/mysite-cache",
+    ),
+    "redis": (
+        "django.core.cache.backends.redis.RedisCache",
+        "redis://127.0.0.1:6379/0",
+    ),
+}
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"CACHE_BACKEND must be one of {', '.join(CACHE_BACKENDS)}, got '{CACHE_BACKEND}'."
+    )
+CACHES: dict[str, dict] = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND][0],
+        "LOCATION": os.environ.get(
+            "CACHE_LOCATION", default=CACHE_BACKENDS[CACHE_BACKEND][1]
+        ),
+        "TIMEOUT": int(os.environ.get("CACHE_TIMEOUT", default="300")),
+        "KEY_PREFIX": os.environ.get("CACHE_KEY_PREFIX", default="mysite"),
+    }
+}
+
+# Session storage: "db" (a django_session read per authenticated request),
+# "cached_db" (reads served from the cache, writes go to both) or
+# "signed_cookies" (no server-side storage; sessions cannot be revoked
+# server-side and their data is readable by the client). cached_db needs a
+# cache shared by every worker, so it is the default only off locmem.
+SESSION_STORES: dict[str, str] = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_STORE: str = os.environ.get(
+    "SESSION_STORE", default="db" if CACHE_BACKEND == "locmem" else "cached_db"
+)
+if SESSION_STORE not in SESSION_STORES:
+    raise ImproperlyConfigured(
+        f"SESSION_STORE must be one of {', '.join(SESSION_STORES)}, got '{SESSION_STORE}'."
+    )
+SESSION_ENGINE: str = SESSION_STORES[SESSION_STORE]
+SESSION_CACHE_ALIAS: str = "default"
+
+# request.user is loaded with its profile in one query by ProfileModelBackend
+# (users/backends.py) and cached for AUTH_USER_CACHE_TIMEOUT seconds (0
+# disables). Invalidation bumps versions in the cache, which other workers
+# only see with a shared backend, so locmem does not cache users.
+AUTHENTICATION_BACKENDS: list[str] = ["users.backends.ProfileModelBackend"]
+AUTH_USER_CACHE_TIMEOUT: int = int(
+    os.environ.get(
+        "AUTH_USER_CACHE_TIMEOUT",
+        default="0" if CACHE_BACKEND == "locmem" else "300",
+    )
+)
+
+# Full-page cache for anonymous visitors on the landing, home, about,
+# calendar and docs pages (seconds, 0 disables; see mysite/page_cache.py)
+PAGE_CACHE_ALIAS: str = "default"
+PAGE_CACHE_TIMEOUT: int = int(os.environ.get("PAGE_CACHE_TIMEOUT", default="300"))
+
+# Rendered post cards on the list pages (seconds). Invalidation bumps a
+# version in the cache, which other workers only see with a shared backend,
+# so locmem keeps cards for a short time only.
+POST_CARD_CACHE_TIMEOUT: int = int(
+    os.environ.get(
+        "POST_CARD_CACHE_TIMEOUT",
+        default="60" if CACHE_BACKEND == "locmem" else "86400",
+    )
+)
+
+# Cached post counters behind the page numbers of the list pages (seconds).
+# Saves and deletes adjust them in the cache, which other workers only see
+# with a shared backend, so locmem keeps them for a short time only.
+POST_COUNT_CACHE_TIMEOUT: int = int(
+    os.environ.get(
+        "POST_COUNT_CACHE_TIMEOUT",
+        default="60" if CACHE_BACKEND == "locmem" else "86400",
+    )
+)
+
+# Rendered markdown document cache (blog doc pages)
+# Optional Django cache alias used as a shared tier between workers.
+MARKDOWN_CACHE_ALIAS: str | None = os.environ.get("MARKDOWN_CACHE_ALIAS") or None
+MARKDOWN_CACHE_MAX_ENTRIES: int = int(
+    os.environ.get("MARKDOWN_CACHE_MAX_ENTRIES", default="32")
+)
+
+# Blog list pagination: "offset" (page numbers) or "keyset" (cursor tokens)
+BLOG_PAGINATION_MODE: str = os.environ.get("BLOG_PAGINATION_MODE", default="offset")
+
+# Use the PostgreSQL planner estimate instead of COUNT(*) for the blog index
+# once blog_post holds at least this many rows (0 disables the estimate).
+BLOG_APPROXIMATE_COUNT_THRESHOLD: int = int(
+    os.environ.get("BLOG_APPROXIMATE_COUNT_THRESHOLD", default="1000000")
+)
+
+# Post search ranks at most this many (newest) matches per query, which
+# bounds the cost of common terms on large tables (see blog/search.py)
+BLOG_SEARCH_MAX_RESULTS: int = int(
+    os.environ.get("BLOG_SEARCH_MAX_RESULTS", default="1000")
+)
+
+# JSON API page size (?limit=) default and upper bound (see blog/api.py)
+BLOG_API_PAGE_SIZE: int = int(os.environ.get("BLOG_API_PAGE_SIZE", default="100"))
+BLOG_API_MAX_PAGE_SIZE: int = int(
+    os.environ.get("BLOG_API_MAX_PAGE_SIZE", default="10000")
+)
+
+# Part of every post page ETag; change it on deploys that alter the markup
+# so browsers stop revalidating to pages rendered by the old templates.
+CONDITIONAL_GET_VERSION: str = os.environ.get("CONDITIONAL_GET_VERSION", default="1")
+
+# Request profiling per URL name (see mysite/profiling.py). Off by default;
+# the middleware then removes itself at startup. PROFILING_STORE is "memory"
+# (per worker) or "sqlite" (merged across the workers of a host, in a file
+# outside the checkout by default).
+PROFILING_ENABLED: bool = os.environ.get("PROFILING_ENABLED", "False") == "True"
+PROFILING_STORE: str = os.environ.get("PROFILING_STORE", default="memory")
+PROFILING_SQLITE_PATH: str = os.environ.get(
+    "PROFILING_SQLITE_PATH",
+    default=str(Path(tempfile.gettempdir()) / "mysite-profiling.sqlite3"),
+)
+PROFILING_FLUSH_SECONDS: float = float(
+    os.environ.get("PROFILING_FLUSH_SECONDS", default="5")
+)
+# Bearer token accepted by the Prometheus endpoint (staff sessions always are)
+PROFILING_METRICS_TOKEN: str = os.environ.get("PROFILING_METRICS_TOKEN", default="")
+
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap4"
 
 CRISPY_TEMPLATE_PACK = "bootstrap4"
@@ -204,6 +441,11 @@ EMAIL_HOST_PASSWORD: str | None = os.environ.get("EMAIL_PASS")
 DEFAULT_FROM_EMAIL: str | None = os.environ.get("EMAIL_USER")
 
 # Logging Configuration
+# Errors are also written to ERROR_LOG_FILE; point it outside the source tree
+# (e.g. /var/log/mysite/django_error.log) in deployments.
+ERROR_LOG_FILE: str = os.environ.get(
+    "ERROR_LOG_FILE", default=str(BASE_DIR / "django_error.log")
+)
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -221,7 +463,7 @@ LOGGING = {
         "file": {
             "level": "ERROR",
             "class": "logging.FileHandler",
-            "filename": BASE_DIR / "django_error.log",
+            "filename": ERROR_LOG_FILE,
             "formatter": "verbose",
         },
     },
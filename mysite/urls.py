@@ -22,15 +22,29 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.urls import include, path
-from django.views.static import serve
 
 # Import local modules
+from blog import async_views as blog_async_views
 from blog import views as blog_views
 from users import views as user_views
 
+from .media import serve_media
+from .profiling import profiling_metrics, profiling_stats
+
 # Define urlpatterns
 urlpatterns = [
     # path(route="admin/", view=admin.site.urls),
+    # Profiling pages come first; the admin catches every URL below its prefix
+    path(
+        route="secure-admin-portal/profiling/",
+        view=profiling_stats,
+        name="profiling-stats",
+    ),
+    path(
+        route="secure-admin-portal/profiling/metrics/",
+        view=profiling_metrics,
+        name="profiling-metrics",
+    ),
     path("secure-admin-portal/", view=admin.site.urls),
     path(route="register/", view=user_views.register, name="register"),
     path(route="profile/", view=user_views.profile, name="profile"),
@@ -72,16 +86,25 @@ urlpatterns = [
         ),
         name="password_reset_complete",
     ),
-    path(route="", view=blog_views.landing_page, name="landing-page"),
+    path(
+        route="",
+        view=(
+            blog_async_views.landing_page
+            if settings.ASYNC_VIEWS
+            else blog_views.landing_page
+        ),
+        name="landing-page",
+    ),
     path(route="", view=include(arg="blog.urls")),
 ]
 
-#  This manual serving of media files via serve is suitable for local testing with DEBUG=False.
-# In a real production environment (like AWS, Heroku, or a VPS),
-# it would typically configure web server (Nginx/Apache) or a storage service (like AWS S3) to handle these files directly.
+# In DEBUG, media is served by Django's static() helper.
+# Otherwise serve_media streams files with caching headers, or delegates the
+# transfer to Nginx/Apache via X-Accel-Redirect/X-Sendfile (MEDIA_ACCEL).
+# A storage service (like AWS S3) can still replace this in production.
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 else:
     urlpatterns += [
-        path("media/<path:path>", serve, {"document_root": settings.MEDIA_ROOT}),
+        path("media/<path:path>", serve_media, name="media"),
     ]
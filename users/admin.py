@@ -4,7 +4,8 @@
 from django.contrib import admin
 
 # Import local modules
-from .models import Profile
+from .models import Profile, ProfileImageJob
 
 # Register models
 admin.site.register(model_or_iterable=Profile)
+admin.site.register(model_or_iterable=ProfileImageJob)
@@ -0,0 +1,53 @@
+# users/backends.py
+
+# Import django libraries
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+# Import local modules
+from .versions import get_auth_user_version
+
+UserModel = get_user_model()
+
+
+def auth_user_cache_key(user_id: int, version: str) -> str:
+    """Return the cache key of a user loaded for request.user."""
+    return f"users:auth-user:{user_id}:{version}"
+
+
+class ProfileModelBackend(ModelBackend):
+    """ModelBackend that loads request.user together with its profile.
+
+    The user and profile come from one joined query, so templates and views
+    reading request.user.profile need no extra lookup. With
+    AUTH_USER_CACHE_TIMEOUT > 0 the loaded user is also kept in the shared
+    cache, keyed by the user's auth and profile version tokens, which
+    users/signals.py bumps whenever the user or profile is saved or the user
+    is deleted. Writes bypassing signals (QuerySet.update()) show up once
+    the timeout expires.
+    """
+
+    # Load the user and profile in one query
+    def load_user(self, user_id):
+        """Get the user with its profile, or None if it does not exist."""
+        try:
+            return UserModel._default_manager.select_related("profile").get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+
+    # Get the user for an authenticated session
+    def get_user(self, user_id):
+        """Get the session's user from the cache or the database."""
+        timeout = settings.AUTH_USER_CACHE_TIMEOUT
+        if timeout <= 0:
+            user = self.load_user(user_id)
+        else:
+            key = auth_user_cache_key(user_id, get_auth_user_version(user_id))
+            user = cache.get(key)
+            if user is None:
+                user = self.load_user(user_id)
+                if user is not None:
+                    cache.set(key, user, timeout)
+        return user if user is not None and self.user_can_authenticate(user) else None
@@ -0,0 +1 @@
+# users/management/__init__.py
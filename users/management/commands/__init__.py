@@ -0,0 +1 @@
+# users/management/commands/__init__.py
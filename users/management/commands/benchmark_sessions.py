@@ -0,0 +1,101 @@
+# users/management/commands/benchmark_sessions.py
+
+# Import built-in libraries
+import statistics
+import time
+
+# Import django libraries
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+# Rolls back the benchmark user and its sessions
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """Benchmark authenticated request latency per session engine.
+
+    Each engine in SESSION_STORES serves the same logged-in page through the
+    test client (full middleware stack, no network). Besides the latency
+    percentiles it reports the django_session queries per request, which
+    cached_db and signed_cookies remove from the hot path. The benchmark
+    user and its sessions are created in a transaction that is rolled back.
+    """
+
+    help = "Compare authenticated request latency across session engines."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--url",
+            default=None,
+            help="Path to request (default: the landing page).",
+        )
+        parser.add_argument(
+            "--store",
+            action="append",
+            choices=list(settings.SESSION_STORES),
+            help="Session store to run (repeatable, default: all).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["requests"] < 2:
+            raise CommandError("--requests must be at least 2.")
+        url = options["url"] or reverse("landing-page")
+        stores = options["store"] or list(settings.SESSION_STORES)
+
+        self.stdout.write(
+            f"{'store':<16} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'mean ms':>8} {'session queries':>16}"
+        )
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(username="session-benchmark")
+                for store in stores:
+                    latencies, session_queries = self.run_store(
+                        store, user, url, options["requests"]
+                    )
+                    cut_points = statistics.quantiles(latencies, n=100)
+                    self.stdout.write(
+                        f"{store:<16} "
+                        f"{cut_points[49] * 1000:>8.2f} "
+                        f"{cut_points[94] * 1000:>8.2f} "
+                        f"{cut_points[98] * 1000:>8.2f} "
+                        f"{statistics.fmean(latencies) * 1000:>8.2f} "
+                        f"{session_queries / len(latencies):>16.2f}"
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+
+    # Time logged-in requests with one session engine
+    @staticmethod
+    def run_store(store: str, user, url: str, requests: int) -> tuple[list, int]:
+        """Return request latencies (seconds) and the django_session queries."""
+        with override_settings(
+            SESSION_ENGINE=settings.SESSION_STORES[store],
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+        ):
+            client = Client()
+            client.force_login(user)
+            # Warm up templates and caches outside the measurement
+            client.get(url)
+            latencies: list[float] = []
+            with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+                for _ in range(requests):
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    latencies.append(time.perf_counter() - started)
+                    if response.status_code >= 400:
+                        raise CommandError(f"{url} returned {response.status_code}.")
+        session_queries = sum(
+            "django_session" in query["sql"] for query in queries.captured_queries
+        )
+        return latencies, session_queries
@@ -0,0 +1,75 @@
+# users/management/commands/clear_expired_sessions.py
+
+# Import built-in libraries
+import time
+from importlib import import_module
+
+# Import django libraries
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DBSessionStore
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """Delete expired sessions in bounded batches.
+
+    Django's clearsessions removes every expired row with a single DELETE,
+    which on a large django_session table holds its locks and generates WAL
+    for as long as the whole delete takes. This command deletes at most
+    --batch-size rows per statement (using the expire_date index), each in
+    its own transaction, optionally pausing between batches.
+
+    Engines without server-side rows (signed_cookies, cache) need no
+    cleanup; their own clear_expired() is called instead.
+    """
+
+    help = "Delete expired sessions in batches."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.0,
+            help="Seconds to pause between batches.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        if not issubclass(store, DBSessionStore):
+            try:
+                store.clear_expired()
+            except NotImplementedError:
+                raise CommandError(
+                    f"{settings.SESSION_ENGINE} cannot clear expired sessions."
+                )
+            self.stdout.write(f"{settings.SESSION_ENGINE}: no session rows to delete")
+            return
+
+        session_model = store.get_model_class()
+        now = timezone.now()
+        started = time.perf_counter()
+        deleted = 0
+        while True:
+            keys = list(
+                session_model.objects.filter(expire_date__lt=now).values_list(
+                    "pk", flat=True
+                )[:batch_size]
+            )
+            if not keys:
+                break
+            deleted += session_model.objects.filter(pk__in=keys).delete()[0]
+            if len(keys) < batch_size:
+                break
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(
+            f"deleted {deleted} expired sessions in "
+            f"{time.perf_counter() - started:.1f}s"
+        )
@@ -0,0 +1,36 @@
+# users/management/commands/process_image_jobs.py
+
+# Import django libraries
+from django.core.management.base import BaseCommand, CommandParser
+
+# Import local modules
+from users.tasks import process_pending_jobs
+
+
+class Command(BaseCommand):
+    """Process queued profile image jobs.
+
+    Worker threads normally handle jobs as they are queued; this command
+    drains anything left behind, e.g. jobs queued before a restart.
+    """
+
+    help = "Process pending profile image jobs."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--retry-failed", action="store_true", help="Requeue failed jobs first."
+        )
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="Queue jobs for profiles without avatar variants.",
+        )
+        parser.add_argument("--limit", type=int, help="Maximum jobs to process.")
+
+    def handle(self, *args, **options) -> None:
+        processed = process_pending_jobs(
+            retry_failed=options["retry_failed"],
+            limit=options["limit"],
+            backfill=options["backfill"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} image job(s)."))
@@ -0,0 +1,54 @@
+# users/middleware.py
+
+# Import built-in libraries
+from functools import partial
+
+# Import django libraries
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth import middleware as auth_middleware
+from django.utils.functional import SimpleLazyObject
+
+# Sessions created before ProfileModelBackend name Django's ModelBackend
+LEGACY_BACKENDS: dict[str, str] = {
+    "django.contrib.auth.backends.ModelBackend": "users.backends.ProfileModelBackend",
+}
+
+
+def upgrade_session_backend(session) -> None:
+    """Point a session logged in through a replaced backend at its successor."""
+    backend = LEGACY_BACKENDS.get(session.get(BACKEND_SESSION_KEY))
+    if backend is not None:
+        session[BACKEND_SESSION_KEY] = backend
+
+
+async def aupgrade_session_backend(session) -> None:
+    """Async version of upgrade_session_backend()."""
+    backend = LEGACY_BACKENDS.get(await session.aget(BACKEND_SESSION_KEY))
+    if backend is not None:
+        await session.aset(BACKEND_SESSION_KEY, backend)
+
+
+def get_user(request):
+    upgrade_session_backend(request.session)
+    return auth_middleware.get_user(request)
+
+
+async def auser(request):
+    await aupgrade_session_backend(request.session)
+    return await auth_middleware.auser(request)
+
+
+class ProfileAuthenticationMiddleware(auth_middleware.AuthenticationMiddleware):
+    """AuthenticationMiddleware that keeps sessions from the old backend valid.
+
+    Django logs out sessions whose backend is no longer listed in
+    AUTHENTICATION_BACKENDS; sessions created through ModelBackend are
+    moved to ProfileModelBackend instead, the first time request.user is
+    read.
+    """
+
+    # Attach the lazy user to the request
+    def process_request(self, request) -> None:
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
+        request.auser = partial(auser, request)
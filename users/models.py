@@ -1,13 +1,13 @@
 # users/models.py
 
+# Import built-in libraries
+import copy
+from typing import Any
+
 # Import django libraries
 from django.contrib.auth.models import User
 from django.db import models
 
-# Import third-party libraries
-from PIL import Image
-from PIL.ImageFile import ImageFile
-
 
 class Profile(models.Model):
     """User profile model.
@@ -15,24 +15,127 @@ class Profile(models.Model):
     Attributes:
         user (User): User.
         image (ImageField): User profile image.
+        image_hash (str): Content hash of the processed image.
+        image_variants (dict): Resized variant file names by format and width.
     """
 
     user: models.OneToOneField[User] = models.OneToOneField(
         User, on_delete=models.CASCADE
     )
     image = models.ImageField(default="default.jpg", upload_to="profile_pics")
+    image_hash = models.CharField(max_length=64, blank=True, editable=False)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self) -> str:
         """Represent user profile."""
         return f"{self.user.username} Profile"
 
+    # Remember loaded field values so save() can tell what changed
+    @classmethod
+    def from_db(cls, db, field_names, values) -> "Profile":
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_state = instance._field_state()
+        return instance
+
+    def _field_state(self) -> dict[str, Any]:
+        """Return comparable values of the loaded (non-deferred) fields."""
+        state: dict[str, Any] = {}
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue
+            if isinstance(field, models.FileField):
+                state[field.attname] = getattr(self, field.attname).name
+            else:
+                state[field.attname] = copy.deepcopy(self.__dict__[field.attname])
+        return state
+
+    def get_dirty_fields(self) -> list[str] | None:
+        """Return fields changed since load, or None if the state is unknown."""
+        loaded_state: dict[str, Any] | None = getattr(self, "_loaded_state", None)
+        if self._state.adding or loaded_state is None:
+            return None
+        current_state = self._field_state()
+        return [
+            self._meta.get_field(attname).name
+            for attname, value in current_state.items()
+            if attname in loaded_state and loaded_state[attname] != value
+        ]
+
     def save(self, *args, **kwargs) -> None:
-        """Save user profile image."""
+        """Save changed profile fields and queue image processing if needed.
+
+        Saves of a loaded profile with no changes are skipped entirely, and
+        otherwise only the changed columns are written. Resizing and
+        variant generation run in a background worker (see users.tasks)
+        after the transaction commits, so requests never block on Pillow.
+        """
+        dirty_fields = self.get_dirty_fields()
+        update_fields = kwargs.get("update_fields")
+        if dirty_fields is not None:
+            if update_fields is not None:
+                # Explicit update_fields are always honoured
+                dirty_fields = [f for f in dirty_fields if f in update_fields]
+            elif not dirty_fields:
+                return
+            else:
+                kwargs["update_fields"] = dirty_fields
+
+        image_changed = dirty_fields is None or "image" in dirty_fields
+        if image_changed:
+            # Variants belong to the previous image until the job reprocesses
+            self.image_hash = ""
+            self.image_variants = {}
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {
+                    *kwargs["update_fields"],
+                    "image_hash",
+                    "image_variants",
+                }
         super().save(*args, **kwargs)
+        self._loaded_state = self._field_state()
+
+        default_image = self._meta.get_field(field_name="image").default
+        if image_changed and self.image.name != default_image:
+            # Import here to avoid a circular import (tasks imports models)
+            from .tasks import enqueue_profile_image
+
+            enqueue_profile_image(profile=self)
+
 
-        img: ImageFile = Image.open(self.image.path)
+class ProfileImageJob(models.Model):
+    """Queued profile image processing job.
 
-        if img.height > 300 or img.width > 300:
-            output_size = (300, 300)
-            img.thumbnail(size=output_size)
-            img.save(fp=self.image.path)
+    Jobs are stored in the database so no external broker is needed; a
+    worker thread pool (or the process_image_jobs command) picks them up.
+
+    Attributes:
+        profile (Profile): Profile whose image is processed.
+        image_name (str): Image file name the job was queued for.
+        status (str): Job status.
+        attempts (int): Number of processing attempts.
+        error (str): Last error message.
+        created_at (datetime): Job creation date.
+        updated_at (datetime): Job last update date.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    profile = models.ForeignKey(
+        Profile, on_delete=models.CASCADE, related_name="image_jobs"
+    )
+    image_name = models.CharField(max_length=100)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING, db_index=True
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        """Represent profile image job."""
+        return f"{self.image_name} ({self.status})"
@@ -2,15 +2,18 @@
 
 # Import built-in libraries
 import logging
+from functools import partial
 
 # Import django libraries
 from django.contrib.auth.models import User
 from django.contrib.auth.signals import user_logged_in, user_logged_out
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 # Import local modules
 from .models import Profile
+from .versions import bump_auth_version, bump_profile_version
 
 # Get an instance of a logger
 logger = logging.getLogger(__name__)
@@ -24,9 +27,60 @@ def create_profile(sender, instance, created, **kwargs) -> None:
 
 
 @receiver(signal=post_save, sender=User)
-def save_profile(sender, instance, **kwargs) -> None:
-    """Save a profile for each new user."""
-    instance.profile.save()
+def save_profile(sender, instance, update_fields=None, **kwargs) -> None:
+    """Save the user's profile if it was modified alongside the user.
+
+    Partial user saves (e.g. update_last_login saving only `last_login`)
+    never touch the profile, and the profile is only saved when it is
+    already loaded on the user and has unsaved changes.
+    """
+    if kwargs.get("raw", False) or update_fields is not None:
+        return
+    # Avoid a query when the profile was never loaded on this instance
+    if not User.profile.is_cached(instance):
+        return
+    profile: Profile = instance.profile
+    if profile.get_dirty_fields() != []:
+        profile.save()
+
+
+@receiver(signal=post_save, sender=User)
+def invalidate_user_fragments(sender, instance, update_fields=None, **kwargs) -> None:
+    """Re-render fragments showing the user when their username may change.
+
+    Partial saves that leave the username alone (e.g. last_login on every
+    login) keep the cached fragments.
+    """
+    if kwargs.get("raw", False) or kwargs.get("created", False):
+        return
+    if update_fields is None or "username" in update_fields:
+        transaction.on_commit(partial(bump_profile_version, instance.pk))
+
+
+@receiver(signal=post_save, sender=User)
+def invalidate_cached_auth_user(sender, instance, update_fields=None, **kwargs) -> None:
+    """Reload the user's cached request.user after the user changes.
+
+    Login only writes `last_login`, which request.user may show stale.
+    """
+    if kwargs.get("raw", False) or kwargs.get("created", False):
+        return
+    if update_fields is None or not set(update_fields) <= {"last_login"}:
+        transaction.on_commit(partial(bump_auth_version, instance.pk))
+
+
+@receiver(signal=post_delete, sender=User)
+def invalidate_deleted_auth_user(sender, instance, **kwargs) -> None:
+    """Drop a deleted user's cached request.user."""
+    transaction.on_commit(partial(bump_auth_version, instance.pk))
+
+
+@receiver(signal=post_save, sender=Profile)
+def invalidate_profile_fragments(sender, instance, **kwargs) -> None:
+    """Re-render fragments showing the profile's avatar after it changes."""
+    if kwargs.get("raw", False):
+        return
+    transaction.on_commit(partial(bump_profile_version, instance.user_id))
 
 
 @receiver(user_logged_in)
@@ -0,0 +1,216 @@
+# users/tasks.py
+
+# Import built-in libraries
+import hashlib
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+
+# Import django libraries
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+# Import third-party libraries
+from PIL import Image, features
+from PIL.ImageFile import ImageFile
+
+# Import local modules
+from .models import Profile, ProfileImageJob
+from .versions import bump_profile_version
+
+# Get an instance of a logger
+logger: logging.Logger = logging.getLogger(name=__name__)
+
+# Maximum profile image size (width, height)
+OUTPUT_SIZE = (300, 300)
+
+# Avatar variant widths and formats (most preferred format first)
+VARIANT_SIZES: tuple[int, ...] = tuple(
+    getattr(settings, "AVATAR_VARIANT_SIZES", (32, 64, 128, 300))
+)
+VARIANT_FORMATS: tuple[str, ...] = tuple(
+    getattr(settings, "AVATAR_VARIANT_FORMATS", ("avif", "webp"))
+)
+VARIANT_DIR = "profile_pics/variants"
+
+# Jobs left running longer than this are considered abandoned
+STALE_JOB_AGE = timedelta(minutes=10)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+# Resize a profile image in place
+def resize_profile_image(path: str) -> None:
+    """Thumbnail the image at path to fit within OUTPUT_SIZE."""
+    img: ImageFile = Image.open(path)
+
+    if img.height > OUTPUT_SIZE[1] or img.width > OUTPUT_SIZE[0]:
+        img.thumbnail(size=OUTPUT_SIZE)
+        img.save(fp=path)
+
+
+# Generate resized, re-encoded copies of a profile image
+def generate_image_variants(path: str) -> tuple[str, dict[str, dict[str, str]]]:
+    """Write avatar variants for the image at path.
+
+    Variants are stored under a directory named after the image's content
+    hash, so identical uploads share files and existing variants are reused.
+
+    Returns:
+        tuple: (content hash, {format: {width: storage name}}).
+    """
+    with open(path, "rb") as file:
+        content = file.read()
+    content_hash = hashlib.sha256(content).hexdigest()
+
+    img = Image.open(io.BytesIO(content))
+    img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+    largest = max(img.size)
+
+    variants: dict[str, dict[str, str]] = {}
+    for image_format in VARIANT_FORMATS:
+        if not features.check(image_format):
+            continue
+        variants[image_format] = {}
+        for size in VARIANT_SIZES:
+            # Never upscale; the largest variant is capped at the source size
+            if size > largest and size != min(VARIANT_SIZES):
+                continue
+            name = f"{VARIANT_DIR}/{content_hash}/{size}.{image_format}"
+            if not default_storage.exists(name):
+                variant = img.copy()
+                variant.thumbnail(size=(size, size))
+                buffer = io.BytesIO()
+                variant.save(buffer, format=image_format.upper(), quality=80)
+                default_storage.save(name, ContentFile(buffer.getvalue()))
+            variants[image_format][str(size)] = name
+    return content_hash, variants
+
+
+# Get the shared worker pool, created lazily in each process
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide image worker pool."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "PROFILE_IMAGE_WORKERS", 2),
+                thread_name_prefix="profile-image",
+            )
+        return _executor
+
+
+# Queue an image job for a profile
+def enqueue_profile_image(profile: Profile) -> ProfileImageJob:
+    """Create a job for the profile's current image.
+
+    The job is handed to the worker pool once the surrounding transaction
+    commits. With PROFILE_IMAGE_PROCESSING = "sync" it runs inline instead.
+    """
+    job = ProfileImageJob.objects.create(profile=profile, image_name=profile.image.name)
+    if getattr(settings, "PROFILE_IMAGE_PROCESSING", "async") == "sync":
+        transaction.on_commit(partial(run_image_job, job.pk))
+    else:
+        transaction.on_commit(partial(submit_image_job, job.pk))
+    return job
+
+
+def submit_image_job(job_id: int) -> None:
+    """Submit a job to the worker pool."""
+    get_executor().submit(_run_in_worker, job_id)
+
+
+def _run_in_worker(job_id: int) -> None:
+    """Run a job in a worker thread, managing its DB connection."""
+    close_old_connections()
+    try:
+        run_image_job(job_id)
+    except Exception:
+        logger.exception(f"Profile image job {job_id} crashed.")
+    finally:
+        close_old_connections()
+
+
+# Claim and process a single job
+def run_image_job(job_id: int) -> bool:
+    """Process a pending job. Returns True if this call processed it."""
+    # Claim atomically so the job runs once even with several workers
+    claimed = ProfileImageJob.objects.filter(
+        pk=job_id, status=ProfileImageJob.Status.PENDING
+    ).update(
+        status=ProfileImageJob.Status.RUNNING,
+        attempts=F("attempts") + 1,
+        updated_at=timezone.now(),
+    )
+    if not claimed:
+        return False
+
+    job = ProfileImageJob.objects.select_related("profile").get(pk=job_id)
+    try:
+        # Skip images that were replaced after the job was queued
+        if job.profile.image.name == job.image_name:
+            resize_profile_image(job.profile.image.path)
+            content_hash, variants = generate_image_variants(job.profile.image.path)
+            # Update only if the image is still the one this job processed
+            updated = Profile.objects.filter(
+                pk=job.profile.pk, image=job.image_name
+            ).update(image_hash=content_hash, image_variants=variants)
+            # update() sends no post_save, so refresh cached avatars here
+            if updated:
+                bump_profile_version(job.profile.user_id)
+    except Exception as exc:
+        job.status = ProfileImageJob.Status.FAILED
+        job.error = str(exc)
+        job.save(update_fields=["status", "error", "updated_at"])
+        logger.warning(f"Profile image job {job_id} failed: {exc}")
+        return True
+
+    job.status = ProfileImageJob.Status.DONE
+    job.error = ""
+    job.save(update_fields=["status", "error", "updated_at"])
+    return True
+
+
+# Drain the queue (used by the process_image_jobs command)
+def process_pending_jobs(
+    retry_failed: bool = False, limit: int | None = None, backfill: bool = False
+) -> int:
+    """Process queued jobs synchronously and return how many ran.
+
+    Jobs stuck in "running" (e.g. after a worker restart) are requeued.
+    With backfill, jobs are first queued for profiles without variants.
+    """
+    if backfill:
+        ProfileImageJob.objects.bulk_create(
+            ProfileImageJob(profile_id=pk, image_name=image_name)
+            for pk, image_name in Profile.objects.filter(image_hash="")
+            .exclude(image_jobs__status=ProfileImageJob.Status.PENDING)
+            .values_list("pk", "image")
+        )
+
+    stale_before = timezone.now() - STALE_JOB_AGE
+    ProfileImageJob.objects.filter(
+        status=ProfileImageJob.Status.RUNNING, updated_at__lt=stale_before
+    ).update(status=ProfileImageJob.Status.PENDING)
+    if retry_failed:
+        ProfileImageJob.objects.filter(status=ProfileImageJob.Status.FAILED).update(
+            status=ProfileImageJob.Status.PENDING
+        )
+
+    job_ids = (
+        ProfileImageJob.objects.filter(status=ProfileImageJob.Status.PENDING)
+        .order_by("created_at")
+        .values_list("pk", flat=True)
+    )
+    if limit is not None:
+        job_ids = job_ids[:limit]
+
+    return sum(run_image_job(job_id) for job_id in list(job_ids))
@@ -0,0 +1 @@
+# users/templatetags/__init__.py
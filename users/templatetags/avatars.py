@@ -0,0 +1,65 @@
+# users/templatetags/avatars.py
+
+# Import django libraries
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import SafeString
+
+# Import local modules
+from users.models import Profile
+
+# Register template library
+register = template.Library()
+
+# MIME types of the variant formats
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+
+@register.simple_tag
+def avatar(
+    profile: Profile, css_class: str = "", sizes: str = "64px", alt: str = ""
+) -> SafeString:
+    """Render a profile image as a <picture> with responsive variants.
+
+    Each available format becomes a <source> with a width-based srcset, so
+    the browser picks the smallest modern file for the displayed size. The
+    original image stays the <img> fallback; profiles without variants
+    render a plain <img>.
+
+    Usage:
+        {% avatar post.author.profile "rounded-circle article-img" "65px" %}
+    """
+    # A user without a profile resolves to "" in templates
+    if not isinstance(profile, Profile):
+        return format_html('<img class="{}" alt="{}" />', css_class, alt)
+
+    img = format_html(
+        '<img class="{}" src="{}" alt="{}" loading="lazy" />',
+        css_class,
+        profile.image.url,
+        alt,
+    )
+    variants: dict[str, dict[str, str]] = profile.image_variants or {}
+    if not variants:
+        return img
+
+    sources = format_html_join(
+        "",
+        '<source type="{}" srcset="{}" sizes="{}" />',
+        (
+            (
+                MIME_TYPES.get(image_format, f"image/{image_format}"),
+                ", ".join(
+                    f"{default_storage.url(name)} {width}w"
+                    for width, name in sorted(
+                        by_width.items(), key=lambda item: int(item[0])
+                    )
+                ),
+                sizes,
+            )
+            for image_format, by_width in variants.items()
+            if by_width
+        ),
+    )
+    return format_html("<picture>{}{}</picture>", sources, img)
@@ -1,4 +1,342 @@
 # users/tests.py
 
+# Import built-in libraries
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
+
 # Import django libraries
-from django.test import TestCase  # noqa: F401
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.http import Http404
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+# Import third-party libraries
+from PIL import Image
+
+# Import local modules
+from blog.tests import MediaRootMixin
+from mysite.media import serve_media
+
+from .models import Profile, ProfileImageJob
+from .tasks import process_pending_jobs
+
+
+class ProfileImageJobTests(MediaRootMixin, TestCase):
+    """Tests for off-request profile image processing."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="member", password="pass")
+        (self.media_root / "profile_pics").mkdir(exist_ok=True)
+
+    def set_large_image(self) -> Path:
+        path = self.media_root / "profile_pics" / "large.jpg"
+        Image.new("RGB", (1200, 800)).save(path)
+        profile = self.user.profile
+        profile.image.name = "profile_pics/large.jpg"
+        with self.captureOnCommitCallbacks() as callbacks:
+            profile.save()
+        # Image job submission and the avatar fragment version bump
+        self.assertEqual(len(callbacks), 2)
+        return path
+
+    def test_saving_unchanged_profile_queues_no_job(self) -> None:
+        self.user.profile.save()
+        self.user.save()
+        self.assertFalse(ProfileImageJob.objects.exists())
+
+    def test_image_change_queues_job_without_resizing_inline(self) -> None:
+        path = self.set_large_image()
+        job = ProfileImageJob.objects.get()
+        self.assertEqual(job.status, ProfileImageJob.Status.PENDING)
+        self.assertEqual(Image.open(path).size, (1200, 800))
+
+    def test_pending_job_resizes_image(self) -> None:
+        path = self.set_large_image()
+        self.assertEqual(process_pending_jobs(), 1)
+        self.assertEqual(
+            ProfileImageJob.objects.get().status, ProfileImageJob.Status.DONE
+        )
+        self.assertLessEqual(max(Image.open(path).size), 300)
+        # A processed job is not picked up twice
+        self.assertEqual(process_pending_jobs(), 0)
+
+    def test_job_generates_variants_rendered_by_avatar_tag(self) -> None:
+        self.set_large_image()
+        process_pending_jobs()
+        profile = self.user.profile
+        profile.refresh_from_db()
+        self.assertEqual(len(profile.image_hash), 64)
+        webp = profile.image_variants["webp"]
+        self.assertEqual(sorted(webp, key=int), ["32", "64", "128", "300"])
+        self.assertTrue((self.media_root / webp["64"]).exists())
+
+        html = Template(
+            '{% load avatars %}{% avatar profile "article-img" "65px" %}'
+        ).render(Context({"profile": profile}))
+        self.assertIn('<source type="image/webp"', html)
+        self.assertIn(f"/media/{webp['64']} 64w", html)
+        self.assertIn('sizes="65px"', html)
+
+    def test_avatar_tag_falls_back_to_plain_image(self) -> None:
+        html = Template("{% load avatars %}{% avatar profile %}").render(
+            Context({"profile": self.user.profile})
+        )
+        self.assertEqual(
+            html, '<img class="" src="/media/default.jpg" alt="" loading="lazy" />'
+        )
+
+
+class ProfileDirtyTrackingTests(MediaRootMixin, TestCase):
+    """Tests that profile writes only happen when the profile changed."""
+
+    # user lookup, session key check, session INSERT, UPDATE last_login,
+    # session UPDATE, plus two SAVEPOINT/RELEASE pairs around session writes
+    LOGIN_BUDGET = 9
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="member", password="pass")
+
+    def test_unchanged_profile_save_is_skipped(self) -> None:
+        profile = Profile.objects.get(user=self.user)
+        with self.assertNumQueries(0):
+            profile.save()
+
+    def test_changed_profile_updates_only_dirty_columns(self) -> None:
+        profile = Profile.objects.get(user=self.user)
+        profile.image.name = "profile_pics/other.jpg"
+        self.assertEqual(profile.get_dirty_fields(), ["image"])
+        with self.assertNumQueries(2):  # profile UPDATE, job INSERT
+            profile.save()
+        self.assertEqual(profile.get_dirty_fields(), [])
+
+    def test_login_does_not_touch_profile_or_image_files(self) -> None:
+        with (
+            mock.patch("PIL.Image.open") as image_open,
+            mock.patch.object(Profile, "save") as profile_save,
+            self.assertNumQueries(self.LOGIN_BUDGET) as queries,
+        ):
+            response = self.client.post(
+                reverse("login"), {"username": "member", "password": "pass"}
+            )
+        self.assertEqual(response.status_code, 302)
+        image_open.assert_not_called()
+        profile_save.assert_not_called()
+        self.assertFalse(
+            any("users_profile" in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_full_user_save_skips_unchanged_profile(self) -> None:
+        user = User.objects.select_related("profile").get(pk=self.user.pk)
+        user.first_name = "Member"
+        with self.assertNumQueries(1):  # auth_user UPDATE only
+            user.save()
+
+
+class MediaServingTests(MediaRootMixin, SimpleTestCase):
+    """Tests for the non-DEBUG media view."""
+
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+
+    def test_streams_file_with_validators(self) -> None:
+        response = serve_media(self.factory.get("/media/default.jpg"), "default.jpg")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(response["Cache-Control"], "public, max-age=3600")
+        self.assertTrue(response["ETag"].startswith('"'))
+        response.close()
+
+        not_modified = serve_media(
+            self.factory.get("/", headers={"If-None-Match": response["ETag"]}),
+            "default.jpg",
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+    def test_hashed_variants_are_immutable(self) -> None:
+        path = f"profile_pics/variants/{'a' * 64}/64.webp"
+        (self.media_root / path).parent.mkdir(parents=True)
+        (self.media_root / path).write_bytes(b"webp")
+        response = serve_media(self.factory.get("/"), path)
+        self.assertIn("immutable", response["Cache-Control"])
+        response.close()
+
+    @override_settings(MEDIA_ACCEL="nginx")
+    def test_nginx_accel_redirect(self) -> None:
+        response = serve_media(self.factory.get("/"), "default.jpg")
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/default.jpg")
+        self.assertEqual(response.content, b"")
+
+    @override_settings(MEDIA_ACCEL="nginx")
+    def test_nginx_accel_redirect_encodes_non_ascii_names(self) -> None:
+        (self.media_root / "profile_pics").mkdir(exist_ok=True)
+        (self.media_root / "profile_pics" / "фото.jpg").write_bytes(b"jpeg")
+        response = serve_media(self.factory.get("/"), "profile_pics/фото.jpg")
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            "/protected-media/profile_pics/%D1%84%D0%BE%D1%82%D0%BE.jpg",
+        )
+
+    @override_settings(MEDIA_ACCEL="sendfile")
+    def test_sendfile_streams_non_ascii_names(self) -> None:
+        response = serve_media(self.factory.get("/"), "default.jpg")
+        self.assertEqual(response["X-Sendfile"], str(self.media_root / "default.jpg"))
+
+        (self.media_root / "profile_pics").mkdir(exist_ok=True)
+        (self.media_root / "profile_pics" / "café.jpg").write_bytes(b"jpeg")
+        response = serve_media(self.factory.get("/"), "profile_pics/café.jpg")
+        self.assertNotIn("X-Sendfile", response)
+        self.assertEqual(b"".join(response.streaming_content), b"jpeg")
+        response.close()
+
+    @override_settings(MEDIA_ACCEL="apache")
+    def test_unknown_accel_mode_streams_the_file(self) -> None:
+        response = serve_media(self.factory.get("/"), "default.jpg")
+        self.assertNotIn("X-Sendfile", response)
+        self.assertTrue(response.streaming)
+        response.close()
+
+    def test_rejects_missing_and_escaping_paths(self) -> None:
+        for path in ("missing.jpg", "../settings.py", "profile_pics"):
+            with self.assertRaises(Http404):
+                serve_media(self.factory.get("/"), path)
+
+
+class SessionCleanupTests(MediaRootMixin, TestCase):
+    """Tests for batched session cleanup and the session benchmark."""
+
+    def test_deletes_expired_sessions_in_batches(self) -> None:
+        now = timezone.now()
+        for i in range(5):
+            Session.objects.create(
+                session_key=f"expired{i}",
+                session_data="",
+                expire_date=now - timedelta(days=1),
+            )
+        Session.objects.create(
+            session_key="current", session_data="", expire_date=now + timedelta(days=1)
+        )
+        out = StringIO()
+        with self.assertNumQueries(6):  # 3 batches of SELECT + DELETE
+            call_command("clear_expired_sessions", "--batch-size=2", stdout=out)
+        self.assertIn("deleted 5 expired sessions", out.getvalue())
+        self.assertEqual(
+            list(Session.objects.values_list("pk", flat=True)), ["current"]
+        )
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+    def test_cookie_sessions_have_nothing_to_delete(self) -> None:
+        out = StringIO()
+        call_command("clear_expired_sessions", stdout=out)
+        self.assertIn("no session rows to delete", out.getvalue())
+
+    def test_benchmark_reports_each_store(self) -> None:
+        out = StringIO()
+        call_command("benchmark_sessions", "--requests=2", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(
+            [line.split()[0] for line in lines[1:]],
+            ["db", "cached_db", "signed_cookies"],
+        )
+        # Only the database engine reads django_session on every request
+        self.assertEqual(float(lines[1].split()[-1]), 1.0)
+        self.assertEqual(float(lines[2].split()[-1]), 0.0)
+        self.assertFalse(User.objects.filter(username="session-benchmark").exists())
+
+
+class AuthUserLoadingTests(MediaRootMixin, TestCase):
+    """Tests for loading request.user with its profile (users/backends.py)."""
+
+    # session, user joined with profile
+    PROFILE_PAGE_BUDGET = 2
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="member", password="pass")
+        self.client.force_login(self.user)
+
+    def user_queries(self, queries) -> int:
+        return sum('FROM "auth_user"' in query["sql"] for query in queries)
+
+    def test_profile_page_loads_user_and_profile_together(self) -> None:
+        with self.assertNumQueries(self.PROFILE_PAGE_BUDGET) as queries:
+            response = self.client.get(reverse("profile"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('"users_profile"', queries.captured_queries[-1]["sql"])
+
+    @override_settings(AUTH_USER_CACHE_TIMEOUT=300)
+    def test_cached_user_skips_user_query(self) -> None:
+        self.client.get(reverse("profile"))
+        with self.assertNumQueries(1) as queries:  # session
+            response = self.client.get(reverse("profile"))
+        self.assertEqual(self.user_queries(queries.captured_queries), 0)
+        self.assertContains(response, "member")
+
+    @override_settings(AUTH_USER_CACHE_TIMEOUT=300)
+    @mock.patch("users.tasks.submit_image_job")
+    def test_user_and_profile_saves_invalidate_cached_user(self, submit) -> None:
+        self.client.get(reverse("profile"))
+        self.user.email = "member@example.com"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertContains(self.client.get(reverse("profile")), "member@example.com")
+
+        profile = Profile.objects.get(user=self.user)
+        profile.image.name = "profile_pics/other.jpg"
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        response = self.client.get(reverse("profile"))
+        self.assertEqual(
+            response.context["user"].profile.image.name, profile.image.name
+        )
+
+    @override_settings(AUTH_USER_CACHE_TIMEOUT=300)
+    def test_login_keeps_cached_user(self) -> None:
+        self.client.get(reverse("profile"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.login(username="member", password="pass")
+        with self.assertNumQueries(1) as queries:
+            self.client.get(reverse("profile"))
+        self.assertEqual(self.user_queries(queries.captured_queries), 0)
+
+    def test_legacy_backend_sessions_stay_logged_in(self) -> None:
+        self.client.force_login(
+            self.user, backend="django.contrib.auth.backends.ModelBackend"
+        )
+        response = self.client.get(reverse("profile"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.client.session[BACKEND_SESSION_KEY],
+            "users.backends.ProfileModelBackend",
+        )
+
+    def test_profile_update_removes_replaced_image(self) -> None:
+        old_image = self.media_root / "profile_pics" / "old.jpg"
+        old_image.parent.mkdir(exist_ok=True)
+        Image.new("RGB", (10, 10)).save(old_image)
+        Profile.objects.filter(user=self.user).update(image="profile_pics/old.jpg")
+        upload = BytesIO()
+        Image.new("RGB", (10, 10)).save(upload, format="JPEG")
+        response = self.client.post(
+            reverse("profile"),
+            {
+                "username": "member",
+                "email": "member@example.com",
+                "image": SimpleUploadedFile("new.jpg", upload.getvalue()),
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(old_image.exists())
+        self.assertEqual(
+            Profile.objects.get(user=self.user).image.name, "profile_pics/new.jpg"
+        )
@@ -0,0 +1,91 @@
+# users/versions.py
+
+# Import built-in libraries
+import time
+
+# Import django libraries
+from django.core.cache import cache
+
+# Version tokens never expire on their own; eviction just forces a new token
+PROFILE_VERSION_TIMEOUT = None
+
+
+def profile_version_key(user_id: int) -> str:
+    """Return the cache key of a user's profile version token."""
+    return f"users:profile-version:{user_id}"
+
+
+# Changes whenever any profile changes (pages showing many authors)
+ANY_PROFILE_VERSION_KEY = "users:profile-version:any"
+
+
+def _new_version() -> str:
+    return str(time.time_ns())
+
+
+def bump_profile_version(user_id: int) -> None:
+    """Change the version token of everything rendered from a user/profile."""
+    version = _new_version()
+    cache.set_many(
+        {profile_version_key(user_id): version, ANY_PROFILE_VERSION_KEY: version},
+        PROFILE_VERSION_TIMEOUT,
+    )
+
+
+def get_any_profile_version() -> str:
+    """Return the token that changes when any user/profile changes."""
+    return cache.get_or_set(
+        ANY_PROFILE_VERSION_KEY, _new_version, PROFILE_VERSION_TIMEOUT
+    )
+
+
+async def aget_any_profile_version() -> str:
+    """Async version of get_any_profile_version()."""
+    return await cache.aget_or_set(
+        ANY_PROFILE_VERSION_KEY, _new_version, PROFILE_VERSION_TIMEOUT
+    )
+
+
+def get_profile_versions(user_ids) -> dict[int, str]:
+    """Return {user id: version token}, creating tokens that are missing.
+
+    A missing token gets a fresh value rather than a fixed default, so
+    fragments cached under a token that was since evicted are never reused.
+    """
+    keys = {profile_version_key(user_id): user_id for user_id in set(user_ids)}
+    found = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, PROFILE_VERSION_TIMEOUT)
+    return {keys[key]: value for key, value in {**found, **missing}.items()}
+
+
+async def aget_profile_versions(user_ids) -> dict[int, str]:
+    """Async version of get_profile_versions()."""
+    keys = {profile_version_key(user_id): user_id for user_id in set(user_ids)}
+    found = await cache.aget_many(keys)
+    missing = {key: _new_version() for key in keys if key not in found}
+    if missing:
+        await cache.aset_many(missing, PROFILE_VERSION_TIMEOUT)
+    return {keys[key]: value for key, value in {**found, **missing}.items()}
+
+
+def auth_version_key(user_id: int) -> str:
+    """Return the cache key of a user's authentication version token."""
+    return f"users:auth-version:{user_id}"
+
+
+def bump_auth_version(user_id: int) -> None:
+    """Change the version token of the user's cached request.user."""
+    cache.set(auth_version_key(user_id), _new_version(), PROFILE_VERSION_TIMEOUT)
+
+
+def get_auth_user_version(user_id: int) -> str:
+    """Return the version of a cached request.user (user and profile tokens)."""
+    keys = [auth_version_key(user_id), profile_version_key(user_id)]
+    found = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, PROFILE_VERSION_TIMEOUT)
+    found.update(missing)
+    return "-".join(found[key] for key in keys)
@@ -12,6 +12,8 @@ from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import redirect, render
 
 # Import local modules
+from mysite.routers import pin_to_primary
+
 from .forms import ProfileUpdateForm, UserRegisterForm, UserUpdateForm
 from .models import Profile
 
@@ -54,22 +56,23 @@ def logout_view(request) -> HttpResponse:
 def profile(request) -> HttpResponse:
     """User profile view."""
 
+    # request.user comes with its profile (users.backends.ProfileModelBackend)
+    user_profile: Profile = request.user.profile
     if request.method == "POST":
+        # Remember the stored image before the form assigns the upload
+        old_image_path: str = user_profile.image.path
+        old_image_name: str = user_profile.image.name
         u_form = UserUpdateForm(data=request.POST, instance=request.user)
         p_form = ProfileUpdateForm(
-            data=request.POST, files=request.FILES, instance=request.user.profile
+            data=request.POST, files=request.FILES, instance=user_profile
         )
         if u_form.is_valid() and p_form.is_valid():
-            user_profile: Profile = Profile.objects.get(user=request.user)
-            old_image_path: str = user_profile.image.path
-            old_image_name: str = user_profile.image.name
-
             # Save new user and profile data
             u_form.save()
             p_form.save()
 
             # Delete old image if new image is uploaded
-            if request.user.profile.image.path != old_image_path:
+            if user_profile.image.path != old_image_path:
                 if (
                     old_image_name
                     != Profile._meta.get_field(field_name="image").default
@@ -81,11 +84,12 @@ def profile(request) -> HttpResponse:
                 msg=f"User '{request.user.username}' updated their profile successfully."
             )
             messages.success(request=request, message="Your account has been updated!")
-            return redirect(to="profile")
+            # Show the new avatar on replica-served pages straight away
+            return pin_to_primary(redirect(to="profile"))
     else:
         # GET request
         u_form = UserUpdateForm(instance=request.user)
-        p_form = ProfileUpdateForm(instance=request.user.profile)
+        p_form = ProfileUpdateForm(instance=user_profile)
 
     # Create context
     context: dict[str, UserUpdateForm | ProfileUpdateForm] = {